@@ -0,0 +1,590 @@
+"""Loopback pipeline module driving synthetic backends through each transport."""
+from typing import Callable, Dict, List, Optional, Tuple
+from src.tcp import AsyncServer, BaseClient, BaseServer, ConnectionPool, Event, EventKind,\
+    FrameDecoder, LocalClient, LocalServer, ReceiveBuffer, UDPClient, UDPServer
+from src.tcp.options import SocketOptions
+from src.tcp.protocol import PREFIX
+from src.adapters.keyboard.synthetic import SyntheticServerAdapter
+from src.backends.synthetic import SyntheticKeyboardEvent, SyntheticMouseEvent
+from src.pipeline.trace import Histogram
+from benchmarks.streams import Step
+import itertools
+import threading
+import tempfile
+import socket
+import time
+import os
+
+
+HOST = "127.0.0.1"
+DRAIN_TIMEOUT = 3.0
+DRAIN_QUIET = 0.2
+DRAIN_POLL = 0.005
+BATCH_WINDOW_US = 200
+KEYFRAME = 64
+
+_sockets = itertools.count()
+
+
+def count_frames(packet: bytes) -> int:
+    """
+    Count the frames in a packet, which may hold a batch of them.
+
+    Args:
+        packet (bytes): One or more encoded frames.
+
+    Returns:
+        int: The amount of frames in the packet.
+    """
+    count = offset = 0
+
+    while offset + PREFIX.size <= len(packet):
+        (length,) = PREFIX.unpack_from(packet, offset)
+        offset += PREFIX.size + length
+        count += 1
+
+    return count
+
+
+class BenchServerAdapter(SyntheticServerAdapter):
+    """
+    Synthetic capture adapter that counts every frame and byte it sends.
+
+    Events are fed step by step by the benchmark driver through the
+    callbacks of the synthetic backends. Packets holding several frames,
+    as sent by the lanes, count once per frame.
+    """
+
+    sent: int = 0
+    sent_bytes: int = 0
+
+    def wire_bytes(self) -> int:
+        """
+        Get the bytes the transport put on the wire.
+
+        Returns:
+            int: The size of every packet sent, as encoded for the transport.
+        """
+        return self.sent_bytes
+
+    def send(self, packet: bytes) -> None:
+        """
+        Count and send encoded frames through the engine.
+
+        Args:
+            packet (bytes): The encoded frames to send.
+        """
+        self.sent += count_frames(packet)
+        self.sent_bytes += len(packet)
+        super().send(packet)
+
+
+class BenchServer(BenchServerAdapter, BaseServer):
+    """Benchmark server over the blocking TCP engine."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None,
+        prioritize: bool = False
+    ) -> None:
+        """
+        Initialize the server and wait for the client.
+
+        Args:
+            host (str): The address to bind to.
+            port (int): The port number to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            prioritize (bool): Whether to send through the priority lanes.
+        """
+        super().__init__(host, port, options)
+        self.prioritize = prioritize
+        self.init()
+
+
+class BenchAsyncServer(BenchServerAdapter, AsyncServer):
+    """Benchmark server over the asyncio TCP engine."""
+
+    def __init__(self, host: str, port: int) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            host (str): The address to bind to.
+            port (int): The port number to listen on.
+        """
+        super().__init__(host, port)
+        self.init()
+
+
+class BenchPoolServer(BenchServerAdapter, ConnectionPool):
+    """Benchmark server over the outgoing connection pool."""
+
+    def __init__(self, targets: List[Tuple[str, int]]) -> None:
+        """
+        Initialize the pool and start connecting to the targets.
+
+        Args:
+            targets (List[Tuple[str, int]]): Host and port of every listening client.
+        """
+        super().__init__(targets)
+        self.init()
+
+
+class BenchLocalServer(BenchServerAdapter, LocalServer):
+    """Benchmark server over the Unix domain socket engine."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            path (str): Path of the socket to listen on.
+        """
+        super().__init__(path)
+        self.init()
+
+
+class BenchUDPServer(BenchServerAdapter, UDPServer):
+    """Benchmark server over the UDP motion channel."""
+
+    def __init__(self, host: str, port: int, keyframe: Optional[int] = None) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            host (str): The address to bind to.
+            port (int): The port number to listen on.
+            keyframe (Optional[int]): Datagrams between two keyframes of the
+                delta codec, None sends full frames.
+        """
+        super().__init__(host, port, keyframe=keyframe)
+        self.init()
+
+    def wire_bytes(self) -> int:
+        """
+        Get the bytes of every datagram sent, with its sequence number.
+
+        Returns:
+            int: The size of the datagrams, after the delta codec.
+        """
+        return self.datagram_bytes
+
+
+class BenchSink:
+    """
+    Injection side shared by the benchmark clients.
+
+    Every event is injected into the synthetic backends and its capture to
+    inject latency is recorded. Both ends run on the same host, so the
+    capture timestamp of the frame is directly comparable.
+    """
+
+    def setup(self) -> None:
+        """
+        Set up the synthetic backends and counters.
+        """
+        self.keyboard_event = SyntheticKeyboardEvent()
+        self.mouse_event = SyntheticMouseEvent(log=self.keyboard_event.log)
+        self.latency = Histogram()
+        self.received: int = 0
+        self.last: int = 0
+
+    def inject(self, event: Event) -> None:
+        """
+        Inject a decoded event and record its latency.
+
+        Args:
+            event (Event): The event received from the server.
+        """
+        match event.kind:
+            case EventKind.KEY_PRESS | EventKind.KEY_RELEASE:
+                self.keyboard_event.insert_code(event.code, event.kind == EventKind.KEY_PRESS)
+
+            case EventKind.MOVE:
+                self.mouse_event.insert_move(event.x, event.y)
+
+            case EventKind.BUTTON_PRESS | EventKind.BUTTON_RELEASE:
+                self.mouse_event.insert_click(event.code, event.kind == EventKind.BUTTON_PRESS)
+
+            case EventKind.SCROLL:
+                self.mouse_event.insert_scroll(event.x, event.y)
+
+        self.last = time.monotonic_ns()
+        self.latency.add(self.last - event.timestamp)
+        self.received += 1
+
+
+class BenchClient(BenchSink, BaseClient):
+    """Benchmark client over TCP, reading through the receive buffer."""
+
+    def __init__(self, host: str, port: int, listen: bool = False) -> None:
+        """
+        Initialize the client and connect to the server.
+
+        Args:
+            host (str): The address of the server.
+            port (int): The port number of the server.
+            listen (bool): Whether to wait for the server to connect instead.
+        """
+        super().__init__(host, port, listen=listen)
+        self.setup()
+        self.buffer = ReceiveBuffer()
+
+    def run(self) -> None:
+        """
+        Receive and inject events until the connection closes.
+        """
+        try:
+            while self.buffer.fill(self.receive_into):
+                self.buffer.drain(self.inject)
+
+        except OSError:
+            pass
+
+
+class BenchLocalClient(LocalClient, BenchClient):
+    """Benchmark client over a Unix domain socket, reading through the receive buffer."""
+
+
+class BenchUDPClient(BenchSink, UDPClient):
+    """Benchmark client over the UDP motion channel."""
+
+    def __init__(self, host: str, port: int) -> None:
+        """
+        Initialize the client and announce it to the server.
+
+        Args:
+            host (str): The address of the server.
+            port (int): The port number of the server.
+        """
+        super().__init__(host, port)
+        self.setup()
+
+    def run(self) -> None:
+        """
+        Receive and inject datagrams until the socket is closed.
+        """
+        try:
+            while True:
+                for event in FrameDecoder().feed(self.receive()):
+                    self.inject(event)
+
+        except OSError:
+            pass
+
+
+Pair = Tuple[BenchServerAdapter, BenchSink]
+
+
+def free_port(kind: int = socket.SOCK_STREAM) -> int:
+    """
+    Find a free loopback port.
+
+    Args:
+        kind (int): The socket type the port is needed for.
+
+    Returns:
+        int: A port number nothing is bound to.
+    """
+    with socket.socket(socket.AF_INET, kind) as probe:
+        probe.bind((HOST, 0))
+        return probe.getsockname()[1]
+
+
+def blocking_pair() -> Pair:
+    """
+    Connect a client to a blocking TCP server.
+
+    Returns:
+        Pair: The connected server and client.
+    """
+    port = free_port()
+    servers: List[BenchServer] = []
+    accept = threading.Thread(target=lambda: servers.append(BenchServer(HOST, port)))
+    accept.start()
+
+    while True:
+        try:
+            client = BenchClient(HOST, port)
+            break
+
+        except ConnectionRefusedError:
+            time.sleep(0.01)
+
+    accept.join()
+    return servers[0], client
+
+
+def lanes_pair() -> Pair:
+    """
+    Connect a client to a blocking TCP server sending through the lanes.
+
+    Returns:
+        Pair: The connected server and client.
+    """
+    port = free_port()
+    servers: List[BenchServer] = []
+    accept = threading.Thread(
+        target=lambda: servers.append(BenchServer(HOST, port, prioritize=True))
+    )
+    accept.start()
+
+    while True:
+        try:
+            client = BenchClient(HOST, port)
+            break
+
+        except ConnectionRefusedError:
+            time.sleep(0.01)
+
+    accept.join()
+    servers[0].lanes.start()
+    return servers[0], client
+
+
+def batching_pair() -> Pair:
+    """
+    Connect a client to a blocking TCP server gathering frames into batches.
+
+    Returns:
+        Pair: The connected server and client.
+    """
+    port = free_port()
+    options = SocketOptions(batch_window_us=BATCH_WINDOW_US)
+    servers: List[BenchServer] = []
+    accept = threading.Thread(target=lambda: servers.append(BenchServer(HOST, port, options)))
+    accept.start()
+
+    while True:
+        try:
+            client = BenchClient(HOST, port)
+            break
+
+        except ConnectionRefusedError:
+            time.sleep(0.01)
+
+    accept.join()
+    return servers[0], client
+
+
+def async_pair() -> Pair:
+    """
+    Connect a client to an asyncio TCP server.
+
+    Returns:
+        Pair: The connected server and client.
+    """
+    server = BenchAsyncServer(HOST, free_port())
+    client = BenchClient(HOST, server.port)
+
+    while not server.subscribers():
+        time.sleep(0.01)
+
+    return server, client
+
+
+def pool_pair() -> Pair:
+    """
+    Let a connection pool reach a listening client.
+
+    The pool retries until the client has bound its port.
+
+    Returns:
+        Pair: The connected server and client.
+    """
+    port = free_port()
+    clients: List[BenchClient] = []
+    accept = threading.Thread(
+        target=lambda: clients.append(BenchClient(HOST, port, listen=True))
+    )
+    accept.start()
+    server = BenchPoolServer([(HOST, port)])
+    accept.join()
+
+    while not server.subscribers():
+        time.sleep(0.01)
+
+    return server, clients[0]
+
+
+def local_pair() -> Pair:
+    """
+    Connect a client to a Unix domain socket server.
+
+    Returns:
+        Pair: The connected server and client.
+    """
+    path = os.path.join(
+        tempfile.gettempdir(), f"net_keyboard-bench-{os.getpid()}-{next(_sockets)}.sock"
+    )
+    server = BenchLocalServer(path)
+    client = BenchLocalClient(path, 0)
+
+    while not server.subscribers():
+        time.sleep(0.01)
+
+    return server, client
+
+
+def udp_pair(keyframe: Optional[int] = None) -> Pair:
+    """
+    Announce a client to a UDP server.
+
+    Args:
+        keyframe (Optional[int]): Datagrams between two keyframes of the
+            delta codec, None sends full frames.
+
+    Returns:
+        Pair: The server and client once the server knows the client address.
+    """
+    server = BenchUDPServer(HOST, free_port(socket.SOCK_DGRAM), keyframe)
+    client = BenchUDPClient(HOST, server.port)
+
+    while not server.clients:
+        time.sleep(0.01)
+
+    return server, client
+
+
+def delta_pair() -> Pair:
+    """
+    Announce a client to a UDP server sending pointer frames as compact deltas.
+
+    Returns:
+        Pair: The server and client once the server knows the client address.
+    """
+    return udp_pair(KEYFRAME)
+
+
+TRANSPORTS: Dict[str, Callable[[], Pair]] = {
+    "tcp": blocking_pair,
+    "lanes": lanes_pair,
+    "batching": batching_pair,
+    "async": async_pair,
+    "pool": pool_pair,
+    "local": local_pair,
+    "udp": udp_pair,
+    "delta": delta_pair
+}
+
+
+def close(server: BenchServerAdapter, client: BenchSink) -> None:
+    """
+    Close both ends of a benchmark pair.
+
+    Args:
+        server (BenchServerAdapter): The server to close.
+        client (BenchSink): The client to close.
+    """
+    client.disconnect()
+
+    if isinstance(server, BaseServer) and server.connection is not None:
+        server.connection.close()
+
+    server.disconnect()
+
+
+def drain(server: BenchServerAdapter, client: BenchSink) -> None:
+    """
+    Wait until every frame sent has arrived, or arrivals stop.
+
+    Frames still waiting in the lanes are let out first, and the counts
+    must match on two polls in a row, so a batch the lanes just took is
+    not missed. Frames lost on the way, as datagrams may be, end the wait
+    once nothing arrives for DRAIN_QUIET seconds, and DRAIN_TIMEOUT bounds
+    it anyway.
+
+    Args:
+        server (BenchServerAdapter): The server fed by the benchmark.
+        client (BenchSink): The client receiving its frames.
+    """
+    deadline = time.monotonic() + DRAIN_TIMEOUT
+    received = client.received
+    quiet = time.monotonic() + DRAIN_QUIET
+    settled = False
+
+    while time.monotonic() < deadline:
+        if server.lanes is None or not server.lanes.depth():
+            if client.received >= server.sent:
+                if settled:
+                    return
+
+                settled = True
+                time.sleep(DRAIN_POLL)
+                continue
+
+            settled = False
+
+            if client.received != received:
+                received = client.received
+                quiet = time.monotonic() + DRAIN_QUIET
+
+            elif time.monotonic() >= quiet:
+                return
+
+        time.sleep(DRAIN_POLL)
+
+
+def measure(
+    transport: str,
+    scenario: str,
+    step: Step,
+    events: int,
+    rate: Optional[float] = None
+) -> Dict:
+    """
+    Drive a synthetic stream through a loopback pair and measure it.
+
+    Input events are counted apart from the frames they turn into, since
+    the lanes collapse motion. Throughput is input events per second until
+    the last frame arrived, and bytes per event are measured as encoded for
+    the transport, datagram headers and delta codec included.
+
+    Args:
+        transport (str): The name of the transport, a key of TRANSPORTS.
+        scenario (str): The name of the scenario.
+        step (Step): The function feeding each step of the stream.
+        events (int): The amount of events to send.
+        rate (Optional[float]): Events per second, None sends as fast as possible.
+
+    Returns:
+        Dict: Throughput, frames, bytes per event, loss and latency percentiles.
+    """
+    server, client = TRANSPORTS[transport]()
+    threading.Thread(target=client.run, daemon=True).start()
+
+    keyboard, mouse = server.keyboard_event, server.mouse_event
+    start = time.monotonic_ns()
+
+    for index in range(events):
+        if rate is not None:
+            delay = start + index * 1e9 / rate - time.monotonic_ns()
+
+            if delay > 0:
+                time.sleep(delay / 1e9)
+
+        step(keyboard, mouse, index)
+
+    drain(server, client)
+    close(server, client)
+
+    seconds = ((client.last or time.monotonic_ns()) - start) / 1e9
+    wire = server.wire_bytes()
+
+    return {
+        "transport": transport,
+        "scenario": scenario,
+        "rate": rate,
+        "events": events,
+        "frames": server.sent,
+        "received": client.received,
+        "lost": server.sent - client.received,
+        "seconds": round(seconds, 6),
+        "events_per_sec": round(events / seconds, 1) if seconds > 0 else None,
+        "frames_per_sec": round(client.received / seconds, 1) if seconds > 0 else None,
+        "bytes_per_event": round(wire / events, 2) if events else None,
+        "bytes_per_frame": round(wire / server.sent, 2) if server.sent else None,
+        "latency_us": client.latency.summary()
+    }
@@ -0,0 +1,67 @@
+"""Benchmark entry point reporting pipeline results as JSON."""
+from typing import Dict, Optional
+from benchmarks.streams import SCENARIOS
+from benchmarks.pipeline import TRANSPORTS, measure
+import subprocess
+import argparse
+import platform
+import json
+import sys
+
+
+def revision() -> Optional[str]:
+    """
+    Get the commit the benchmark runs on.
+
+    Returns:
+        Optional[str]: The short commit hash, or None outside a git checkout.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the capture to inject pipeline.")
+    parser.add_argument("--events", type=int, default=20000, help="events per run")
+    parser.add_argument("--rate", type=float, default=None, help="events per second, unpaced by default")
+    parser.add_argument("--transport", action="append", choices=list(TRANSPORTS), help="transports to run")
+    parser.add_argument("--scenario", action="append", choices=[name for name, _ in SCENARIOS], help="scenarios to run")
+    parser.add_argument("--output", default=None, help="file to write, stdout by default")
+    args = parser.parse_args()
+
+    report: Dict = {
+        "commit": revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": []
+    }
+
+    for transport in args.transport or list(TRANSPORTS):
+        for scenario, step in SCENARIOS:
+            if args.scenario and scenario not in args.scenario:
+                continue
+
+            result = measure(transport, scenario, step, args.events, args.rate)
+            report["results"].append(result)
+            print(
+                f"{transport:<8}{scenario:<8}{result['events_per_sec']:>12} ev/s"
+                f"  p99 {result['latency_us']['p99']} us  lost {result['lost']}",
+                file=sys.stderr
+            )
+
+    if args.output is None:
+        json.dump(report, fp=sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as raw:
+            json.dump(report, fp=raw, indent=2)
+
+
+if __name__ == "__main__":
+    main()
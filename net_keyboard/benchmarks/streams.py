@@ -0,0 +1,62 @@
+"""Synthetic streams fed step by step by the benchmark driver."""
+from typing import Callable, List, Tuple
+from src.backends.keycodes import BUTTON_CODES
+from src.backends.synthetic import SyntheticKeyboardEvent, SyntheticMouseEvent
+
+
+Step = Callable[[SyntheticKeyboardEvent, SyntheticMouseEvent, int], None]
+
+
+def typing(keyboard: SyntheticKeyboardEvent, mouse: SyntheticMouseEvent, index: int) -> None:
+    """
+    Feed one step of a typing stream, alternating presses and releases.
+
+    Args:
+        keyboard (SyntheticKeyboardEvent): The keyboard to feed.
+        mouse (SyntheticMouseEvent): The mouse to feed.
+        index (int): The position of the step in the stream.
+    """
+    code = ord("a") + index // 2 % 26
+
+    if index % 2:
+        keyboard.on_release(code)
+    else:
+        keyboard.on_press(code)
+
+
+def sweep(keyboard: SyntheticKeyboardEvent, mouse: SyntheticMouseEvent, index: int) -> None:
+    """
+    Feed one step of a mouse sweep across the screen.
+
+    Args:
+        keyboard (SyntheticKeyboardEvent): The keyboard to feed.
+        mouse (SyntheticMouseEvent): The mouse to feed.
+        index (int): The position of the step in the stream.
+    """
+    mouse.on_move(index % 1920, index // 1920 % 1080)
+
+
+def mixed(keyboard: SyntheticKeyboardEvent, mouse: SyntheticMouseEvent, index: int) -> None:
+    """
+    Feed one step of a stream with mostly moves, a click and some typing.
+
+    Args:
+        keyboard (SyntheticKeyboardEvent): The keyboard to feed.
+        mouse (SyntheticMouseEvent): The mouse to feed.
+        index (int): The position of the step in the stream.
+    """
+    match index % 16:
+        case 0 | 1:
+            typing(keyboard, mouse, index)
+
+        case 2 | 3:
+            mouse.on_click(index % 1920, 0, BUTTON_CODES["left"], index % 16 == 2)
+
+        case 4:
+            mouse.on_scroll(index % 1920, 0, 0, -1)
+
+        case _:
+            sweep(keyboard, mouse, index)
+
+
+SCENARIOS: List[Tuple[str, Step]] = [("typing", typing), ("sweep", sweep), ("mixed", mixed)]
@@ -1,21 +1,166 @@
 import sys
+import logging
 from src.utils.config import e
 import threading
-from src.adapters.keyboard.pynput import PynputServer, PynputClient
+from src.adapters.keyboard.pynput import PynputServer, PynputAsyncServer, PynputPoolServer,\
+    PynputLocalServer, PynputClient, PynputLocalClient
+from src.pipeline.trace import Tracer, format_stats
+from src.pipeline.record import Recorder, EventLog, replay
+from src.pipeline.heartbeat import Heartbeat
+from src.pipeline.routing import Router, parse_hotkey
+from src.pipeline.screens import ScreenLayout
+from src.tcp import UDPServer, UDPClient
+import atexit
+import json
+import time
 
 
 def k1() -> None:
-    server = PynputServer(e.SERVER_HOST, e.SERVER_PORT)
+    scheme, host, port = e.server_endpoint()
+    motion = None
+
+    if e.SERVER_BACKEND == "evdev":
+        from src.adapters.keyboard.evdev import EvdevServer, EvdevAsyncServer, EvdevPoolServer,\
+            EvdevLocalServer
+        engines = EvdevServer, EvdevAsyncServer, EvdevPoolServer, EvdevLocalServer
+    else:
+        engines = PynputServer, PynputAsyncServer, PynputPoolServer, PynputLocalServer
+
+    blocking, asynchronous, pool, local = engines
+
+    if e.MOTION_PORT is not None and scheme == "tcp":
+        motion = UDPServer(host, e.MOTION_PORT, e.SOCKET_OPTIONS, e.MOTION_KEYFRAME)
+
+    recorder = None
+
+    if e.RECORD is not None:
+        recorder = Recorder(e.RECORD)
+
+    heartbeat = None
+
+    if e.HEARTBEAT is not None:
+        heartbeat = Heartbeat(e.HEARTBEAT, e.HEARTBEAT_TIMEOUT)
+
+    if scheme == "unix":
+        server = local(
+            host, e.SOCKET_OPTIONS, e.MOTION_RATE, e.TRACE, recorder, e.SERVER_QUEUE_SIZE,
+            heartbeat, e.SERVER_ISOLATED
+        )
+    elif e.SERVER_ENGINE == "pool":
+        targets = [(target["host"], target["port"]) for target in e.CONNECTIONS]
+        router = Router(
+            len(targets), e.ROUTING_MODE, parse_hotkey(e.ROUTING_SWITCH),
+            parse_hotkey(e.ROUTING_BROADCAST)
+        )
+        screens = None
+
+        if e.ROUTING_SCREEN is not None:
+            screens = ScreenLayout(
+                [tuple(target["screen"]) for target in e.CONNECTIONS], tuple(e.ROUTING_SCREEN)
+            )
+
+        server = pool(
+            targets, e.SOCKET_OPTIONS, e.MOTION_RATE, recorder, e.SERVER_QUEUE_SIZE,
+            e.SERVER_OVERFLOW, heartbeat, router, screens, e.SERVER_ISOLATED
+        )
+    elif e.SERVER_ENGINE == "async":
+        server = asynchronous(
+            host, port, e.SOCKET_OPTIONS, motion, e.MOTION_RATE, e.TRACE,
+            recorder, e.SERVER_QUEUE_SIZE, e.SERVER_OVERFLOW, heartbeat, e.SERVER_ISOLATED
+        )
+    else:
+        server = blocking(
+            host, port, e.SOCKET_OPTIONS, motion, e.MOTION_RATE, e.TRACE,
+            recorder, e.SERVER_LANES, e.SERVER_QUEUE_SIZE, e.SERVER_OVERFLOW, e.SERVER_RESUME,
+            heartbeat, e.SERVER_ISOLATED
+        )
     server.run()
+    atexit.register(server.close)
 
 
 def k2() -> None:
-    client = PynputClient(e.CLIENT_HOST, e.CLIENT_PORT)
+    scheme, host, port = e.client_endpoint()
+    local = scheme == "unix"
+    motion = None
+
+    if e.MOTION_PORT is not None and not local:
+        motion = UDPClient(host, e.MOTION_PORT, e.SOCKET_OPTIONS)
+
+    tracer = None
+
+    if e.TRACE:
+        tracer = Tracer()
+        tracer.start(e.TRACE_OUTPUT)
+
+    timeout = e.HEARTBEAT_TIMEOUT if e.HEARTBEAT is not None else None
+
+    if e.CLIENT_BACKEND == "uinput":
+        from src.adapters.keyboard.evdev import EvdevClient, EvdevLocalClient
+        client = (EvdevLocalClient if local else EvdevClient)(
+            host, port, e.SOCKET_OPTIONS, motion,
+            idle_release=e.CLIENT_IDLE_RELEASE, tracer=tracer, retry=e.CLIENT_RECONNECT,
+            timeout=timeout, listen=e.CLIENT_LISTEN
+        )
+    elif e.CLIENT_BACKEND == "synthetic":
+        from src.adapters.keyboard.synthetic import SyntheticClient, SyntheticLocalClient
+        client = (SyntheticLocalClient if local else SyntheticClient)(
+            host, port, e.SOCKET_OPTIONS, motion, e.CLIENT_IDLE_RELEASE, tracer,
+            e.CLIENT_RECONNECT, timeout, e.CLIENT_LISTEN
+        )
+    else:
+        client = (PynputLocalClient if local else PynputClient)(
+            host, port, e.SOCKET_OPTIONS, motion, e.CLIENT_IDLE_RELEASE, tracer,
+            e.CLIENT_RECONNECT, timeout, e.CLIENT_LISTEN
+        )
     client.run()
 
 
+def k3(path: str, speed: float) -> None:
+    from src.adapters.keyboard.synthetic import SyntheticServer, SyntheticAsyncServer,\
+        SyntheticLocalServer
+
+    scheme, host, port = e.server_endpoint()
+    log = EventLog(path)
+    motion = None
+
+    if e.MOTION_PORT is not None and scheme == "tcp":
+        motion = UDPServer(host, e.MOTION_PORT, e.SOCKET_OPTIONS, e.MOTION_KEYFRAME)
+
+    heartbeat = None
+
+    if e.HEARTBEAT is not None:
+        heartbeat = Heartbeat(e.HEARTBEAT, e.HEARTBEAT_TIMEOUT)
+
+    if scheme == "unix" or e.SERVER_ENGINE == "async":
+        if scheme == "unix":
+            server = SyntheticLocalServer(
+                host, e.SOCKET_OPTIONS, e.MOTION_RATE, e.TRACE,
+                queue_size=e.SERVER_QUEUE_SIZE, heartbeat=heartbeat
+            )
+        else:
+            server = SyntheticAsyncServer(
+                host, port, e.SOCKET_OPTIONS, motion, e.MOTION_RATE, e.TRACE,
+                queue_size=e.SERVER_QUEUE_SIZE, overflow=e.SERVER_OVERFLOW, heartbeat=heartbeat
+            )
+
+        while not server.subscribers():
+            time.sleep(0.1)
+    else:
+        server = SyntheticServer(
+            host, port, e.SOCKET_OPTIONS, motion, e.MOTION_RATE, e.TRACE,
+            prioritize=e.SERVER_LANES, queue_size=e.SERVER_QUEUE_SIZE,
+            overflow=e.SERVER_OVERFLOW, resume=e.SERVER_RESUME, heartbeat=heartbeat
+        )
+    server.run()
+
+    logging.info("Replaying %d events (%.1f s) from %s", len(log), log.duration(), path)
+    replay(log, server.keyboard_event, server.mouse_event, speed)
+    log.close()
+
+
 def main() -> None:
     args = sys.argv[1:]
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
 
     if args[0] == "server":
         e.SERVER_HOST = args[1]
@@ -31,6 +176,15 @@ def main() -> None:
 
         threading.Thread(target=k2).start()
 
+    elif args[0] == "replay":
+        threading.Thread(
+            target=k3, args=(args[1], float(args[2]) if len(args) > 2 else 1.0)
+        ).start()
+
+    elif args[0] == "stats":
+        with open(args[1] if len(args) > 1 else e.TRACE_OUTPUT, "r") as raw:
+            print(format_stats(json.load(raw)))
+
 
 if __name__ == "__main__":
     main()
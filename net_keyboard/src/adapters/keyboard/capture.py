@@ -0,0 +1,877 @@
+"""Capture adapter module turning backend callbacks into wire frames."""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from abc import abstractmethod
+from src.tcp import Event, EventKind, EventType, FrameDecoder, UDPServer, encode
+from src.tcp.protocol import PREFIX
+from src.tcp.base import TCP, MultiPeer, Peer
+from src.adapters.keyboard.base import BaseAdapter
+from src.pipeline.motion import MotionCoalescer
+from src.pipeline.keys import PressedKeys
+from src.pipeline.trace import stamp, stamp_frames
+from src.pipeline.record import Recorder
+from src.pipeline.lanes import LaneScheduler
+from src.pipeline.session import TOKEN_SIZE, SessionLog
+from src.pipeline.heartbeat import Heartbeat
+from src.pipeline.routing import Router
+from src.pipeline.screens import ScreenLayout
+from src.backends.isolated import POLL_INTERVAL, CaptureSource, CaptureProcess
+from src.backends.base import KeyboardBackend, MouseBackend, KeyboardTypeEvent, MouseTypeEvent,\
+    KeyInput, MoveInput, ClickInput, ScrollInput
+import threading
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class CaptureAdapter(BaseAdapter):
+    """
+    Capture side shared by every backend and server engine.
+
+    Mixed in before a TCP engine, whose send method delivers the events.
+    Backends are created by ``backends`` and their keys and buttons
+    converted to wire codes by ``key_code`` and ``button_code``. Concrete
+    adapters set the optional features below before calling ``init``.
+
+    Attributes:
+        motion (Optional[TCP]): Loss-tolerant channel for motion and scroll,
+            None to keep them on the reliable engine.
+        motion_rate (Optional[float]): Rate moves are coalesced to, None to
+            send every move.
+        tracing (bool): Whether frames carry their send time and clock
+            synchronization pings are answered.
+        recorder (Optional[Recorder]): Event log every captured event is
+            appended to, before any filtering or coalescing.
+        prioritize (bool): Whether keys and clicks are sent ahead of queued
+            motion through a lane scheduler.
+        queue_size (int): Frames the lanes hold before the overflow policy applies.
+        overflow (str): What the lanes do once full, one of OVERFLOW_POLICIES.
+        resume (Optional[float]): Seconds keys and clicks are kept for a
+            client that reconnects, None to disable. Needs an engine that
+            can accept a new connection.
+        heartbeat (Optional[Heartbeat]): Link monitor pinging the client,
+            pacing motion and dropping a silent client. Multi-peer engines
+            keep one per peer in ``beats``.
+        router (Optional[Router]): Chooses the targets of a connection pool.
+        screens (Optional[ScreenLayout]): Switches the target at screen
+            edges, together with the router.
+        capture (Optional[CaptureSource]): Runs the backends in a process of
+            their own, stopped by ``close``.
+    """
+
+    keyboard_event: KeyboardBackend
+    mouse_event: MouseBackend
+    motion: Optional[TCP] = None
+    motion_rate: Optional[float] = None
+    coalescer: Optional[MotionCoalescer] = None
+    pressed: PressedKeys
+    tracing: bool = False
+    recorder: Optional[Recorder] = None
+    prioritize: bool = False
+    lanes: Optional[LaneScheduler] = None
+    queue_size: int = 1024
+    overflow: str = "drop"
+    resume: Optional[float] = None
+    session: Optional[SessionLog] = None
+    heartbeat: Optional[Heartbeat] = None
+    beats: Dict[Peer, Heartbeat]
+    router: Optional[Router] = None
+    screens: Optional[ScreenLayout] = None
+    capture: Optional[CaptureSource] = None
+    isolation: Optional[CaptureProcess] = None
+    listeners: List[threading.Thread]
+    away: bool = False
+
+    def init(self) -> None:
+        """
+        Set up the backends and register the event callbacks.
+
+        With a capture source, the backends are the ring readers of the
+        capture process, reporting events already converted to wire codes.
+        With a motion rate, moves are coalesced: into absolute positions on
+        the motion channel, so a lost datagram never leaves the remote
+        pointer off, and into relative deltas otherwise. A screen layout
+        needs absolute positions scaled onto the active screen, so moves
+        are not coalesced then.
+
+        Every callback is done with a move record before it returns, so
+        the mouse backend is allowed to reuse one for every move.
+        """
+        if self.capture is not None:
+            self.isolation = CaptureProcess(self.capture)
+            self.keyboard_event, self.mouse_event = self.isolation.backends()
+            self.key_code = self.button_code = lambda code: code
+        else:
+            self.keyboard_event, self.mouse_event = self.backends()
+
+        self.mouse_event.enable_pool()
+        self.pressed = PressedKeys()
+        self.beats = {}
+        self.listeners = []
+
+        if isinstance(self.motion, UDPServer) and hasattr(self, "peers"):
+            self.motion.peers = self.peers
+
+        if self.resume is not None:
+            self.session = SessionLog(self.resume)
+
+        if self.prioritize:
+            self.lanes = LaneScheduler(
+                self.deliver,
+                capacity=self.queue_size,
+                policy=self.overflow,
+                on_high_water=self.queue_high,
+                on_low_water=self.queue_low,
+                on_overflow=self.queue_overflow
+            )
+
+        self.keyboard_event.add_callback(self.keyboard_press, KeyboardTypeEvent.PRESS)
+        self.keyboard_event.add_callback(self.keyboard_release, KeyboardTypeEvent.RELEASE)
+
+        if self.motion_rate is not None and self.screens is None:
+            depth = self.lanes.depth if self.lanes is not None and self.motion is None else None
+            rtt = self.link_rtt if self.heartbeat is not None else None
+            lossy = self.motion is not None
+            self.coalescer = MotionCoalescer(
+                self.mouse_position if lossy else self.mouse_motion, self.motion_rate,
+                rtt=rtt, depth=depth, absolute=lossy
+            )
+            self.mouse_event.add_callback(self.coalescer.move, MouseTypeEvent.MOVE)
+        else:
+            self.mouse_event.add_callback(self.mouse_move, MouseTypeEvent.MOVE)
+
+        self.mouse_event.add_callback(self.mouse_click, MouseTypeEvent.CLICK)
+        self.mouse_event.add_callback(self.mouse_scroll, MouseTypeEvent.SCROLL)
+
+        if self.recorder is not None:
+            self.keyboard_event.add_callback(self.record_press, KeyboardTypeEvent.PRESS)
+            self.keyboard_event.add_callback(self.record_release, KeyboardTypeEvent.RELEASE)
+            self.mouse_event.add_callback(self.record_move, MouseTypeEvent.MOVE)
+            self.mouse_event.add_callback(self.record_click, MouseTypeEvent.CLICK)
+            self.mouse_event.add_callback(self.record_scroll, MouseTypeEvent.SCROLL)
+
+    @abstractmethod
+    def backends(self) -> Tuple[KeyboardBackend, MouseBackend]:
+        """
+        Create the capture backends.
+
+        Returns:
+            Tuple[KeyboardBackend, MouseBackend]: The keyboard and mouse backends.
+        """
+        pass
+
+    @abstractmethod
+    def key_code(self, key: Any) -> Optional[int]:
+        """
+        Convert a backend key into its numeric wire code.
+
+        Args:
+            key (Any): The key reported by the keyboard backend.
+
+        Returns:
+            Optional[int]: The key code, or None if the key cannot be sent.
+        """
+        pass
+
+    @abstractmethod
+    def button_code(self, button: Any) -> int:
+        """
+        Convert a backend mouse button into its numeric wire code.
+
+        Args:
+            button (Any): The button reported by the mouse backend.
+
+        Returns:
+            int: The index of the button in BUTTON_NAMES, 0 if unknown.
+        """
+        pass
+
+    def send_motion(self, packet: bytes) -> None:
+        """
+        Send a motion or scroll packet through the motion channel.
+
+        Falls back to the reliable engine when no motion channel is set,
+        where it waits in the continuous lane if lanes are in use.
+
+        Args:
+            packet (bytes): The encoded frame to send.
+        """
+        if self.motion is not None:
+            self.motion.send(stamp(packet) if self.tracing else packet)
+        elif self.lanes is not None:
+            self.lanes.continuous(packet)
+        else:
+            self.deliver(packet)
+
+    def send_event(self, packet: bytes, ordered: bool = False) -> None:
+        """
+        Send a key or button packet through the reliable engine.
+
+        Within a session the packet is numbered and kept for replay.
+
+        Args:
+            packet (bytes): The encoded frame to send.
+            ordered (bool): Whether motion queued in the lanes must be sent
+                first, as for clicks.
+        """
+        if self.session is None:
+            self.queue_event(packet, ordered)
+            return
+
+        with self.session.order:
+            self.queue_event(self.session.append(packet), ordered)
+
+    def queue_event(self, packet: bytes, ordered: bool = False) -> None:
+        """
+        Hand a discrete packet to the lanes, or deliver it right away.
+
+        Args:
+            packet (bytes): The encoded frame to send.
+            ordered (bool): Whether motion queued in the lanes must be sent first.
+        """
+        if self.lanes is not None:
+            self.lanes.discrete(packet, ordered)
+        else:
+            self.deliver(packet)
+
+    def deliver(self, packet: bytes) -> None:
+        """
+        Write packets to the reliable engine.
+
+        With tracing on, input frames are stamped with their send time
+        here, after any wait in the lanes, so the capture to send stage
+        covers the queueing as well. Within a session, packets are held
+        back while the client is away or has not greeted the server yet,
+        and a failed write marks the client as away instead of raising.
+        With a router, input frames go to the targets it currently picks,
+        while control frames reach every target.
+
+        Args:
+            packet (bytes): The encoded frames to write.
+        """
+        if self.tracing:
+            packet = stamp_frames(packet)
+
+        if self.router is not None and packet[PREFIX.size] != EventType.CONTROL:
+            self.send_to(self.router.targets(), packet)
+            return
+
+        if self.session is None:
+            self.send(packet)
+            return
+
+        with self.session.lock:
+            if not self.session.ready:
+                return
+
+            try:
+                self.send(packet)
+
+            except OSError:
+                self.session.ready = False
+
+    def serve_control(self) -> None:
+        """
+        Answer control frames from the client until the connection closes.
+
+        Each clock synchronization ping is echoed back as a pong stamped
+        with the local time, pongs answering the heartbeat are measured and
+        a greeting resumes the session. Within a session, a closed
+        connection is replaced by the next client to connect instead of
+        ending the loop. Engines serving several peers are handled by
+        serve_peers instead.
+        """
+        if isinstance(self, MultiPeer):
+            self.serve_peers()
+            return
+
+        decoder = FrameDecoder()
+
+        if self.session is not None:
+            self.greet()
+
+        while True:
+            try:
+                data = self.receive()
+
+            except OSError:
+                data = b""
+
+            if not data:
+                if self.session is None:
+                    break
+
+                try:
+                    self.rejoin()
+
+                except OSError:
+                    break
+
+                decoder = FrameDecoder()
+                continue
+
+            received = time.monotonic_ns()
+
+            if self.heartbeat is not None:
+                self.heartbeat.seen()
+
+            for event in decoder.feed(data):
+                self.control(event, received)
+
+    def serve_peers(self) -> None:
+        """
+        Answer control frames from every peer of a multi-peer engine.
+
+        Each peer has a decoder of its own, so partial frames from two
+        peers are never joined, and pongs only go back to the peer that
+        sent the ping.
+        """
+        decoders: Dict[Peer, FrameDecoder] = {}
+
+        while True:
+            try:
+                peer, data = self.receive_from()
+
+            except OSError:
+                break
+
+            if not data:
+                decoders.pop(peer, None)
+                self.beats.pop(peer, None)
+                continue
+
+            received = time.monotonic_ns()
+
+            if self.heartbeat is not None:
+                self.link(peer).seen()
+
+            decoder = decoders.get(peer)
+
+            if decoder is None:
+                decoder = decoders[peer] = FrameDecoder()
+
+            for event in decoder.feed(data):
+                self.control(event, received, peer)
+
+    def control(self, event: Event, received: int, peer: Optional[Peer] = None) -> None:
+        """
+        Handle a single frame received from a peer.
+
+        Args:
+            event (Event): The decoded frame, ignored unless it is a control frame.
+            received (int): Monotonic time the frame was received.
+            peer (Optional[Peer]): The peer that sent it, None for engines
+                with a single client.
+        """
+        if event.type != EventType.CONTROL:
+            return
+
+        if event.kind == EventKind.PING:
+            pong = encode(EventType.CONTROL, EventKind.PONG, 0, 0, 0, received, event.payload)
+
+            if peer is None:
+                self.queue_event(pong)
+            else:
+                self.reply(peer, pong)
+
+        elif event.kind == EventKind.PONG and self.heartbeat is not None:
+            self.link(peer).pong(event, received)
+
+        elif event.kind == EventKind.HELLO and self.session is not None:
+            self.welcome(event)
+
+    def greet(self) -> None:
+        """
+        Send the session token to a newly connected client.
+
+        Frames are held back until the client answers.
+        """
+        with self.session.lock:
+            self.session.ready = False
+
+            try:
+                self.send(encode(
+                    EventType.CONTROL, EventKind.WELCOME, payload=self.session.token
+                ))
+
+            except OSError:
+                pass
+
+    def welcome(self, event: Event) -> None:
+        """
+        Resume the session of a client that answered the greeting.
+
+        Whatever the client missed is sent again before any new frame.
+
+        Args:
+            event (Event): The greeting, holding the token the client knew
+                and the last sequence number it received.
+        """
+        with self.session.order, self.session.lock:
+            frames = self.session.resume(event.payload[:TOKEN_SIZE], event.code)
+
+            try:
+                if frames:
+                    packet = b"".join(frames)
+                    self.send(stamp_frames(packet) if self.tracing else packet)
+
+                self.session.ready = True
+
+            except OSError:
+                return
+
+        logger.info("Client greeted the session, %d events sent again", len(frames))
+
+    def rejoin(self) -> None:
+        """
+        Wait for the client to connect again after its connection closed.
+
+        Raises:
+            OSError: If the server itself was closed.
+        """
+        with self.session.lock:
+            self.session.ready = False
+
+        logger.warning("Client connection lost, waiting for it to reconnect")
+        self.away = True
+
+        try:
+            self.accept()
+        finally:
+            self.away = False
+
+        if self.heartbeat is not None:
+            self.heartbeat.seen()
+
+        if self.lanes is not None:
+            self.lanes.reopen()
+
+        with self.session.order:
+            self.session.accepted = self.session.number
+
+        self.greet()
+
+    def link(self, peer: Optional[Peer] = None) -> Heartbeat:
+        """
+        Get the heartbeat of a peer, creating it on first use.
+
+        Args:
+            peer (Optional[Peer]): The peer, None for engines with a single client.
+
+        Returns:
+            Heartbeat: The shared heartbeat for a single client, otherwise
+            one with the same settings kept for that peer alone.
+        """
+        if peer is None:
+            return self.heartbeat
+
+        beat = self.beats.get(peer)
+
+        if beat is None:
+            beat = self.beats[peer] = Heartbeat(self.heartbeat.interval, self.heartbeat.timeout)
+
+        return beat
+
+    def link_rtt(self) -> Optional[float]:
+        """
+        Get the smoothed round-trip time that paces motion.
+
+        Returns:
+            Optional[float]: The RTT of the client, or the largest among the
+            peers, None before the first sample.
+        """
+        if not isinstance(self, MultiPeer):
+            return self.heartbeat.rtt()
+
+        return max(
+            (beat.smoothed for beat in list(self.beats.values()) if beat.smoothed is not None),
+            default=None
+        )
+
+    def keep_alive(self) -> None:
+        """
+        Ping the client once per heartbeat interval.
+
+        A client that stayed silent for longer than the heartbeat timeout
+        is dropped, which ends its connection as if it had closed. Within
+        a session, nothing is checked while the client is away. Multi-peer
+        engines are handled by keep_peers_alive instead.
+        """
+        if isinstance(self, MultiPeer):
+            self.keep_peers_alive()
+            return
+
+        while True:
+            time.sleep(self.heartbeat.interval)
+
+            if self.heartbeat.expired() and not self.away:
+                logger.warning(
+                    "No answer from the client for %.1f s, dropping it", self.heartbeat.timeout
+                )
+                self.drop()
+                self.heartbeat.seen()
+
+            try:
+                self.queue_event(self.heartbeat.ping())
+
+            except OSError:
+                pass
+
+            logger.debug("Link %s", self.heartbeat.stats())
+
+    def keep_peers_alive(self) -> None:
+        """
+        Ping every peer of a multi-peer engine once per heartbeat interval.
+
+        A peer that stayed silent for longer than the heartbeat timeout is
+        closed on its own, while the other peers go on. On engines whose
+        peers may only listen, a peer that never answered a ping is kept.
+        """
+        while True:
+            time.sleep(self.heartbeat.interval)
+            peers = self.connected_peers()
+
+            for peer in list(self.beats):
+                if peer not in peers:
+                    self.beats.pop(peer, None)
+
+            for peer in peers:
+                beat = self.link(peer)
+
+                if beat.expired() and not (self.silent_peers and beat.smoothed is None):
+                    logger.warning(
+                        "No answer from peer %s for %.1f s, dropping it", peer, beat.timeout
+                    )
+                    self.close_peer(peer)
+                    continue
+
+                try:
+                    self.reply(peer, beat.ping())
+
+                except OSError:
+                    pass
+
+                logger.debug("Link %s %s", peer, beat.stats())
+
+    def reroute(self, code: int) -> bool:
+        """
+        Apply the routing hotkey a key press completes, if any.
+
+        Args:
+            code (int): The code of the pressed key.
+
+        Returns:
+            bool: True if the press was a hotkey and must not be sent.
+        """
+        action = self.router.hotkey(code, True)
+
+        if action is None:
+            return False
+
+        self.hand_over(self.router.next if action == "switch" else self.router.toggle)
+        return True
+
+    def hand_over(self, change: Callable[[], None]) -> None:
+        """
+        Change the route once the current targets are left in a clean state.
+
+        Pending motion is flushed and every held key released on the
+        current targets before the route changes, so no key stays stuck
+        on a machine that stops receiving events.
+
+        Args:
+            change (Callable[[], None]): Changes the route of the router.
+        """
+        if self.coalescer is not None:
+            self.coalescer.flush()
+
+        previous = self.router.targets()
+
+        for held in self.pressed.drain():
+            self.send_to(previous, encode(EventType.KEYBOARD, EventKind.KEY_RELEASE, held))
+
+        change()
+
+    def place(self, mouse_position_x: int, mouse_position_y: int) -> Tuple[int, int]:
+        """
+        Follow the pointer across the screen layout.
+
+        Reaching an edge shared with another screen makes that target
+        active and moves the local pointer to the matching point at the
+        opposite edge, so it keeps standing for the new screen. Nothing
+        is switched while broadcasting.
+
+        Args:
+            mouse_position_x (int): The local X coordinate of the mouse position.
+            mouse_position_y (int): The local Y coordinate of the mouse position.
+
+        Returns:
+            Tuple[int, int]: The position on the screen of the active target.
+        """
+        if not self.router.broadcasting:
+            crossed = self.screens.cross(self.router.active, mouse_position_x, mouse_position_y)
+
+            if crossed is not None:
+                target, mouse_position_x, mouse_position_y = crossed
+                self.hand_over(lambda: self.router.select(target))
+                self.mouse_event.insert_move(mouse_position_x, mouse_position_y)
+
+        return self.screens.translate(self.router.active, mouse_position_x, mouse_position_y)
+
+    def queue_high(self, depth: int) -> None:
+        """
+        Report a send queue that reached its high-water mark.
+
+        Args:
+            depth (int): The high-water mark.
+        """
+        logger.warning("Send queue reached %d frames, the client is falling behind", depth)
+
+    def queue_low(self, depth: int) -> None:
+        """
+        Report a send queue that drained back to its low-water mark.
+
+        Args:
+            depth (int): The low-water mark.
+        """
+        logger.info("Send queue drained to %d frames", depth)
+
+    def queue_overflow(self, depth: int) -> None:
+        """
+        Drop the client whose send queue overflowed.
+
+        The server keeps listening, and within a session the client may
+        reconnect and resume.
+
+        Args:
+            depth (int): The capacity of the queue.
+        """
+        logger.warning("Send queue overflowed at %d frames, dropping the client", depth)
+        self.drop()
+
+    def keyboard_press(self, event: KeyInput) -> None:
+        """
+        Handle keyboard press events and send them to the client.
+
+        Presses of a key that is already held are auto-repeats and are
+        dropped, and presses completing a routing hotkey are not sent.
+        
+        Args:
+            event (KeyInput): The key that was pressed.
+        """
+        code = self.key_code(event.key)
+
+        if code is None or self.router is not None and self.reroute(code):
+            return
+
+        if self.pressed.press(code, event.scan):
+            self.send_event(encode(EventType.KEYBOARD, EventKind.KEY_PRESS, code))
+
+    def keyboard_release(self, event: KeyInput) -> None:
+        """
+        Handle keyboard release events and send them to the client.
+
+        The release carries the code the key was pressed with, so a key
+        whose typed character changed while held is still released.
+
+        Args:
+            event (KeyInput): The key that was released.
+        """
+        code = self.key_code(event.key)
+
+        if code is None:
+            return
+
+        if self.router is not None:
+            self.router.hotkey(code, False)
+
+        code = self.pressed.release(code, event.scan)
+
+        if code is None:
+            return
+
+        self.send_event(encode(EventType.KEYBOARD, EventKind.KEY_RELEASE, code))
+
+    def mouse_move(self, event: MoveInput) -> None:
+        """
+        Handle mouse movement events and send them to the client.
+
+        With a screen layout, the position is placed on the active screen first.
+
+        Args:
+            event (MoveInput): The new mouse position.
+        """
+        if self.screens is not None:
+            mouse_position_x, mouse_position_y = self.place(event.x, event.y)
+        else:
+            mouse_position_x, mouse_position_y = event.x, event.y
+
+        self.send_motion(
+            encode(EventType.MOUSE, EventKind.MOVE, 0, mouse_position_x, mouse_position_y)
+        )
+
+    def mouse_position(self, mouse_position_x: int, mouse_position_y: int) -> None:
+        """
+        Send a coalesced absolute mouse position to the client.
+
+        Used on the lossy motion channel, where a lost position is simply
+        corrected by the next one.
+
+        Args:
+            mouse_position_x (int): The X coordinate of the mouse position.
+            mouse_position_y (int): The Y coordinate of the mouse position.
+        """
+        self.send_motion(
+            encode(EventType.MOUSE, EventKind.MOVE, 0, mouse_position_x, mouse_position_y)
+        )
+
+    def mouse_motion(self, delta_x: int, delta_y: int) -> None:
+        """
+        Send a coalesced relative mouse movement to the client.
+
+        Args:
+            delta_x (int): The horizontal distance moved since the last delta.
+            delta_y (int): The vertical distance moved since the last delta.
+        """
+        self.send_motion(encode(EventType.MOUSE, EventKind.MOTION, 0, delta_x, delta_y))
+
+    def mouse_click(self, event: ClickInput) -> None:
+        """
+        Handle mouse click events and send them to the client.
+
+        Pending coalesced motion is flushed first so the click lands where
+        the pointer actually is.
+
+        Args:
+            event (ClickInput): The button change and where it happened.
+        """
+        if self.coalescer is not None:
+            self.coalescer.flush()
+
+        kind = EventKind.BUTTON_PRESS if event.pressed else EventKind.BUTTON_RELEASE
+        self.send_event(
+            encode(EventType.MOUSE, kind, self.button_code(event.button), event.x, event.y),
+            ordered=True
+        )
+
+    def mouse_scroll(self, event: ScrollInput) -> None:
+        """
+        Handle mouse scroll events and send them to the client.
+
+        Pending coalesced motion is flushed first to keep events in order.
+
+        Args:
+            event (ScrollInput): The scroll change and where it happened.
+        """
+        if self.coalescer is not None:
+            self.coalescer.flush()
+
+        self.send_motion(
+            encode(EventType.MOUSE, EventKind.SCROLL, 0, event.scroll_x, event.scroll_y)
+        )
+
+    def record_press(self, event: KeyInput) -> None:
+        """
+        Append a key press to the event log.
+
+        Args:
+            event (KeyInput): The key that was pressed.
+        """
+        code = self.key_code(event.key)
+
+        if code is not None:
+            self.recorder.record(EventType.KEYBOARD, EventKind.KEY_PRESS, code)
+
+    def record_release(self, event: KeyInput) -> None:
+        """
+        Append a key release to the event log.
+
+        Args:
+            event (KeyInput): The key that was released.
+        """
+        code = self.key_code(event.key)
+
+        if code is not None:
+            self.recorder.record(EventType.KEYBOARD, EventKind.KEY_RELEASE, code)
+
+    def record_move(self, event: MoveInput) -> None:
+        """
+        Append a mouse move to the event log.
+
+        Args:
+            event (MoveInput): The new mouse position.
+        """
+        self.recorder.record(EventType.MOUSE, EventKind.MOVE, 0, event.x, event.y)
+
+    def record_click(self, event: ClickInput) -> None:
+        """
+        Append a mouse button change to the event log.
+
+        Args:
+            event (ClickInput): The button change and where it happened.
+        """
+        kind = EventKind.BUTTON_PRESS if event.pressed else EventKind.BUTTON_RELEASE
+        self.recorder.record(
+            EventType.MOUSE, kind, self.button_code(event.button), event.x, event.y
+        )
+
+    def record_scroll(self, event: ScrollInput) -> None:
+        """
+        Append a mouse scroll to the event log.
+
+        Only the scroll amounts are kept, the pointer position is not.
+
+        Args:
+            event (ScrollInput): The scroll change and where it happened.
+        """
+        self.recorder.record(
+            EventType.MOUSE, EventKind.SCROLL, 0, event.scroll_x, event.scroll_y
+        )
+
+    def run(self) -> None:
+        """
+        Start the server and listen for keyboard and mouse events in separate threads.
+        """
+        if self.lanes is not None:
+            self.lanes.start()
+
+        if self.coalescer is not None:
+            self.coalescer.start()
+
+        if self.tracing or self.session is not None or self.heartbeat is not None:
+            threading.Thread(target=self.serve_control, daemon=True).start()
+
+        if self.heartbeat is not None:
+            threading.Thread(target=self.keep_alive, daemon=True).start()
+
+        if self.isolation is not None:
+            self.isolation.start()
+
+        self.listeners = [
+            threading.Thread(target=self.keyboard_event.listen),
+            threading.Thread(target=self.mouse_event.listen)
+        ]
+
+        for listener in self.listeners:
+            listener.start()
+
+    def close(self) -> None:
+        """
+        Release what the capture holds once the server shuts down.
+
+        The capture process is stopped first, and its rings are only
+        removed after the ring backends reading them have returned. The
+        recorder, if any, is flushed and closed.
+        """
+        if self.isolation is not None:
+            self.isolation.stop()
+
+            for listener in self.listeners:
+                listener.join(2 * POLL_INTERVAL)
+
+            self.isolation.close()
+            self.isolation = None
+
+        if self.recorder is not None:
+            self.recorder.close()
@@ -0,0 +1,347 @@
+"""Evdev adapter module for capturing and injecting keyboard and mouse events over network."""
+from typing import Callable, ContextManager, List, Optional, Tuple
+from src.tcp import BaseServer, AsyncServer, ConnectionPool, LocalServer
+from src.tcp.base import TCP
+from src.tcp.local import LocalClient
+from src.tcp.options import SocketOptions
+from src.tcp.pool import Address
+from src.adapters.keyboard.capture import CaptureAdapter
+from src.adapters.keyboard.inject import InjectionClient
+from src.backends.evdev import EvdevKeyboardEvent, EvdevMouseEvent, EvdevKey, EvdevButton
+from src.backends.uinput import KEY_TABLE, UInputWriter, shared_writer
+from src.pipeline.record import Recorder
+from src.pipeline.heartbeat import Heartbeat
+from src.pipeline.routing import Router
+from src.pipeline.screens import ScreenLayout
+from src.pipeline.trace import Tracer
+
+
+def evdev_capture() -> Tuple[
+    EvdevKeyboardEvent, EvdevMouseEvent, Callable[[EvdevKey], Optional[int]],
+    Callable[[EvdevButton], int]
+]:
+    """
+    Create the Evdev capture backends inside an isolated capture process.
+
+    Returns:
+        Tuple: The keyboard and mouse backends, and the functions converting
+        their keys and buttons to wire codes.
+    """
+    return EvdevKeyboardEvent(), EvdevMouseEvent(), KEY_TABLE.code, KEY_TABLE.button_code
+
+
+class EvdevServerAdapter(CaptureAdapter):
+    """
+    Capture adapter for keyboard and mouse events read from evdev devices.
+
+    Every keyboard and pointer under /dev/input is read directly, without
+    a display server in between. Raw key and button codes are converted
+    with the evdev key table, letters as their unshifted character.
+    """
+
+    keyboard_event: EvdevKeyboardEvent
+    mouse_event: EvdevMouseEvent
+
+    def backends(self) -> Tuple[EvdevKeyboardEvent, EvdevMouseEvent]:
+        """
+        Create the Evdev capture backends.
+
+        Returns:
+            Tuple[EvdevKeyboardEvent, EvdevMouseEvent]: The keyboard and mouse backends.
+        """
+        return EvdevKeyboardEvent(), EvdevMouseEvent()
+
+    def key_code(self, key: EvdevKey) -> Optional[int]:
+        """
+        Convert an evdev key code into its numeric wire code.
+
+        Args:
+            key (EvdevKey): The captured key.
+
+        Returns:
+            Optional[int]: The key code, or None if the key is not mapped.
+        """
+        return KEY_TABLE.code(key)
+
+    def button_code(self, button: EvdevButton) -> int:
+        """
+        Convert an evdev button code into its numeric wire code.
+
+        Args:
+            button (EvdevButton): The captured button.
+
+        Returns:
+            int: The index of the button in BUTTON_NAMES, 0 if unknown.
+        """
+        return KEY_TABLE.button_code(button)
+
+
+class EvdevServer(EvdevServerAdapter, BaseServer):
+    """
+    TCP server adapter for keyboard events read from evdev devices.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None,
+        motion: Optional[TCP] = None,
+        motion_rate: Optional[float] = None,
+        tracing: bool = False,
+        recorder: Optional[Recorder] = None,
+        prioritize: bool = False,
+        queue_size: int = 1024,
+        overflow: str = "drop",
+        resume: Optional[float] = None,
+        heartbeat: Optional[Heartbeat] = None,
+        isolated: bool = False
+    ) -> None:
+        """
+        Initialize the Evdev server.
+
+        Args:
+            host (str): The hostname or IP address to bind the server to.
+            port (int): The port number to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion (Optional[TCP]): Channel for mouse motion and scroll events.
+            motion_rate (Optional[float]): Maximum coalesced motion deltas per
+                second, None sends every move as it happens.
+            tracing (bool): Whether to stamp frames for latency tracing.
+            recorder (Optional[Recorder]): Event log capturing the session.
+            prioritize (bool): Whether keys and clicks are sent ahead of queued motion.
+            queue_size (int): Maximum frames waiting to be sent.
+            overflow (str): Policy for a full send queue, "drop", "block"
+                or "disconnect".
+            resume (Optional[float]): Seconds sent keys and clicks can be
+                replayed to a reconnecting client, None disables sessions.
+            heartbeat (Optional[Heartbeat]): Link liveness and RTT measurement.
+            isolated (bool): Whether to capture input in a separate process.
+        """
+        super().__init__(host, port, options)
+        self.motion = motion
+        self.motion_rate = motion_rate
+        self.tracing = tracing
+        self.recorder = recorder
+        self.heartbeat = heartbeat
+        self.capture = evdev_capture if isolated else None
+        self.prioritize = prioritize
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.resume = resume
+        self.init()
+
+
+class EvdevAsyncServer(EvdevServerAdapter, AsyncServer):
+    """
+    Multi-client TCP server adapter for keyboard events read from evdev devices.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None,
+        motion: Optional[TCP] = None,
+        motion_rate: Optional[float] = None,
+        tracing: bool = False,
+        recorder: Optional[Recorder] = None,
+        queue_size: int = 1024,
+        overflow: str = "drop",
+        heartbeat: Optional[Heartbeat] = None,
+        isolated: bool = False
+    ) -> None:
+        """
+        Initialize the Evdev asyncio server.
+
+        Args:
+            host (str): The hostname or IP address to bind the server to.
+            port (int): The port number to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion (Optional[TCP]): Channel for mouse motion and scroll events.
+            motion_rate (Optional[float]): Maximum coalesced motion deltas per
+                second, None sends every move as it happens.
+            tracing (bool): Whether to stamp frames for latency tracing.
+            recorder (Optional[Recorder]): Event log capturing the session.
+            queue_size (int): Maximum packets buffered per client.
+            overflow (str): What to do when a client's queue is full.
+            heartbeat (Optional[Heartbeat]): Link liveness and RTT measurement.
+            isolated (bool): Whether to capture input in a separate process.
+        """
+        super().__init__(host, port, options, queue_size, overflow)
+        self.motion = motion
+        self.motion_rate = motion_rate
+        self.tracing = tracing
+        self.recorder = recorder
+        self.heartbeat = heartbeat
+        self.capture = evdev_capture if isolated else None
+        self.init()
+
+
+class EvdevPoolServer(EvdevServerAdapter, ConnectionPool):
+    """
+    Multi-target adapter driving a row of machines from evdev devices.
+    """
+
+    def __init__(
+        self,
+        targets: List[Address],
+        options: Optional[SocketOptions] = None,
+        motion_rate: Optional[float] = None,
+        recorder: Optional[Recorder] = None,
+        queue_size: int = 1024,
+        overflow: str = "drop",
+        heartbeat: Optional[Heartbeat] = None,
+        router: Optional[Router] = None,
+        screens: Optional[ScreenLayout] = None,
+        isolated: bool = False
+    ) -> None:
+        """
+        Initialize the Evdev pool server.
+
+        Args:
+            targets (List[Address]): Host and port of every target, in order.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion_rate (Optional[float]): Maximum coalesced motion deltas per
+                second, None sends every move as it happens.
+            recorder (Optional[Recorder]): Event log capturing the session.
+            queue_size (int): Maximum packets buffered per target.
+            overflow (str): What to do when a target's queue is full.
+            heartbeat (Optional[Heartbeat]): Link liveness and RTT measurement.
+            router (Optional[Router]): Chooses the targets of every event, None
+                broadcasts them to all.
+            screens (Optional[ScreenLayout]): Target screen geometry for
+                switching at the screen edges, needs a router.
+            isolated (bool): Whether to capture input in a separate process.
+        """
+        super().__init__(targets, options, queue_size, overflow)
+        self.motion_rate = motion_rate
+        self.recorder = recorder
+        self.heartbeat = heartbeat
+        self.capture = evdev_capture if isolated else None
+        self.router = router
+        self.screens = screens
+        self.init()
+
+
+class EvdevLocalServer(EvdevServerAdapter, LocalServer):
+    """
+    Unix domain socket adapter feeding local consumers from evdev devices.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        options: Optional[SocketOptions] = None,
+        motion_rate: Optional[float] = None,
+        tracing: bool = False,
+        recorder: Optional[Recorder] = None,
+        queue_size: int = 1024,
+        heartbeat: Optional[Heartbeat] = None,
+        isolated: bool = False
+    ) -> None:
+        """
+        Initialize the Evdev local server.
+
+        Args:
+            path (str): Path of the Unix domain socket to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion_rate (Optional[float]): Maximum coalesced motion deltas per
+                second, None sends every move as it happens.
+            tracing (bool): Whether to stamp frames for latency tracing.
+            recorder (Optional[Recorder]): Event log capturing the session.
+            queue_size (int): Maximum packets buffered per consumer.
+            heartbeat (Optional[Heartbeat]): Link liveness and RTT measurement.
+            isolated (bool): Whether to capture input in a separate process.
+        """
+        super().__init__(path, options, queue_size)
+        self.motion_rate = motion_rate
+        self.tracing = tracing
+        self.recorder = recorder
+        self.heartbeat = heartbeat
+        self.capture = evdev_capture if isolated else None
+        self.init()
+
+
+class EvdevClient(InjectionClient):
+    """
+    TCP client adapter for simulating keyboard and mouse events through uinput.
+
+    This class connects to a TCP server, receives keyboard and mouse events,
+    and injects them with a virtual uinput device. Every batch of events
+    read from the network is written inside one frame, so coalesced motion
+    and the button change that follows it reach the kernel together.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None,
+        motion: Optional[TCP] = None,
+        writer: Optional[UInputWriter] = None,
+        idle_release: Optional[float] = None,
+        tracer: Optional[Tracer] = None,
+        retry: bool = False,
+        timeout: Optional[float] = None,
+        listen: bool = False
+    ) -> None:
+        """
+        Initialize the Evdev client.
+
+        Args:
+            host (str): The hostname or IP address of the server to connect to.
+            port (int): The port number of the server.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion (Optional[TCP]): Channel receiving mouse motion and scroll events.
+            writer (Optional[UInputWriter]): Writer used for injection, defaults
+                to the shared uinput device.
+            idle_release (Optional[float]): Seconds without events before held
+                keys are released, None to only release on disconnect.
+            tracer (Optional[Tracer]): Latency tracer, None disables tracing.
+            retry (bool): Whether to reconnect when the connection drops.
+            timeout (Optional[float]): Seconds without any frame from a
+                heartbeating server before the link is considered dead.
+            listen (bool): Whether to wait for the server to connect, as a
+                target of a connection pool.
+        """
+        self.writer: UInputWriter = writer if writer is not None else shared_writer()
+        super().__init__(host, port, options, motion, idle_release, tracer, retry, timeout, listen)
+
+    def backends(self) -> Tuple[EvdevKeyboardEvent, EvdevMouseEvent]:
+        """
+        Create the Evdev injection backends on the shared writer.
+
+        Returns:
+            Tuple[EvdevKeyboardEvent, EvdevMouseEvent]: The keyboard and mouse backends.
+        """
+        return EvdevKeyboardEvent(writer=self.writer), EvdevMouseEvent(writer=self.writer)
+
+    def button(self, code: int) -> Optional[EvdevButton]:
+        """
+        Convert a numeric button code into an evdev button code.
+
+        Args:
+            code (int): The wire code received from the server.
+
+        Returns:
+            Optional[EvdevButton]: The evdev button code, or None if unknown.
+        """
+        return KEY_TABLE.button(code)
+
+    def batch(self) -> ContextManager:
+        """
+        Get the uinput frame grouping the injections of one received batch.
+
+        Returns:
+            ContextManager: A frame of the shared writer.
+        """
+        return self.writer.frame()
+
+
+class EvdevLocalClient(LocalClient, EvdevClient):
+    """
+    Unix domain socket client adapter injecting events through uinput.
+
+    The host is the path of the socket the local server listens on.
+    """
@@ -0,0 +1,371 @@
+"""Injection client module turning received wire frames into backend calls."""
+from typing import Any, ContextManager, List, Optional, Tuple
+from abc import abstractmethod
+from contextlib import nullcontext
+from src.tcp import BaseClient, Event, EventKind, EventType, FrameDecoder, ReceiveBuffer, encode
+from src.tcp.base import TCP
+from src.tcp.options import SocketOptions
+from src.pipeline.keys import StuckKeyGuard
+from src.pipeline.trace import SYNC_INTERVAL, SYNC_SAMPLES, SYNC_SPACING, Tracer
+from src.pipeline.session import TOKEN_SIZE, Backoff, sequence_of, sequenced
+from src.backends.base import KeyboardBackend, MouseBackend
+import threading
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class InjectionClient(BaseClient):
+    """
+    TCP client adapter for simulating received keyboard and mouse events.
+
+    This class holds the injection side shared by every backend. It
+    connects to a TCP server, receives framed events and hands them to the
+    backends created by ``backends``, converting button codes with
+    ``button``. Subclasses can group the injections of one received batch
+    by returning a context manager from ``batch``.
+
+    Every connection starts with a greeting carrying the session token and
+    the last sequence number received, so a server keeping a session can
+    send again what was missed, and frames already received are skipped.
+    With retry on, a dropped connection is reestablished with exponential
+    backoff. Heartbeat pings from the server are echoed back, and once the
+    server is known to send them, a silence longer than the timeout is
+    taken as a dead link.
+    """
+
+    keyboard_event: KeyboardBackend
+    mouse_event: MouseBackend
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None,
+        motion: Optional[TCP] = None,
+        idle_release: Optional[float] = None,
+        tracer: Optional[Tracer] = None,
+        retry: bool = False,
+        timeout: Optional[float] = None,
+        listen: bool = False
+    ) -> None:
+        """
+        Initialize the client and connect to the server.
+
+        Args:
+            host (str): The hostname or IP address of the server to connect to.
+            port (int): The port number of the server.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion (Optional[TCP]): Channel receiving mouse motion and scroll events.
+            idle_release (Optional[float]): Seconds without events before held
+                keys are released, None to only release on disconnect.
+            tracer (Optional[Tracer]): Latency tracer, None disables tracing.
+            retry (bool): Whether to reconnect when the connection drops.
+            timeout (Optional[float]): Seconds without any frame from a
+                heartbeating server before the link is considered dead.
+            listen (bool): Whether to wait for the server to connect, as a
+                target of a connection pool.
+        """
+        super().__init__(host, port, options, listen)
+        self.keyboard_event, self.mouse_event = self.backends()
+        self.buffer = ReceiveBuffer()
+        self.motion = motion
+        self.keys = StuckKeyGuard(self.release_keys, idle_release)
+        self.tracer = tracer
+        self.retry = retry
+        self.timeout = timeout
+        self.seen: float = time.monotonic()
+        self.heartbeats: bool = False
+        self.received: int = 0
+        self.token: Optional[bytes] = None
+        self.sequence: int = 0
+        self.sequenced: bool = False
+
+    @abstractmethod
+    def backends(self) -> Tuple[KeyboardBackend, MouseBackend]:
+        """
+        Create the injection backends.
+
+        Returns:
+            Tuple[KeyboardBackend, MouseBackend]: The keyboard and mouse backends.
+        """
+        pass
+
+    @abstractmethod
+    def button(self, code: int) -> Optional[Any]:
+        """
+        Convert a numeric button code into a backend mouse button.
+
+        Args:
+            code (int): The wire code received from the server.
+
+        Returns:
+            Optional[Any]: The matching button, or None if the backend has no
+            such button.
+        """
+        pass
+
+    def batch(self) -> ContextManager:
+        """
+        Get the context grouping the injections of one received batch.
+
+        Returns:
+            ContextManager: A context that does nothing by default.
+        """
+        return nullcontext()
+
+    def release_keys(self, codes: List[int]) -> None:
+        """
+        Release a batch of held keys.
+
+        Args:
+            codes (List[int]): The codes of the keys to release.
+        """
+        with self.batch():
+            for code in codes:
+                self.keyboard_event.insert_code(code, False)
+
+    def handle(self, event: Event) -> None:
+        """
+        Handle an event decoded from the reliable connection.
+
+        Numbered events already received in an earlier connection are skipped.
+        Only input events hold off the idle release of held keys.
+
+        Args:
+            event (Event): The event received from the server.
+        """
+        if event.type == EventType.CONTROL and event.kind in (EventKind.WELCOME, EventKind.PING):
+            self.control(event)
+            return
+
+        if self.sequenced and sequenced(event):
+            number = sequence_of(event)
+
+            if number <= self.sequence:
+                return
+
+            self.sequence = number
+
+        if event.type == EventType.MOUSE:
+            self.keys.touch()
+
+        if self.tracer is None:
+            self.inject(event)
+        else:
+            self.trace(event, self.received)
+
+    def control(self, event: Event) -> None:
+        """
+        Handle a control frame sent by the server on its own.
+
+        Args:
+            event (Event): The session greeting or heartbeat ping.
+        """
+        if event.kind == EventKind.WELCOME:
+            self.welcome(event)
+            return
+
+        self.heartbeats = True
+
+        try:
+            self.send(encode(EventType.CONTROL, EventKind.PONG, payload=event.payload))
+
+        except OSError:
+            pass
+
+    def watch_server(self) -> None:
+        """
+        Drop the connection when a heartbeating server falls silent.
+
+        Waking up the receive loop this way lets it reconnect, instead of
+        waiting on a dead link until the kernel gives up.
+        """
+        while True:
+            time.sleep(self.timeout / 4)
+
+            if self.heartbeats and time.monotonic() - self.seen > self.timeout:
+                logger.warning("No frame from the server for %.1f s, dropping the link", self.timeout)
+                self.heartbeats = False
+                self.drop()
+
+    def hello(self) -> None:
+        """
+        Greet the server with the known session token and last sequence number.
+        """
+        self.send(encode(
+            EventType.CONTROL, EventKind.HELLO, self.sequence,
+            payload=self.token if self.token is not None else bytes(TOKEN_SIZE)
+        ))
+
+    def welcome(self, event: Event) -> None:
+        """
+        Join the session announced by the server.
+
+        A token other than the known one means a new session, whose
+        numbering starts over.
+
+        Args:
+            event (Event): The greeting holding the session token.
+        """
+        token = bytes(event.payload[:TOKEN_SIZE])
+
+        if token != self.token:
+            self.token = token
+            self.sequence = 0
+
+        self.sequenced = True
+
+    def rejoin(self) -> None:
+        """
+        Reconnect to the server, waiting longer after every failed attempt.
+        """
+        backoff = Backoff()
+
+        while True:
+            backoff.wait()
+
+            try:
+                self.reconnect()
+                return
+
+            except OSError as error:
+                logger.info("Reconnect attempt %d failed: %s", backoff.attempts, error)
+
+    def trace(self, event: Event, received: int) -> None:
+        """
+        Simulate an event and record its stage latencies.
+
+        Control events are handed to the tracer instead.
+
+        Args:
+            event (Event): The event received from the server.
+            received (int): Monotonic time the event was received.
+        """
+        if event.type == EventType.CONTROL:
+            self.tracer.control(event, received)
+            return
+
+        start = time.monotonic_ns()
+        self.inject(event)
+        self.tracer.record(event, received, start, time.monotonic_ns())
+
+    def sync_clock(self) -> None:
+        """
+        Periodically send bursts of clock synchronization pings to the server.
+        """
+        while True:
+            for _ in range(SYNC_SAMPLES):
+                try:
+                    self.send(self.tracer.ping())
+
+                except OSError:
+                    pass
+
+                time.sleep(SYNC_SPACING)
+
+            time.sleep(SYNC_INTERVAL)
+
+    def inject(self, event: Event) -> None:
+        """
+        Simulate a single decoded event locally.
+
+        Args:
+            event (Event): The event received from the server.
+        """
+        match event.kind:
+            case EventKind.KEY_PRESS:
+                if self.keys.press(event.code):
+                    self.keyboard_event.insert_code(event.code)
+
+            case EventKind.KEY_RELEASE:
+                if self.keys.release(event.code):
+                    self.keyboard_event.insert_code(event.code, False)
+
+            case EventKind.MOVE:
+                self.mouse_event.insert_move(event.x, event.y)
+
+            case EventKind.MOTION:
+                self.mouse_event.insert_motion(event.x, event.y)
+
+            case EventKind.BUTTON_PRESS | EventKind.BUTTON_RELEASE:
+                button = self.button(event.code)
+
+                if button is not None:
+                    self.mouse_event.insert_click(button, event.kind == EventKind.BUTTON_PRESS)
+
+            case EventKind.SCROLL:
+                self.mouse_event.insert_scroll(event.x, event.y)
+
+    def receive_motion(self) -> None:
+        """
+        Receive and simulate events from the motion channel.
+
+        Every datagram holds complete frames, so each one is decoded on its own.
+        """
+        while True:
+            events = FrameDecoder().feed(self.motion.receive())
+            received = time.monotonic_ns()
+            self.keys.touch()
+
+            with self.batch():
+                for event in events:
+                    if self.tracer is None:
+                        self.inject(event)
+                    else:
+                        self.trace(event, received)
+
+    def run(self) -> None:
+        """
+        Start the client and receive keyboard and mouse events from the server.
+
+        Continuously receives framed event data from the server into a
+        preallocated buffer and simulates each received batch locally.
+        Events from the motion channel, if any, are handled in a separate
+        thread. Keys still held when the connection drops are released,
+        and with retry on the client then reconnects and greets the server
+        again. With a tracer, clock synchronization runs in another thread.
+        """
+        if self.motion is not None:
+            threading.Thread(target=self.receive_motion, daemon=True).start()
+
+        if self.tracer is not None:
+            threading.Thread(target=self.sync_clock, daemon=True).start()
+
+        if self.timeout is not None:
+            threading.Thread(target=self.watch_server, daemon=True).start()
+
+        self.keys.start()
+
+        while True:
+            self.sequenced = False
+            self.heartbeats = False
+
+            try:
+                self.hello()
+
+                while self.buffer.fill(self.receive_into):
+                    self.seen = time.monotonic()
+
+                    if self.tracer is not None:
+                        self.received = time.monotonic_ns()
+
+                    with self.batch():
+                        self.buffer.drain(self.handle)
+
+            except OSError as error:
+                if not self.retry:
+                    raise
+
+                logger.warning("Connection lost: %s", error)
+
+            finally:
+                self.keys.release_all()
+
+            if not self.retry:
+                break
+
+            self.buffer.reset()
+            self.rejoin()
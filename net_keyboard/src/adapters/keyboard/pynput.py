@@ -1,13 +1,117 @@
 """Pynput adapter module for keyboard and mouse event handling over network."""
-from typing import Optional
-from src.tcp import BaseServer, BaseClient
-import threading
-from src.backends.base import KeyboardTypeEvent, MouseTypeEvent
-from src.backends.pynput import PynputKeyboardEvent, PynputMouseEvent, PynputKey
-from pynput.keyboard import Key, KeyCode
+from typing import Callable, Dict, List, Optional, Tuple
+from src.tcp import BaseServer, AsyncServer, ConnectionPool, LocalServer, LocalClient
+from src.tcp.base import TCP
+from src.tcp.options import SocketOptions
+from src.tcp.pool import Address
+from src.adapters.keyboard.capture import CaptureAdapter
+from src.adapters.keyboard.inject import InjectionClient
+from src.pipeline.record import Recorder
+from src.pipeline.heartbeat import Heartbeat
+from src.pipeline.routing import Router
+from src.pipeline.screens import ScreenLayout
+from src.backends.keycodes import BUTTON_NAMES, BUTTON_CODES
+from src.backends.pynput import PynputKeyboardEvent, PynputMouseEvent, PynputKey, PynputButton,\
+    KEY_TABLE
+from pynput.mouse import Button
 
 
-class PynputServer(BaseServer):
+BUTTON_ALIASES: Dict[str, str] = {"button8": "x1", "button9": "x2"}
+BUTTONS_BY_NAME: Dict[str, PynputButton] = {
+    BUTTON_ALIASES.get(button.name, button.name): button
+    for button in Button
+    if button.name != "unknown"
+}
+BUTTONS: List[Optional[PynputButton]] = [BUTTONS_BY_NAME.get(name) for name in BUTTON_NAMES]
+
+
+def button_to_code(button: PynputButton) -> int:
+    """
+    Convert a Pynput mouse button into its numeric wire code.
+
+    Args:
+        button (PynputButton): The button to convert.
+
+    Returns:
+        int: The index of the button in BUTTON_NAMES, 0 if unknown.
+    """
+    return BUTTON_CODES.get(BUTTON_ALIASES.get(button.name, button.name), 0)
+
+
+def pynput_capture() -> Tuple[
+    PynputKeyboardEvent, PynputMouseEvent, Callable[[PynputKey], Optional[int]],
+    Callable[[PynputButton], int]
+]:
+    """
+    Create the Pynput capture backends inside an isolated capture process.
+
+    Returns:
+        Tuple: The keyboard and mouse backends, and the functions converting
+        their keys and buttons to wire codes.
+    """
+    return PynputKeyboardEvent(), PynputMouseEvent(), KEY_TABLE.code, button_to_code
+
+
+def code_to_button(code: int) -> Optional[PynputButton]:
+    """
+    Convert a numeric wire code back into a Pynput mouse button.
+
+    Args:
+        code (int): The wire code received from the server.
+
+    Returns:
+        Optional[PynputButton]: The matching mouse button, or None if this
+        platform has no such button.
+    """
+    return BUTTONS[code] if 0 <= code < len(BUTTONS) else None
+
+
+class PynputServerAdapter(CaptureAdapter):
+    """
+    Capture adapter for keyboard and mouse events using Pynput.
+
+    Keys and buttons are converted with the Pynput key table and the
+    button mapping of this module.
+    """
+
+    keyboard_event: PynputKeyboardEvent
+    mouse_event: PynputMouseEvent
+
+    def backends(self) -> Tuple[PynputKeyboardEvent, PynputMouseEvent]:
+        """
+        Create the Pynput capture backends.
+
+        Returns:
+            Tuple[PynputKeyboardEvent, PynputMouseEvent]: The keyboard and mouse backends.
+        """
+        return PynputKeyboardEvent(), PynputMouseEvent()
+
+    def key_code(self, key: PynputKey) -> Optional[int]:
+        """
+        Convert a Pynput key into its numeric wire code.
+
+        Args:
+            key (PynputKey): The captured key.
+
+        Returns:
+            Optional[int]: The key code, or None if the key cannot be sent.
+        """
+        return KEY_TABLE.code(key)
+
+    def button_code(self, button: PynputButton) -> int:
+        """
+        Convert a Pynput mouse button into its numeric wire code.
+
+        Args:
+            button (PynputButton): The captured button.
+
+        Returns:
+            int: The index of the button in BUTTON_NAMES, 0 if unknown.
+        """
+        return button_to_code(button)
+
+
+class PynputServer(PynputServerAdapter, BaseServer):
     """
     TCP server adapter for keyboard events using Pynput.
     
@@ -15,41 +119,198 @@ class PynputServer(BaseServer):
     over TCP to connected clients using the Pynput library.
     """
     
-    def __init__(self, host: str, port: int) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None,
+        motion: Optional[TCP] = None,
+        motion_rate: Optional[float] = None,
+        tracing: bool = False,
+        recorder: Optional[Recorder] = None,
+        prioritize: bool = False,
+        queue_size: int = 1024,
+        overflow: str = "drop",
+        resume: Optional[float] = None,
+        heartbeat: Optional[Heartbeat] = None,
+        isolated: bool = False
+    ) -> None:
         """
         Initialize the Pynput server.
         
         Args:
             host (str): The hostname or IP address to bind the server to.
             port (int): The port number to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion (Optional[TCP]): Channel for mouse motion and scroll events.
+            motion_rate (Optional[float]): Maximum coalesced motion deltas per
+                second, None sends every move as it happens.
+            tracing (bool): Whether to stamp frames for latency tracing.
+            recorder (Optional[Recorder]): Event log capturing the session.
+            prioritize (bool): Whether keys and clicks are sent ahead of queued motion.
+            queue_size (int): Maximum frames waiting to be sent.
+            overflow (str): Policy for a full send queue, "drop", "block"
+                or "disconnect".
+            resume (Optional[float]): Seconds sent keys and clicks can be
+                replayed to a reconnecting client, None disables sessions.
+            heartbeat (Optional[Heartbeat]): Link liveness and RTT measurement.
+            isolated (bool): Whether to capture input in a separate process.
         """
-        super().__init__(host, port)
-        self.keyboard_event = PynputKeyboardEvent()
-        self.mouse_event = PynputMouseEvent()
+        super().__init__(host, port, options)
+        self.motion = motion
+        self.motion_rate = motion_rate
+        self.tracing = tracing
+        self.recorder = recorder
+        self.heartbeat = heartbeat
+        self.capture = pynput_capture if isolated else None
+        self.prioritize = prioritize
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.resume = resume
+        self.init()
 
-        self.keyboard_event.add_callback(self.keyboard_press, KeyboardTypeEvent.PRESS)
 
-    def keyboard_press(self, key: PynputKey) -> None:
+class PynputAsyncServer(PynputServerAdapter, AsyncServer):
+    """
+    Multi-client TCP server adapter for keyboard events using Pynput.
+
+    This class captures keyboard and mouse events locally and broadcasts
+    them to every connected client through the asyncio server engine.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None,
+        motion: Optional[TCP] = None,
+        motion_rate: Optional[float] = None,
+        tracing: bool = False,
+        recorder: Optional[Recorder] = None,
+        queue_size: int = 1024,
+        overflow: str = "drop",
+        heartbeat: Optional[Heartbeat] = None,
+        isolated: bool = False
+    ) -> None:
         """
-        Handle keyboard press events and send them to the client.
-        
+        Initialize the Pynput asyncio server.
+
         Args:
-            key (PynputKey): The key that was pressed.
+            host (str): The hostname or IP address to bind the server to.
+            port (int): The port number to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion (Optional[TCP]): Channel for mouse motion and scroll events.
+            motion_rate (Optional[float]): Maximum coalesced motion deltas per
+                second, None sends every move as it happens.
+            tracing (bool): Whether to stamp frames for latency tracing.
+            recorder (Optional[Recorder]): Event log capturing the session.
+            queue_size (int): Maximum packets buffered per client.
+            overflow (str): What to do when a client's queue is full.
+            heartbeat (Optional[Heartbeat]): Link liveness and RTT measurement.
+            isolated (bool): Whether to capture input in a separate process.
         """
-        if isinstance(key, Key): 
-            self.send(key.name)
-        
-        elif isinstance(key, KeyCode):
-            self.send(key.char)
+        super().__init__(host, port, options, queue_size, overflow)
+        self.motion = motion
+        self.motion_rate = motion_rate
+        self.tracing = tracing
+        self.recorder = recorder
+        self.heartbeat = heartbeat
+        self.capture = pynput_capture if isolated else None
+        self.init()
+
+
+class PynputPoolServer(PynputServerAdapter, ConnectionPool):
+    """
+    Multi-target adapter driving a row of machines using Pynput.
+
+    This class captures keyboard and mouse events locally and sends them
+    through a connection pool, to the targets picked by the router.
+    """
+
+    def __init__(
+        self,
+        targets: List[Address],
+        options: Optional[SocketOptions] = None,
+        motion_rate: Optional[float] = None,
+        recorder: Optional[Recorder] = None,
+        queue_size: int = 1024,
+        overflow: str = "drop",
+        heartbeat: Optional[Heartbeat] = None,
+        router: Optional[Router] = None,
+        screens: Optional[ScreenLayout] = None,
+        isolated: bool = False
+    ) -> None:
+        """
+        Initialize the Pynput pool server.
+
+        Args:
+            targets (List[Address]): Host and port of every target, in order.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion_rate (Optional[float]): Maximum coalesced motion deltas per
+                second, None sends every move as it happens.
+            recorder (Optional[Recorder]): Event log capturing the session.
+            queue_size (int): Maximum packets buffered per target.
+            overflow (str): What to do when a target's queue is full.
+            heartbeat (Optional[Heartbeat]): Link liveness and RTT measurement.
+            router (Optional[Router]): Chooses the targets of every event, None
+                broadcasts them to all.
+            screens (Optional[ScreenLayout]): Target screen geometry for
+                switching at the screen edges, needs a router.
+            isolated (bool): Whether to capture input in a separate process.
+        """
+        super().__init__(targets, options, queue_size, overflow)
+        self.motion_rate = motion_rate
+        self.recorder = recorder
+        self.heartbeat = heartbeat
+        self.capture = pynput_capture if isolated else None
+        self.router = router
+        self.screens = screens
+        self.init()
 
-    def run(self) -> None:
+
+class PynputLocalServer(PynputServerAdapter, LocalServer):
+    """
+    Unix domain socket adapter feeding local consumers using Pynput.
+
+    This class captures keyboard and mouse events locally and sends them
+    to every consumer connected to a socket path on the same host.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        options: Optional[SocketOptions] = None,
+        motion_rate: Optional[float] = None,
+        tracing: bool = False,
+        recorder: Optional[Recorder] = None,
+        queue_size: int = 1024,
+        heartbeat: Optional[Heartbeat] = None,
+        isolated: bool = False
+    ) -> None:
         """
-        Start the server and listen for keyboard events in a separate thread.
+        Initialize the Pynput local server.
+
+        Args:
+            path (str): Path of the Unix domain socket to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion_rate (Optional[float]): Maximum coalesced motion deltas per
+                second, None sends every move as it happens.
+            tracing (bool): Whether to stamp frames for latency tracing.
+            recorder (Optional[Recorder]): Event log capturing the session.
+            queue_size (int): Maximum packets buffered per consumer.
+            heartbeat (Optional[Heartbeat]): Link liveness and RTT measurement.
+            isolated (bool): Whether to capture input in a separate process.
         """
-        threading.Thread(target=self.keyboard_event.listen).start()
+        super().__init__(path, options, queue_size)
+        self.motion_rate = motion_rate
+        self.tracing = tracing
+        self.recorder = recorder
+        self.heartbeat = heartbeat
+        self.capture = pynput_capture if isolated else None
+        self.init()
 
 
-class PynputClient(BaseClient):
+class PynputClient(InjectionClient):
     """
     TCP client adapter for simulating keyboard and mouse events using Pynput.
     
@@ -57,25 +318,32 @@ class PynputClient(BaseClient):
     and simulates them locally using the Pynput library.
     """
 
-    def __init__(self, host: str, port: int) -> None:
+    def backends(self) -> Tuple[PynputKeyboardEvent, PynputMouseEvent]:
         """
-        Initialize the Pynput client.
-        
-        Args:
-            host (str): The hostname or IP address of the server to connect to.
-            port (int): The port number of the server.
+        Create the Pynput injection backends.
+
+        Returns:
+            Tuple[PynputKeyboardEvent, PynputMouseEvent]: The keyboard and mouse backends.
         """
-        super().__init__(host, port)
-        self.keyboard_event = PynputKeyboardEvent()
-        self.mouse_event = PynputMouseEvent()
+        return PynputKeyboardEvent(), PynputMouseEvent()
 
-    def run(self) -> None:
+    def button(self, code: int) -> Optional[PynputButton]:
         """
-        Start the client and receive keyboard events from the server.
-        
-        Continuously receives keyboard event data from the server and
-        simulates the keystrokes locally.
+        Convert a numeric button code into a Pynput mouse button.
+
+        Args:
+            code (int): The wire code received from the server.
+
+        Returns:
+            Optional[PynputButton]: The matching mouse button, or None if this
+            platform has no such button.
         """
-        while True:
-            data: bytes = self.receive()
-            self.keyboard_event.insert("data")
+        return code_to_button(code)
+
+
+class PynputLocalClient(LocalClient, PynputClient):
+    """
+    Unix domain socket client adapter simulating events using Pynput.
+
+    The host is the path of the socket the local server listens on.
+    """
@@ -0,0 +1,319 @@
+"""Synthetic adapter module for stress-testing the network pipeline headless."""
+from typing import Iterable, List, Optional, Tuple
+from src.tcp import BaseServer, AsyncServer, ConnectionPool, LocalServer, LocalClient
+from src.tcp.base import TCP
+from src.tcp.options import SocketOptions
+from src.tcp.pool import Address
+from src.adapters.keyboard.capture import CaptureAdapter
+from src.adapters.keyboard.inject import InjectionClient
+from src.pipeline.record import Recorder
+from src.pipeline.heartbeat import Heartbeat
+from src.pipeline.routing import Router
+from src.pipeline.screens import ScreenLayout
+from src.backends.keycodes import BUTTON_NAMES
+from src.backends.synthetic import SyntheticKeyboardEvent, SyntheticMouseEvent, SyntheticKey,\
+    SyntheticButton, KeyStep, MouseStep
+
+
+class SyntheticServerAdapter(CaptureAdapter):
+    """
+    Capture adapter playing generated workloads instead of real input.
+
+    Synthetic keys and buttons already are wire codes, so they are sent
+    unchanged through the same pipeline as real devices.
+    """
+
+    keyboard_event: SyntheticKeyboardEvent
+    mouse_event: SyntheticMouseEvent
+    keyboard_workload: Optional[Iterable[KeyStep]] = None
+    mouse_workload: Optional[Iterable[MouseStep]] = None
+    speed: float = 1.0
+
+    def backends(self) -> Tuple[SyntheticKeyboardEvent, SyntheticMouseEvent]:
+        """
+        Create the synthetic capture backends with the configured workloads.
+
+        Returns:
+            Tuple[SyntheticKeyboardEvent, SyntheticMouseEvent]: The keyboard and mouse backends.
+        """
+        return (
+            SyntheticKeyboardEvent(self.keyboard_workload, self.speed),
+            SyntheticMouseEvent(self.mouse_workload, self.speed)
+        )
+
+    def key_code(self, key: SyntheticKey) -> Optional[int]:
+        """
+        Get the wire code of a synthetic key.
+
+        Args:
+            key (SyntheticKey): The generated key.
+
+        Returns:
+            Optional[int]: The key code itself.
+        """
+        return key
+
+    def button_code(self, button: SyntheticButton) -> int:
+        """
+        Get the wire code of a synthetic button.
+
+        Args:
+            button (SyntheticButton): The generated button.
+
+        Returns:
+            int: The button code itself.
+        """
+        return button
+
+
+class SyntheticServer(SyntheticServerAdapter, BaseServer):
+    """
+    TCP server adapter sending generated keyboard and mouse workloads.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None,
+        motion: Optional[TCP] = None,
+        motion_rate: Optional[float] = None,
+        tracing: bool = False,
+        recorder: Optional[Recorder] = None,
+        prioritize: bool = False,
+        queue_size: int = 1024,
+        overflow: str = "drop",
+        resume: Optional[float] = None,
+        heartbeat: Optional[Heartbeat] = None,
+        keyboard_workload: Optional[Iterable[KeyStep]] = None,
+        mouse_workload: Optional[Iterable[MouseStep]] = None,
+        speed: float = 1.0
+    ) -> None:
+        """
+        Initialize the synthetic server.
+
+        Args:
+            host (str): The hostname or IP address to bind the server to.
+            port (int): The port number to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion (Optional[TCP]): Channel for mouse motion and scroll events.
+            motion_rate (Optional[float]): Maximum coalesced motion deltas per
+                second, None sends every move as it happens.
+            tracing (bool): Whether to stamp frames for latency tracing.
+            recorder (Optional[Recorder]): Event log capturing the session.
+            prioritize (bool): Whether keys and clicks are sent ahead of queued motion.
+            queue_size (int): Maximum frames waiting to be sent.
+            overflow (str): Policy for a full send queue, "drop", "block"
+                or "disconnect".
+            resume (Optional[float]): Seconds sent keys and clicks can be
+                replayed to a reconnecting client, None disables sessions.
+            heartbeat (Optional[Heartbeat]): Link liveness and RTT measurement.
+            keyboard_workload (Optional[Iterable[KeyStep]]): Timed key events to play.
+            mouse_workload (Optional[Iterable[MouseStep]]): Timed pointer events to play.
+            speed (float): Time scale of the workloads, 0 plays them at full speed.
+        """
+        super().__init__(host, port, options)
+        self.motion = motion
+        self.motion_rate = motion_rate
+        self.tracing = tracing
+        self.recorder = recorder
+        self.heartbeat = heartbeat
+        self.prioritize = prioritize
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.resume = resume
+        self.keyboard_workload = keyboard_workload
+        self.mouse_workload = mouse_workload
+        self.speed = speed
+        self.init()
+
+
+class SyntheticAsyncServer(SyntheticServerAdapter, AsyncServer):
+    """
+    Multi-client TCP server adapter broadcasting generated workloads.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None,
+        motion: Optional[TCP] = None,
+        motion_rate: Optional[float] = None,
+        tracing: bool = False,
+        recorder: Optional[Recorder] = None,
+        queue_size: int = 1024,
+        overflow: str = "drop",
+        heartbeat: Optional[Heartbeat] = None,
+        keyboard_workload: Optional[Iterable[KeyStep]] = None,
+        mouse_workload: Optional[Iterable[MouseStep]] = None,
+        speed: float = 1.0
+    ) -> None:
+        """
+        Initialize the synthetic asyncio server.
+
+        Args:
+            host (str): The hostname or IP address to bind the server to.
+            port (int): The port number to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion (Optional[TCP]): Channel for mouse motion and scroll events.
+            motion_rate (Optional[float]): Maximum coalesced motion deltas per
+                second, None sends every move as it happens.
+            tracing (bool): Whether to stamp frames for latency tracing.
+            recorder (Optional[Recorder]): Event log capturing the session.
+            queue_size (int): Maximum packets buffered per client.
+            overflow (str): What to do when a client's queue is full.
+            heartbeat (Optional[Heartbeat]): Link liveness and RTT measurement.
+            keyboard_workload (Optional[Iterable[KeyStep]]): Timed key events to play.
+            mouse_workload (Optional[Iterable[MouseStep]]): Timed pointer events to play.
+            speed (float): Time scale of the workloads, 0 plays them at full speed.
+        """
+        super().__init__(host, port, options, queue_size, overflow)
+        self.motion = motion
+        self.motion_rate = motion_rate
+        self.tracing = tracing
+        self.recorder = recorder
+        self.heartbeat = heartbeat
+        self.keyboard_workload = keyboard_workload
+        self.mouse_workload = mouse_workload
+        self.speed = speed
+        self.init()
+
+
+class SyntheticPoolServer(SyntheticServerAdapter, ConnectionPool):
+    """
+    Multi-target adapter routing generated workloads through a connection pool.
+    """
+
+    def __init__(
+        self,
+        targets: List[Address],
+        options: Optional[SocketOptions] = None,
+        motion_rate: Optional[float] = None,
+        recorder: Optional[Recorder] = None,
+        queue_size: int = 1024,
+        overflow: str = "drop",
+        heartbeat: Optional[Heartbeat] = None,
+        router: Optional[Router] = None,
+        screens: Optional[ScreenLayout] = None,
+        keyboard_workload: Optional[Iterable[KeyStep]] = None,
+        mouse_workload: Optional[Iterable[MouseStep]] = None,
+        speed: float = 1.0
+    ) -> None:
+        """
+        Initialize the synthetic pool server.
+
+        Args:
+            targets (List[Address]): Host and port of every target, in order.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion_rate (Optional[float]): Maximum coalesced motion deltas per
+                second, None sends every move as it happens.
+            recorder (Optional[Recorder]): Event log capturing the session.
+            queue_size (int): Maximum packets buffered per target.
+            overflow (str): What to do when a target's queue is full.
+            heartbeat (Optional[Heartbeat]): Link liveness and RTT measurement.
+            router (Optional[Router]): Chooses the targets of every event, None
+                broadcasts them to all.
+            screens (Optional[ScreenLayout]): Target screen geometry for
+                switching at the screen edges, needs a router.
+            keyboard_workload (Optional[Iterable[KeyStep]]): Timed key events to play.
+            mouse_workload (Optional[Iterable[MouseStep]]): Timed pointer events to play.
+            speed (float): Time scale of the workloads, 0 plays them at full speed.
+        """
+        super().__init__(targets, options, queue_size, overflow)
+        self.motion_rate = motion_rate
+        self.recorder = recorder
+        self.heartbeat = heartbeat
+        self.router = router
+        self.screens = screens
+        self.keyboard_workload = keyboard_workload
+        self.mouse_workload = mouse_workload
+        self.speed = speed
+        self.init()
+
+
+class SyntheticLocalServer(SyntheticServerAdapter, LocalServer):
+    """
+    Unix domain socket adapter sending generated workloads to local consumers.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        options: Optional[SocketOptions] = None,
+        motion_rate: Optional[float] = None,
+        tracing: bool = False,
+        recorder: Optional[Recorder] = None,
+        queue_size: int = 1024,
+        heartbeat: Optional[Heartbeat] = None,
+        keyboard_workload: Optional[Iterable[KeyStep]] = None,
+        mouse_workload: Optional[Iterable[MouseStep]] = None,
+        speed: float = 1.0
+    ) -> None:
+        """
+        Initialize the synthetic local server.
+
+        Args:
+            path (str): Path of the Unix domain socket to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            motion_rate (Optional[float]): Maximum coalesced motion deltas per
+                second, None sends every move as it happens.
+            tracing (bool): Whether to stamp frames for latency tracing.
+            recorder (Optional[Recorder]): Event log capturing the session.
+            queue_size (int): Maximum packets buffered per consumer.
+            heartbeat (Optional[Heartbeat]): Link liveness and RTT measurement.
+            keyboard_workload (Optional[Iterable[KeyStep]]): Timed key events to play.
+            mouse_workload (Optional[Iterable[MouseStep]]): Timed pointer events to play.
+            speed (float): Time scale of the workloads, 0 plays them at full speed.
+        """
+        super().__init__(path, options, queue_size)
+        self.motion_rate = motion_rate
+        self.tracing = tracing
+        self.recorder = recorder
+        self.heartbeat = heartbeat
+        self.keyboard_workload = keyboard_workload
+        self.mouse_workload = mouse_workload
+        self.speed = speed
+        self.init()
+
+
+class SyntheticClient(InjectionClient):
+    """
+    TCP client adapter recording received events in memory.
+
+    Both synthetic backends share one injection log, so the order of keys
+    and pointer events is kept as it was injected.
+    """
+
+    keyboard_event: SyntheticKeyboardEvent
+    mouse_event: SyntheticMouseEvent
+
+    def backends(self) -> Tuple[SyntheticKeyboardEvent, SyntheticMouseEvent]:
+        """
+        Create the synthetic injection backends on a shared log.
+
+        Returns:
+            Tuple[SyntheticKeyboardEvent, SyntheticMouseEvent]: The keyboard and mouse backends.
+        """
+        keyboard = SyntheticKeyboardEvent()
+        return keyboard, SyntheticMouseEvent(log=keyboard.log)
+
+    def button(self, code: int) -> Optional[SyntheticButton]:
+        """
+        Check a numeric button code.
+
+        Args:
+            code (int): The wire code received from the server.
+
+        Returns:
+            Optional[SyntheticButton]: The code itself, or None if unknown.
+        """
+        return code if 0 < code < len(BUTTON_NAMES) else None
+
+
+class SyntheticLocalClient(LocalClient, SyntheticClient):
+    """
+    Unix domain socket client adapter recording received events in memory.
+
+    The host is the path of the socket the local server listens on.
+    """
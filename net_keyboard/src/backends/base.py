@@ -1,5 +1,5 @@
 """Base module for keyboard and mouse backend abstraction."""
-from typing import Generic, TypeVar, List, Callable
+from typing import Any, Dict, Generic, Optional, TypeVar, List, Callable
 from abc import ABC, abstractmethod
 from enum import Enum
 from dataclasses import dataclass, field
@@ -23,6 +23,69 @@ class KeyboardTypeEvent(Enum):
     RELEASE = "release"
 
 
+@dataclass(slots=True)
+class KeyInput:
+    """
+    Key change reported by a keyboard backend.
+
+    Attributes:
+        key (Any): The backend key.
+        pressed (bool): True for a press, False for a release.
+        scan (Optional[int]): The physical key, as a scan code or virtual
+            key code, None if the backend only knows the typed key.
+    """
+    key: Any
+    pressed: bool
+    scan: Optional[int] = None
+
+
+@dataclass(slots=True)
+class MoveInput:
+    """
+    Pointer position reported by a mouse backend.
+
+    Attributes:
+        x (int): The X coordinate of the mouse position.
+        y (int): The Y coordinate of the mouse position.
+    """
+    x: int
+    y: int
+
+
+@dataclass(slots=True)
+class ClickInput:
+    """
+    Button change reported by a mouse backend.
+
+    Attributes:
+        x (int): The X coordinate of the click position.
+        y (int): The Y coordinate of the click position.
+        button (Any): The backend button.
+        pressed (bool): True if the button was pressed, False if released.
+    """
+    x: int
+    y: int
+    button: Any
+    pressed: bool
+
+
+@dataclass(slots=True)
+class ScrollInput:
+    """
+    Wheel change reported by a mouse backend.
+
+    Attributes:
+        x (int): The X coordinate of the scroll position.
+        y (int): The Y coordinate of the scroll position.
+        scroll_x (int): The horizontal scroll change amount.
+        scroll_y (int): The vertical scroll change amount.
+    """
+    x: int
+    y: int
+    scroll_x: int
+    scroll_y: int
+
+
 @dataclass
 class KeyboardCallList:
     """
@@ -31,9 +94,15 @@ class KeyboardCallList:
     Attributes:
         press (CallList): List of callbacks for key press events.
         release (CallList): List of callbacks for key release events.
+        table (Dict[KeyboardTypeEvent, CallList]): The same lists indexed
+            by event kind, built once for dispatching.
     """
     press: CallList = field(default_factory=list)
     release: CallList = field(default_factory=list) 
+    table: Dict[KeyboardTypeEvent, CallList] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.table = {KeyboardTypeEvent.PRESS: self.press, KeyboardTypeEvent.RELEASE: self.release}
 
 
 @dataclass
@@ -45,10 +114,20 @@ class MouseCallList:
         move (CallList): List of callbacks for mouse movement events.
         click (CallList): List of callbacks for mouse click events.
         scroll (CallList): List of callbacks for mouse scroll events.
+        table (Dict[MouseTypeEvent, CallList]): The same lists indexed by
+            event kind, built once for dispatching.
     """
     move: CallList = field(default_factory=list)
     click: CallList = field(default_factory=list) 
     scroll: CallList = field(default_factory=list) 
+    table: Dict[MouseTypeEvent, CallList] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.table = {
+            MouseTypeEvent.MOVE: self.move,
+            MouseTypeEvent.CLICK: self.click,
+            MouseTypeEvent.SCROLL: self.scroll
+        }
 
 
 class KeyboardBackend(Generic[K], ABC):
@@ -56,8 +135,11 @@ class KeyboardBackend(Generic[K], ABC):
     Abstract base class for keyboard backend implementations.
     
     This class defines the interface that all keyboard backend implementations
-    must follow for handling keyboard events.
+    must follow for handling keyboard events. Callbacks receive a single
+    KeyInput record per event.
     """
+
+    callbacks: KeyboardCallList
     
     @abstractmethod
     def on_press(self, key: K) -> None:
@@ -88,6 +170,17 @@ class KeyboardBackend(Generic[K], ABC):
             key (str): The key to press.
         """
         pass
+
+    @abstractmethod
+    def insert_code(self, code: int, pressed: bool = True) -> None:
+        """
+        Simulate pressing or releasing a key given its numeric code.
+
+        Args:
+            code (int): The key code, laid out as in src.backends.keycodes.
+            pressed (bool): True to press the key, False to release it.
+        """
+        pass
     
     @abstractmethod
     def listen(self) -> None:
@@ -96,14 +189,40 @@ class KeyboardBackend(Generic[K], ABC):
         """
         pass
 
+    def add_callback(self, cb: Callable[[KeyInput], None], kind: KeyboardTypeEvent) -> None:
+        """
+        Register a callback function for keyboard events.
+
+        Args:
+            cb (Callable[[KeyInput], None]): The callback function to register.
+            kind (KeyboardTypeEvent): The type of keyboard event to listen for.
+        """
+        self.callbacks.table[kind].append(cb)
+
+    def notify_callbacks(self, kind: KeyboardTypeEvent, event: KeyInput) -> None:
+        """
+        Notify all registered callbacks for a keyboard event.
+
+        Args:
+            kind (KeyboardTypeEvent): The type of keyboard event.
+            event (KeyInput): The key change passed to every callback.
+        """
+        for cb in self.callbacks.table[kind]:
+            cb(event)
+
 
 class MouseBackend(Generic[B], ABC):
     """
     Abstract base class for mouse backend implementations.
     
     This class defines the interface that all mouse backend implementations
-    must follow for handling mouse events.
+    must follow for handling mouse events. Callbacks receive a single
+    record per event. Once pooling is enabled, every move reuses the same
+    MoveInput, so callbacks must read it right away and not keep it.
     """
+
+    callbacks: MouseCallList
+    pooled: Optional[MoveInput] = None
     
     @abstractmethod
     def on_move(
@@ -158,9 +277,105 @@ class MouseBackend(Generic[B], ABC):
         """
         pass
 
+    @abstractmethod
+    def insert_move(
+        self,
+        mouse_position_x: int,
+        mouse_position_y: int
+    ) -> None:
+        """
+        Simulate moving the mouse to a position.
+
+        Args:
+            mouse_position_x (int): The X coordinate to move to.
+            mouse_position_y (int): The Y coordinate to move to.
+        """
+        pass
+
+    @abstractmethod
+    def insert_motion(self, delta_x: int, delta_y: int) -> None:
+        """
+        Simulate moving the mouse relative to its current position.
+
+        Args:
+            delta_x (int): The horizontal distance to move.
+            delta_y (int): The vertical distance to move.
+        """
+        pass
+
+    @abstractmethod
+    def insert_click(self, button: B, pressed: bool) -> None:
+        """
+        Simulate pressing or releasing a mouse button.
+
+        Args:
+            button (B): The mouse button to simulate.
+            pressed (bool): True to press the button, False to release it.
+        """
+        pass
+
+    @abstractmethod
+    def insert_scroll(self, scroll_change_x: int, scroll_change_y: int) -> None:
+        """
+        Simulate scrolling the mouse wheel.
+
+        Args:
+            scroll_change_x (int): The horizontal scroll amount.
+            scroll_change_y (int): The vertical scroll amount.
+        """
+        pass
+
     @abstractmethod
     def listen(self) -> None:
         """
         Start listening for mouse events.
         """
         pass
+
+    def enable_pool(self) -> None:
+        """
+        Reuse one MoveInput for every move instead of creating a new one.
+        """
+        self.pooled = MoveInput(0, 0)
+
+    def move_input(self, mouse_position_x: int, mouse_position_y: int) -> MoveInput:
+        """
+        Get the record of a move, the pooled one if pooling is enabled.
+
+        Args:
+            mouse_position_x (int): The X coordinate of the mouse position.
+            mouse_position_y (int): The Y coordinate of the mouse position.
+
+        Returns:
+            MoveInput: The record holding the position.
+        """
+        event = self.pooled
+
+        if event is None:
+            return MoveInput(mouse_position_x, mouse_position_y)
+
+        event.x = mouse_position_x
+        event.y = mouse_position_y
+        return event
+
+    def add_callback(self, cb: Callable[[Any], None], kind: MouseTypeEvent) -> None:
+        """
+        Register a callback function for mouse events.
+
+        Args:
+            cb (Callable[[Any], None]): The callback function to register, taking
+                a MoveInput, ClickInput or ScrollInput as fits the kind.
+            kind (MouseTypeEvent): The type of mouse event to listen for.
+        """
+        self.callbacks.table[kind].append(cb)
+
+    def notify_callbacks(self, kind: MouseTypeEvent, event: Any) -> None:
+        """
+        Notify all registered callbacks for a mouse event.
+
+        Args:
+            kind (MouseTypeEvent): The type of mouse event.
+            event (Any): The record passed to every callback.
+        """
+        for cb in self.callbacks.table[kind]:
+            cb(event)
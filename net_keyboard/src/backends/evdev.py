@@ -1,159 +1,527 @@
 """Evdev backend module for keyboard and mouse event handling."""
-from typing import Any, Callable
+from typing import Callable, Iterable, List, Optional, Tuple
+import selectors
 import evdev
-from src.backends.base import KeyboardBackend, MouseBackend
-from evdev import InputDevice, categorize, ecodes
+from src.backends.base import KeyboardBackend, MouseBackend, MouseTypeEvent,\
+    KeyboardTypeEvent, KeyboardCallList, MouseCallList, KeyInput, ClickInput, ScrollInput
+from src.backends.keycodes import SPECIAL_CODES
+from src.backends.uinput import KEY_TABLE, EvdevKeyTable, UInputWriter, shared_writer
+from evdev import InputDevice, InputEvent, ecodes
 
 
-EvdevKey = object
-EvdevButton = object
+EvdevKey = int
+EvdevButton = int
+
+KEY_RELEASED = 0
+KEY_PRESSED = 1
+KEY_REPEATED = 2
+
+
+def is_keyboard(device: InputDevice) -> bool:
+    """
+    Check whether an input device is a keyboard.
+
+    Args:
+        device (InputDevice): The device to inspect.
+
+    Returns:
+        bool: True if the device reports letter and enter keys.
+    """
+    keys = device.capabilities().get(ecodes.EV_KEY, [])
+    return ecodes.KEY_A in keys and ecodes.KEY_ENTER in keys
+
+
+def is_pointer(device: InputDevice) -> bool:
+    """
+    Check whether an input device is a relative pointer such as a mouse.
+
+    Args:
+        device (InputDevice): The device to inspect.
+
+    Returns:
+        bool: True if the device reports relative X and Y motion.
+    """
+    axes = device.capabilities().get(ecodes.EV_REL, [])
+    return ecodes.REL_X in axes and ecodes.REL_Y in axes
+
+
+def find_devices(predicate: Callable[[InputDevice], bool]) -> List[InputDevice]:
+    """
+    Open every device under /dev/input that matches a predicate.
+
+    Devices that cannot be opened, usually for lack of permissions, are skipped.
+
+    Args:
+        predicate (Callable[[InputDevice], bool]): Filter such as is_keyboard.
+
+    Returns:
+        List[InputDevice]: The matching devices, left open.
+    """
+    devices: List[InputDevice] = []
+
+    for path in evdev.list_devices():
+        try:
+            device = InputDevice(path)
+
+        except OSError:
+            continue
+
+        if predicate(device):
+            devices.append(device)
+        else:
+            device.close()
+
+    return devices
+
+
+def read_devices(
+    devices: Iterable[InputDevice],
+    handle: Callable[[InputEvent], None],
+    grab: bool = False
+) -> None:
+    """
+    Read events from several devices through a single selector loop.
+
+    Each readable device is drained with one batched read, so a burst of
+    events costs one wake-up and one syscall per device. Devices that
+    disappear are dropped, and the loop returns once none are left.
+
+    Args:
+        devices (Iterable[InputDevice]): The devices to read.
+        handle (Callable[[InputEvent], None]): Called for every event, in order.
+        grab (bool): Take exclusive access so local input is held back.
+    """
+    selector = selectors.DefaultSelector()
+
+    for device in devices:
+        if grab:
+            device.grab()
+
+        selector.register(device, selectors.EVENT_READ)
+
+    try:
+        while selector.get_map():
+            for key, _ in selector.select():
+                source: InputDevice = key.fileobj
+
+                try:
+                    for event in source.read():
+                        handle(event)
+
+                except BlockingIOError:
+                    continue
+
+                except OSError:
+                    selector.unregister(source)
+                    source.close()
+
+    finally:
+        for key in list(selector.get_map().values()):
+            if grab:
+                try:
+                    key.fileobj.ungrab()
+
+                except OSError:
+                    pass
+
+        selector.close()
 
 
 class EvdevKeyboardEvent(KeyboardBackend[EvdevKey]):
     """
     Evdev-based keyboard event handler.
-    
+
     This class implements keyboard event handling using the evdev library,
     providing functionality for listening to keyboard events on Linux systems.
+    Every keyboard under /dev/input is read in one selector loop, and keys
+    are reported as evdev key codes. Keys are injected through uinput.
     """
-    
-    def __init__(self) -> None:
+
+    def __init__(
+        self,
+        devices: Optional[List[InputDevice]] = None,
+        grab: bool = False,
+        writer: Optional[UInputWriter] = None
+    ) -> None:
         """
         Initialize the Evdev keyboard event handler.
+
+        Args:
+            devices (Optional[List[InputDevice]]): Devices to read, defaults to
+                every keyboard found when listening starts.
+            grab (bool): Take exclusive access to the devices while listening.
+            writer (Optional[UInputWriter]): Writer used to inject keys, defaults
+                to the shared uinput device, created on first injection.
         """
-        pass
+        self.callbacks: KeyboardCallList = KeyboardCallList()
+        self.devices: Optional[List[InputDevice]] = devices
+        self.grab: bool = grab
+        self.writer: Optional[UInputWriter] = writer
+        self.table: EvdevKeyTable = KEY_TABLE
+        self.timestamp: float = 0.0
 
     def on_press(self, key: EvdevKey) -> None:
         """
         Handle keyboard press events.
-        
+
         Args:
             key (EvdevKey): The key that was pressed.
         """
-        pass
+        self.notify_callbacks(KeyboardTypeEvent.PRESS, KeyInput(key, True, key))
 
     def on_release(self, key: EvdevKey) -> None:
         """
         Handle keyboard release events.
-        
+
         Args:
             key (EvdevKey): The key that was released.
         """
-        pass
-    
-    def add_callback(self, cb: Callable[..., None]) -> None:
+        self.notify_callbacks(KeyboardTypeEvent.RELEASE, KeyInput(key, False, key))
+
+    def insert(self, key: str) -> None:
+        """
+        Simulate pressing a key.
+
+        Args:
+            key (str): The key to press. Can be a special key name or character.
+        """
+        if key in SPECIAL_CODES:
+            self.insert_code(SPECIAL_CODES[key])
+
+        elif len(key) == 1:
+            self.insert_code(ord(key))
+
+    def insert_code(self, code: int, pressed: bool = True) -> None:
         """
-        Register a callback function for keyboard events.
-        
+        Simulate pressing or releasing a key given its numeric code.
+
+        A press goes out in a frame of its own, after any pending frame, so
+        it never shares a report with a release of the same key. Shifted
+        characters hold left shift only for the frame that presses the key.
+        Releases join the current frame, so a batch of them is one write.
+
         Args:
-            cb (Callable): The callback function to register.
+            code (int): The key code, laid out as in src.backends.keycodes.
+            pressed (bool): True to press the key, False to release it.
         """
-        pass
-    
-    def notify_callbacks(self, key: EvdevKey) -> None:
+        resolved = self.table.keycode(code)
+
+        if resolved is None:
+            return
+
+        keycode, shifted = resolved
+        writer = self.injector()
+
+        with writer.frame():
+            if not pressed:
+                writer.emit(ecodes.EV_KEY, keycode, KEY_RELEASED)
+                return
+
+            writer.flush()
+
+            if shifted:
+                writer.emit(ecodes.EV_KEY, ecodes.KEY_LEFTSHIFT, KEY_PRESSED)
+
+            writer.emit(ecodes.EV_KEY, keycode, KEY_PRESSED)
+            writer.flush()
+
+            if shifted:
+                writer.emit(ecodes.EV_KEY, ecodes.KEY_LEFTSHIFT, KEY_RELEASED)
+
+    def injector(self) -> UInputWriter:
+        """
+        Get the uinput writer, creating the shared one on first use.
+
+        Returns:
+            UInputWriter: The writer used for injection.
+        """
+        if self.writer is None:
+            self.writer = shared_writer()
+
+        return self.writer
+
+    def handle(self, event: InputEvent) -> None:
         """
-        Notify all registered callbacks for a keyboard event.
-        
+        Turn a raw evdev event into press and release notifications.
+
+        Auto-repeat events are reported as presses, like other backends do.
+
         Args:
-            key (EvdevKey): The key involved in the event.
+            event (InputEvent): The event read from a device.
         """
-        pass
+        if event.type != ecodes.EV_KEY:
+            return
+
+        self.timestamp = event.timestamp()
+
+        if event.value == KEY_RELEASED:
+            self.on_release(event.code)
+        else:
+            self.on_press(event.code)
 
     def listen(self) -> None:
         """
         Start listening for keyboard events.
-        
-        Blocks until the listener thread is interrupted or terminated.
+
+        Blocks until every device has been removed.
         """
-        pass
+        if self.devices is None:
+            self.devices = find_devices(is_keyboard)
+
+        read_devices(self.devices, self.handle, self.grab)
 
 
 class EvdevMouseEvent(MouseBackend[EvdevButton]):
     """
     Evdev-based mouse event handler.
-    
+
     This class implements mouse event handling using the evdev library,
     providing functionality for listening to mouse events on Linux systems.
+    Relative motion is accumulated until each SYN_REPORT, so one move is
+    reported per kernel frame, ahead of the button changes and scroll of
+    that frame, so a click lands where the pointer moved. Positions are virtual: they start at the
+    origin and follow the summed relative motion. Events are injected
+    through uinput, where motion and the next button change share a frame.
     """
-    
-    def __init__(self) -> None:
+
+    def __init__(
+        self,
+        devices: Optional[List[InputDevice]] = None,
+        grab: bool = False,
+        writer: Optional[UInputWriter] = None
+    ) -> None:
         """
         Initialize the Evdev mouse event handler.
+
+        Args:
+            devices (Optional[List[InputDevice]]): Devices to read, defaults to
+                every pointer found when listening starts.
+            grab (bool): Take exclusive access to the devices while listening.
+            writer (Optional[UInputWriter]): Writer used to inject events, defaults
+                to the shared uinput device, created on first injection.
         """
-        pass
+        self.callbacks: MouseCallList = MouseCallList()
+        self.devices: Optional[List[InputDevice]] = devices
+        self.grab: bool = grab
+        self.writer: Optional[UInputWriter] = writer
+        self.timestamp: float = 0.0
+        self.position_x: int = 0
+        self.position_y: int = 0
+
+        self._injected: Optional[Tuple[int, int]] = None
+
+        self._moved: bool = False
+        self._wheel_x: int = 0
+        self._wheel_y: int = 0
+        self._buttons: List[Tuple[EvdevButton, bool]] = []
 
     def on_move(
         self,
-        mouse_position_x: int, 
+        mouse_position_x: int,
         mouse_position_y: int
     ) -> None:
         """
         Handle mouse movement events.
-        
+
         Args:
             mouse_position_x (int): The X coordinate of the mouse position.
             mouse_position_y (int): The Y coordinate of the mouse position.
         """
-        pass
-    
+        event = self.move_input(mouse_position_x, mouse_position_y)
+
+        for cb in self.callbacks.move:
+            cb(event)
+
     def on_click(
-        self, 
-        mouse_position_x: int, 
-        mouse_position_y: int, 
-        button: EvdevButton, 
+        self,
+        mouse_position_x: int,
+        mouse_position_y: int,
+        button: EvdevButton,
         pressed: bool
     ) -> None:
         """
         Handle mouse click events.
-        
+
         Args:
             mouse_position_x (int): The X coordinate of the click position.
             mouse_position_y (int): The Y coordinate of the click position.
             button (EvdevButton): The mouse button that was clicked.
             pressed (bool): True if button was pressed, False if released.
         """
-        pass
-    
+        self.notify_callbacks(
+            MouseTypeEvent.CLICK,
+            ClickInput(mouse_position_x, mouse_position_y, button, pressed)
+        )
+
     def on_scroll(
         self,
-        mouse_position_x: int, 
-        mouse_position_y: int, 
-        scroll_change_x: int, 
+        mouse_position_x: int,
+        mouse_position_y: int,
+        scroll_change_x: int,
         scroll_change_y: int
     ) -> None:
         """
         Handle mouse scroll events.
-        
+
         Args:
             mouse_position_x (int): The X coordinate of the scroll position.
             mouse_position_y (int): The Y coordinate of the scroll position.
             scroll_change_x (int): The horizontal scroll change amount.
             scroll_change_y (int): The vertical scroll change amount.
         """
-        pass
+        self.notify_callbacks(
+            MouseTypeEvent.SCROLL,
+            ScrollInput(mouse_position_x, mouse_position_y, scroll_change_x, scroll_change_y)
+        )
+
+    def insert_move(
+        self,
+        mouse_position_x: int,
+        mouse_position_y: int
+    ) -> None:
+        """
+        Simulate moving the mouse to a position.
+
+        A uinput pointer is relative, so the move is injected as the
+        distance from the last position given; the first call only sets
+        the reference point.
+
+        Args:
+            mouse_position_x (int): The X coordinate to move to.
+            mouse_position_y (int): The Y coordinate to move to.
+        """
+        if self._injected is not None:
+            self.insert_motion(
+                mouse_position_x - self._injected[0],
+                mouse_position_y - self._injected[1]
+            )
+
+        self._injected = (mouse_position_x, mouse_position_y)
+
+    def insert_motion(self, delta_x: int, delta_y: int) -> None:
+        """
+        Simulate moving the mouse relative to its current position.
 
-    def add_callback(self, cb: Callable[..., None]) -> None:
+        Args:
+            delta_x (int): The horizontal distance to move.
+            delta_y (int): The vertical distance to move.
+        """
+        writer = self.injector()
+
+        with writer.frame():
+            if delta_x:
+                writer.emit(ecodes.EV_REL, ecodes.REL_X, delta_x)
+
+            if delta_y:
+                writer.emit(ecodes.EV_REL, ecodes.REL_Y, delta_y)
+
+    def insert_click(self, button: EvdevButton, pressed: bool) -> None:
         """
-        Register a callback function for mouse events.
-        
+        Simulate pressing or releasing a mouse button.
+
+        The button change closes the current frame, so any motion emitted
+        before it in the same frame lands in the same kernel write.
+
         Args:
-            cb (Callable): The callback function to register.
+            button (EvdevButton): The mouse button to simulate.
+            pressed (bool): True to press the button, False to release it.
+        """
+        writer = self.injector()
+
+        with writer.frame():
+            writer.emit(ecodes.EV_KEY, button, KEY_PRESSED if pressed else KEY_RELEASED)
+            writer.flush()
+
+    def insert_scroll(self, scroll_change_x: int, scroll_change_y: int) -> None:
+        """
+        Simulate scrolling the mouse wheel.
+
+        Args:
+            scroll_change_x (int): The horizontal scroll amount.
+            scroll_change_y (int): The vertical scroll amount.
+        """
+        writer = self.injector()
+
+        with writer.frame():
+            if scroll_change_x:
+                writer.emit(ecodes.EV_REL, ecodes.REL_HWHEEL, scroll_change_x)
+
+            if scroll_change_y:
+                writer.emit(ecodes.EV_REL, ecodes.REL_WHEEL, scroll_change_y)
+
+    def injector(self) -> UInputWriter:
         """
-        pass
-    
-    def notify_callbacks(self, **kwargs: object) -> None:
+        Get the uinput writer, creating the shared one on first use.
+
+        Returns:
+            UInputWriter: The writer used for injection.
         """
-        Notify all registered callbacks for a mouse event.
-        
+        if self.writer is None:
+            self.writer = shared_writer()
+
+        return self.writer
+
+    def handle(self, event: InputEvent) -> None:
+        """
+        Turn a raw evdev event into move, click and scroll notifications.
+
+        Motion, wheel and button changes are held until the SYN_REPORT
+        closing the kernel frame, which reports the move first, then the
+        buttons in the order they changed, then the scroll. Devices emit
+        the parts of a frame in any order, usually buttons first.
+
         Args:
-            **kwargs: Event-specific arguments to pass to callbacks.
+            event (InputEvent): The event read from a device.
         """
-        pass
+        match event.type:
+            case ecodes.EV_REL:
+                match event.code:
+                    case ecodes.REL_X:
+                        self.position_x += event.value
+                        self._moved = True
+
+                    case ecodes.REL_Y:
+                        self.position_y += event.value
+                        self._moved = True
+
+                    case ecodes.REL_WHEEL:
+                        self._wheel_y += event.value
+
+                    case ecodes.REL_HWHEEL:
+                        self._wheel_x += event.value
+
+            case ecodes.EV_KEY if ecodes.BTN_MOUSE <= event.code < ecodes.BTN_JOYSTICK:
+                self._buttons.append((event.code, event.value != KEY_RELEASED))
+
+            case ecodes.EV_SYN if event.code == ecodes.SYN_REPORT:
+                self.timestamp = event.timestamp()
+
+                if self._moved:
+                    self._moved = False
+                    self.on_move(self.position_x, self.position_y)
+
+                if self._buttons:
+                    for button, pressed in self._buttons:
+                        self.on_click(self.position_x, self.position_y, button, pressed)
+
+                    self._buttons.clear()
+
+                if self._wheel_x or self._wheel_y:
+                    self.on_scroll(
+                        self.position_x,
+                        self.position_y,
+                        self._wheel_x,
+                        self._wheel_y
+                    )
+                    self._wheel_x = self._wheel_y = 0
 
     def listen(self) -> None:
         """
         Start listening for mouse events.
-        
-        Blocks until the listener thread is interrupted or terminated.
+
+        Blocks until every device has been removed.
         """
-        pass
+        if self.devices is None:
+            self.devices = find_devices(is_pointer)
+
+        read_devices(self.devices, self.handle, self.grab)
@@ -0,0 +1,511 @@
+"""Isolated backend module running capture in its own process."""
+from typing import Any, Callable, Optional, Tuple
+from src.backends.base import KeyboardBackend, MouseBackend, KeyboardCallList, MouseCallList,\
+    KeyboardTypeEvent, MouseTypeEvent, KeyInput, MoveInput, ClickInput, ScrollInput
+from src.pipeline.ring import BLOCK_TIMEOUT, EventRing
+from src.tcp.protocol import EventKind, EventType
+import multiprocessing
+import threading
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+CaptureSource = Callable[
+    [], Tuple[KeyboardBackend, MouseBackend, Callable[[Any], Optional[int]], Callable[[Any], int]]
+]
+RingHandle = Tuple[str, Any]
+
+COMMAND_SLOTS = 256
+POLL_INTERVAL = 1.0
+NO_SCAN = -1
+START_METHODS = ("forkserver", "spawn")
+
+
+class CaptureRelay:
+    """
+    Capture process side of the isolation.
+
+    Runs the real backends, converts every key and button to its wire
+    code and writes the events into the rings read by the network
+    process: keys into one, pointer events into another, as each has
+    its own listener thread and a ring takes a single producer. Keys and
+    clicks may use the part of a ring kept free of motion, and wait a
+    bounded time for room beyond it, so a release is not lost to a burst
+    of moves; moves and scroll are dropped first when the network process
+    falls behind. Pointer moves requested by the network process, such as the
+    warp after a screen edge is crossed, arrive through a third ring and
+    are applied here.
+    """
+
+    def __init__(
+        self,
+        source: CaptureSource,
+        keys: RingHandle,
+        pointer: RingHandle,
+        commands: RingHandle
+    ) -> None:
+        """
+        Create the backends and attach to the rings.
+
+        Args:
+            source (CaptureSource): Creates the backends and the functions
+                converting their keys and buttons to wire codes.
+            keys (RingHandle): Name and wakeup semaphore of the key ring.
+            pointer (RingHandle): Name and wakeup semaphore of the pointer ring.
+            commands (RingHandle): Name and wakeup semaphore of the command ring.
+        """
+        self.keyboard_event, self.mouse_event, self.key_code, self.button_code = source()
+        self.keys = EventRing(name=keys[0], wakeup=keys[1])
+        self.pointer = EventRing(name=pointer[0], wakeup=pointer[1])
+        self.commands = EventRing(name=commands[0], wakeup=commands[1])
+
+        self.keyboard_event.add_callback(self.key, KeyboardTypeEvent.PRESS)
+        self.keyboard_event.add_callback(self.key, KeyboardTypeEvent.RELEASE)
+        self.mouse_event.enable_pool()
+        self.mouse_event.add_callback(self.move, MouseTypeEvent.MOVE)
+        self.mouse_event.add_callback(self.click, MouseTypeEvent.CLICK)
+        self.mouse_event.add_callback(self.scroll, MouseTypeEvent.SCROLL)
+
+    def key(self, event: KeyInput) -> None:
+        """
+        Write a key change to the key ring.
+
+        The physical key travels in the first coordinate of the record.
+
+        Args:
+            event (KeyInput): The key change.
+        """
+        code = self.key_code(event.key)
+
+        if code is not None:
+            kind = EventKind.KEY_PRESS if event.pressed else EventKind.KEY_RELEASE
+            scan = NO_SCAN if event.scan is None else event.scan
+            self.delivered(self.keys.put(EventType.KEYBOARD, kind, code, scan, block=True))
+
+    def move(self, event: MoveInput) -> None:
+        """
+        Write a pointer position to the pointer ring.
+
+        Args:
+            event (MoveInput): The new mouse position.
+        """
+        self.written(self.pointer.put(EventType.MOUSE, EventKind.MOVE, 0, event.x, event.y))
+
+    def click(self, event: ClickInput) -> None:
+        """
+        Write a button change to the pointer ring.
+
+        Args:
+            event (ClickInput): The button change and where it happened.
+        """
+        kind = EventKind.BUTTON_PRESS if event.pressed else EventKind.BUTTON_RELEASE
+        self.delivered(self.pointer.put(
+            EventType.MOUSE, kind, self.button_code(event.button), event.x, event.y, block=True
+        ))
+
+    def scroll(self, event: ScrollInput) -> None:
+        """
+        Write a wheel change to the pointer ring.
+
+        Args:
+            event (ScrollInput): The scroll change and where it happened.
+        """
+        self.written(self.pointer.put(
+            EventType.MOUSE, EventKind.SCROLL, 0, event.x, event.y, event.scroll_x, event.scroll_y
+        ))
+
+    def written(self, stored: bool) -> None:
+        """
+        Report the first record dropped by a full ring.
+
+        Args:
+            stored (bool): Whether the record fit in its ring.
+        """
+        if not stored and self.pointer.dropped == 1:
+            logger.warning("Pointer ring full, the network process is falling behind")
+
+    def delivered(self, stored: bool) -> None:
+        """
+        Report a key or button record given up on after waiting for room.
+
+        Args:
+            stored (bool): Whether the record fit in its ring.
+        """
+        if not stored:
+            logger.error(
+                "Capture ring full for %.1f s, a key or button change was lost", BLOCK_TIMEOUT
+            )
+
+    def run(self) -> None:
+        """
+        Listen to both backends and apply commands until the network process exits.
+        """
+        threading.Thread(target=self.keyboard_event.listen, daemon=True).start()
+        threading.Thread(target=self.mouse_event.listen, daemon=True).start()
+        parent = multiprocessing.parent_process()
+
+        while parent is None or parent.is_alive():
+            record = self.commands.get(POLL_INTERVAL)
+
+            if record is None:
+                continue
+
+            _, kind, _, x, y, extra_x, extra_y = record
+
+            match kind:
+                case EventKind.MOVE:
+                    self.mouse_event.insert_move(x, y)
+
+                case EventKind.MOTION:
+                    self.mouse_event.insert_motion(x, y)
+
+                case EventKind.SCROLL:
+                    self.mouse_event.insert_scroll(extra_x, extra_y)
+
+
+def run_capture(
+    source: CaptureSource,
+    keys: RingHandle,
+    pointer: RingHandle,
+    commands: RingHandle
+) -> None:
+    """
+    Entry point of the capture process.
+
+    Args:
+        source (CaptureSource): Creates the backends and their code converters.
+        keys (RingHandle): Name and wakeup semaphore of the key ring.
+        pointer (RingHandle): Name and wakeup semaphore of the pointer ring.
+        commands (RingHandle): Name and wakeup semaphore of the command ring.
+    """
+    CaptureRelay(source, keys, pointer, commands).run()
+
+
+class CaptureProcess:
+    """
+    Network process side of the isolation.
+
+    Owns the shared memory rings and the process capturing input, and
+    hands out ring backends that stand for the real ones: their callbacks
+    fire as records arrive, with wire codes in place of backend keys and
+    buttons. The capture process then keeps reading the OS input hooks
+    while this one is busy encoding, sending or collecting garbage. It is
+    started from a fresh interpreter rather than forked, since by then
+    this process already runs threads whose locks a fork would copy.
+    """
+
+    def __init__(self, source: CaptureSource, slots: int = 4096) -> None:
+        """
+        Create the rings and prepare the capture process.
+
+        Args:
+            source (CaptureSource): Picklable callable creating the backends
+                and their code converters in the capture process.
+            slots (int): Records each event ring holds.
+        """
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context(
+            next(method for method in START_METHODS if method in methods)
+        )
+        self.keys = EventRing(slots, context.Semaphore(0))
+        self.pointer = EventRing(slots, context.Semaphore(0))
+        self.commands = EventRing(COMMAND_SLOTS, context.Semaphore(0))
+        self.process = context.Process(
+            target=run_capture,
+            args=(
+                source,
+                (self.keys.name, self.keys.wakeup),
+                (self.pointer.name, self.pointer.wakeup),
+                (self.commands.name, self.commands.wakeup)
+            ),
+            name="capture",
+            daemon=True
+        )
+
+    def backends(self) -> Tuple["RingKeyboardEvent", "RingMouseEvent"]:
+        """
+        Create the backends reading the rings.
+
+        Returns:
+            Tuple[RingKeyboardEvent, RingMouseEvent]: The keyboard and mouse backends.
+        """
+        return (
+            RingKeyboardEvent(self.keys, self.alive),
+            RingMouseEvent(self.pointer, self.commands, self.alive)
+        )
+
+    def start(self) -> None:
+        """
+        Start the capture process.
+        """
+        self.process.start()
+        logger.info("Capturing input in process %d", self.process.pid)
+
+    def alive(self) -> bool:
+        """
+        Check whether the capture process is still running.
+
+        Returns:
+            bool: True until the capture process exits.
+        """
+        return self.process.is_alive()
+
+    def stop(self) -> None:
+        """
+        Stop the capture process, the ring backends return once it is gone.
+        """
+        if self.process.is_alive():
+            self.process.terminate()
+
+        if self.process.pid is not None:
+            self.process.join()
+
+    def close(self) -> None:
+        """
+        Stop the capture process and remove the rings.
+
+        The ring backends must have returned from listen first.
+        """
+        self.stop()
+
+        for ring in (self.keys, self.pointer, self.commands):
+            ring.close()
+
+
+class RingKeyboardEvent(KeyboardBackend[int]):
+    """
+    Keyboard backend reading the key ring of a capture process.
+
+    Keys are wire codes. Keys cannot be injected from here, capture
+    hosts only ever inject pointer moves.
+    """
+
+    def __init__(self, ring: EventRing, alive: Callable[[], bool]) -> None:
+        """
+        Initialize the ring keyboard.
+
+        Args:
+            ring (EventRing): The ring the capture process writes keys to.
+            alive (Callable[[], bool]): Tells whether the capture process runs.
+        """
+        self.callbacks: KeyboardCallList = KeyboardCallList()
+        self.ring: EventRing = ring
+        self.alive: Callable[[], bool] = alive
+
+    def on_press(self, key: int, scan: Optional[int] = None) -> None:
+        """
+        Handle keyboard press events.
+
+        Args:
+            key (int): The code of the key that was pressed.
+            scan (Optional[int]): The physical key, None if unknown.
+        """
+        self.notify_callbacks(KeyboardTypeEvent.PRESS, KeyInput(key, True, scan))
+
+    def on_release(self, key: int, scan: Optional[int] = None) -> None:
+        """
+        Handle keyboard release events.
+
+        Args:
+            key (int): The code of the key that was released.
+            scan (Optional[int]): The physical key, None if unknown.
+        """
+        self.notify_callbacks(KeyboardTypeEvent.RELEASE, KeyInput(key, False, scan))
+
+    def insert(self, key: str) -> None:
+        """
+        Simulate pressing a key.
+
+        Args:
+            key (str): The key to press.
+
+        Raises:
+            NotImplementedError: Always, keys are not injected on capture hosts.
+        """
+        raise NotImplementedError("Keys cannot be injected into the capture process")
+
+    def insert_code(self, code: int, pressed: bool = True) -> None:
+        """
+        Simulate pressing or releasing a key given its numeric code.
+
+        Args:
+            code (int): The key code.
+            pressed (bool): True to press the key, False to release it.
+
+        Raises:
+            NotImplementedError: Always, keys are not injected on capture hosts.
+        """
+        raise NotImplementedError("Keys cannot be injected into the capture process")
+
+    def listen(self) -> None:
+        """
+        Pass every key from the ring to the callbacks.
+
+        Blocks until the capture process exits.
+        """
+        while True:
+            record = self.ring.get(POLL_INTERVAL)
+
+            if record is None:
+                if not self.alive():
+                    return
+
+                continue
+
+            _, kind, code, scan, _, _, _ = record
+            scan = None if scan == NO_SCAN else scan
+
+            if kind == EventKind.KEY_PRESS:
+                self.on_press(code, scan)
+            else:
+                self.on_release(code, scan)
+
+
+class RingMouseEvent(MouseBackend[int]):
+    """
+    Mouse backend reading the pointer ring of a capture process.
+
+    Buttons are wire codes. Moves, relative motion and scroll injected
+    here are applied by the capture process, from a single thread at a
+    time as the command ring takes a single producer. Buttons cannot be
+    injected.
+    """
+
+    def __init__(self, ring: EventRing, commands: EventRing, alive: Callable[[], bool]) -> None:
+        """
+        Initialize the ring mouse.
+
+        Args:
+            ring (EventRing): The ring the capture process writes pointer events to.
+            commands (EventRing): The ring the capture process applies moves from.
+            alive (Callable[[], bool]): Tells whether the capture process runs.
+        """
+        self.callbacks: MouseCallList = MouseCallList()
+        self.ring: EventRing = ring
+        self.commands: EventRing = commands
+        self.alive: Callable[[], bool] = alive
+
+    def on_move(self, mouse_position_x: int, mouse_position_y: int) -> None:
+        """
+        Handle mouse movement events.
+
+        Args:
+            mouse_position_x (int): The X coordinate of the mouse position.
+            mouse_position_y (int): The Y coordinate of the mouse position.
+        """
+        event = self.move_input(mouse_position_x, mouse_position_y)
+
+        for cb in self.callbacks.move:
+            cb(event)
+
+    def on_click(
+        self,
+        mouse_position_x: int,
+        mouse_position_y: int,
+        button: int,
+        pressed: bool
+    ) -> None:
+        """
+        Handle mouse click events.
+
+        Args:
+            mouse_position_x (int): The X coordinate of the click position.
+            mouse_position_y (int): The Y coordinate of the click position.
+            button (int): The code of the mouse button that was clicked.
+            pressed (bool): True if button was pressed, False if released.
+        """
+        self.notify_callbacks(
+            MouseTypeEvent.CLICK,
+            ClickInput(mouse_position_x, mouse_position_y, button, pressed)
+        )
+
+    def on_scroll(
+        self,
+        mouse_position_x: int,
+        mouse_position_y: int,
+        scroll_change_x: int,
+        scroll_change_y: int
+    ) -> None:
+        """
+        Handle mouse scroll events.
+
+        Args:
+            mouse_position_x (int): The X coordinate of the scroll position.
+            mouse_position_y (int): The Y coordinate of the scroll position.
+            scroll_change_x (int): The horizontal scroll change amount.
+            scroll_change_y (int): The vertical scroll change amount.
+        """
+        self.notify_callbacks(
+            MouseTypeEvent.SCROLL,
+            ScrollInput(mouse_position_x, mouse_position_y, scroll_change_x, scroll_change_y)
+        )
+
+    def insert_move(self, mouse_position_x: int, mouse_position_y: int) -> None:
+        """
+        Move the pointer of the capture host to a position.
+
+        Args:
+            mouse_position_x (int): The X coordinate to move to.
+            mouse_position_y (int): The Y coordinate to move to.
+        """
+        self.commands.put(EventType.MOUSE, EventKind.MOVE, 0, mouse_position_x, mouse_position_y)
+
+    def insert_motion(self, delta_x: int, delta_y: int) -> None:
+        """
+        Move the pointer of the capture host relative to its position.
+
+        Args:
+            delta_x (int): The horizontal distance to move.
+            delta_y (int): The vertical distance to move.
+        """
+        self.commands.put(EventType.MOUSE, EventKind.MOTION, 0, delta_x, delta_y)
+
+    def insert_click(self, button: int, pressed: bool) -> None:
+        """
+        Simulate pressing or releasing a mouse button.
+
+        Args:
+            button (int): The button code.
+            pressed (bool): True to press the button, False to release it.
+
+        Raises:
+            NotImplementedError: Always, buttons are not injected on capture hosts.
+        """
+        raise NotImplementedError("Buttons cannot be injected into the capture process")
+
+    def insert_scroll(self, scroll_change_x: int, scroll_change_y: int) -> None:
+        """
+        Scroll the wheel of the capture host.
+
+        Args:
+            scroll_change_x (int): The horizontal scroll amount.
+            scroll_change_y (int): The vertical scroll amount.
+        """
+        self.commands.put(
+            EventType.MOUSE, EventKind.SCROLL, 0, 0, 0, scroll_change_x, scroll_change_y
+        )
+
+    def listen(self) -> None:
+        """
+        Pass every pointer event from the ring to the callbacks.
+
+        Blocks until the capture process exits.
+        """
+        while True:
+            record = self.ring.get(POLL_INTERVAL)
+
+            if record is None:
+                if not self.alive():
+                    return
+
+                continue
+
+            _, kind, code, x, y, extra_x, extra_y = record
+
+            if kind == EventKind.MOVE:
+                self.on_move(x, y)
+            elif kind == EventKind.SCROLL:
+                self.on_scroll(x, y, extra_x, extra_y)
+            else:
+                self.on_click(x, y, code, kind == EventKind.BUTTON_PRESS)
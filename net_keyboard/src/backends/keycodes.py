@@ -0,0 +1,71 @@
+"""Key code module defining the numeric key layout shared by every backend."""
+from typing import Dict, Tuple
+
+
+SPECIAL_BASE = 0x110000
+VK_FLAG = 0x80000000
+CHAR_CACHE = 0x100
+
+KEY_NAMES: Tuple[str, ...] = (
+    "alt", "alt_l", "alt_r", "alt_gr",
+    "backspace", "caps_lock",
+    "cmd", "cmd_l", "cmd_r",
+    "ctrl", "ctrl_l", "ctrl_r",
+    "delete", "down", "end", "enter", "esc",
+    "f1", "f2", "f3", "f4", "f5", "f6", "f7", "f8", "f9", "f10",
+    "f11", "f12", "f13", "f14", "f15", "f16", "f17", "f18", "f19", "f20",
+    "home", "left", "page_down", "page_up", "right",
+    "shift", "shift_l", "shift_r",
+    "space", "tab", "up",
+    "media_play_pause", "media_volume_mute", "media_volume_down",
+    "media_volume_up", "media_previous", "media_next",
+    "insert", "menu", "num_lock", "pause", "print_screen", "scroll_lock",
+    "f21", "f22", "f23", "f24"
+)
+
+SPECIAL_CODES: Dict[str, int] = {
+    name: SPECIAL_BASE + index for index, name in enumerate(KEY_NAMES)
+}
+
+BUTTON_NAMES: Tuple[str, ...] = ("unknown", "left", "middle", "right", "x1", "x2")
+
+BUTTON_CODES: Dict[str, int] = {name: index for index, name in enumerate(BUTTON_NAMES)}
+
+
+def is_char(code: int) -> bool:
+    """
+    Check whether a key code is a Unicode character.
+
+    Args:
+        code (int): The key code.
+
+    Returns:
+        bool: True if the code is a character code point.
+    """
+    return code < SPECIAL_BASE
+
+
+def is_special(code: int) -> bool:
+    """
+    Check whether a key code is one of the named special keys.
+
+    Args:
+        code (int): The key code.
+
+    Returns:
+        bool: True if the code indexes KEY_NAMES.
+    """
+    return SPECIAL_BASE <= code < SPECIAL_BASE + len(KEY_NAMES)
+
+
+def is_vk(code: int) -> bool:
+    """
+    Check whether a key code carries a raw virtual key code.
+
+    Args:
+        code (int): The key code.
+
+    Returns:
+        bool: True if the code holds a platform virtual key.
+    """
+    return bool(code & VK_FLAG)
@@ -1,7 +1,8 @@
 """Pynput backend module for keyboard and mouse event handling."""
-from typing import Callable, Any, Union
+from typing import Dict, List, Optional, Union
 from src.backends.base import KeyboardBackend, MouseBackend, MouseTypeEvent,\
-    KeyboardTypeEvent, KeyboardCallList, MouseCallList
+    KeyboardTypeEvent, KeyboardCallList, MouseCallList, KeyInput, ClickInput, ScrollInput
+from src.backends.keycodes import KEY_NAMES, SPECIAL_BASE, VK_FLAG, CHAR_CACHE, is_special, is_vk
 from pynput import keyboard
 from pynput import mouse
 from pynput.keyboard import Key, KeyCode, Controller
@@ -12,6 +13,131 @@ PynputKey = Union[Key, KeyCode, None]
 PynputButton = Button
 
 
+class PynputKeyTable:
+    """
+    Bidirectional table between Pynput keys and numeric key codes.
+
+    The table is built once and follows the layout in src.backends.keycodes:
+    characters use their code point, named keys are indexed by KEY_NAMES
+    and keys that only have a virtual key code carry it behind VK_FLAG.
+    Latin-1 characters and named keys are resolved with a single list
+    index; any other code is built once and cached.
+    """
+
+    def __init__(self) -> None:
+        """
+        Precompute the code and key lookups.
+        """
+        self.chars: List[KeyCode] = [KeyCode.from_char(chr(code)) for code in range(CHAR_CACHE)]
+        self.specials: List[Optional[Key]] = [
+            getattr(Key, name, None) for name in KEY_NAMES
+        ]
+        self.special_codes: Dict[Key, int] = {
+            key: SPECIAL_BASE + index
+            for index, key in enumerate(self.specials)
+            if key is not None
+        }
+        self.names: Dict[str, int] = {
+            name: SPECIAL_BASE + index
+            for index, name in enumerate(KEY_NAMES)
+            if self.specials[index] is not None
+        }
+        self.extra: Dict[int, KeyCode] = {}
+
+    def code(self, key: PynputKey) -> Optional[int]:
+        """
+        Get the numeric code of a Pynput key.
+
+        Args:
+            key (PynputKey): The key reported by the listener.
+
+        Returns:
+            Optional[int]: The key code, or None if the key has no code.
+        """
+        if isinstance(key, Key):
+            return self.special_codes.get(key)
+
+        if isinstance(key, KeyCode):
+            if key.char is not None:
+                return ord(key.char)
+
+            if key.vk is not None:
+                return VK_FLAG | key.vk
+
+        return None
+
+    @staticmethod
+    def scan(key: PynputKey) -> Optional[int]:
+        """
+        Get the physical key behind a Pynput key.
+
+        The scan code is used where the platform reports one, the virtual
+        key code otherwise. Named keys are left to their code, which does
+        not change while they are held.
+
+        Args:
+            key (PynputKey): The key reported by the listener.
+
+        Returns:
+            Optional[int]: The scan or virtual key code, None if unknown.
+        """
+        if not isinstance(key, KeyCode):
+            return None
+
+        scan = getattr(key, "_scan", None)
+        return scan if scan is not None else key.vk
+
+    def key(self, code: int) -> Optional[PynputKey]:
+        """
+        Get the Pynput key for a numeric code.
+
+        Args:
+            code (int): The key code received from the network.
+
+        Returns:
+            Optional[PynputKey]: The key to inject, or None if this platform
+            has no such named key.
+        """
+        if code < CHAR_CACHE:
+            return self.chars[code]
+
+        if is_special(code):
+            return self.specials[code - SPECIAL_BASE]
+
+        key = self.extra.get(code)
+
+        if key is None:
+            if is_vk(code):
+                key = KeyCode.from_vk(code & ~VK_FLAG)
+            else:
+                key = KeyCode.from_char(chr(code))
+
+            self.extra[code] = key
+
+        return key
+
+    def parse(self, key: str) -> Optional[int]:
+        """
+        Get the numeric code of a special key name or a single character.
+
+        Args:
+            key (str): A name from KEY_NAMES or a single character.
+
+        Returns:
+            Optional[int]: The key code, or None if the name is unknown.
+        """
+        if key in self.names:
+            return self.names[key]
+
+        if len(key) == 1:
+            return ord(key)
+
+        return None
+
+
+KEY_TABLE = PynputKeyTable()
+
+
 class PynputKeyboardEvent(KeyboardBackend[PynputKey]):
     """
     Pynput-based keyboard event handler.
@@ -28,6 +154,7 @@ class PynputKeyboardEvent(KeyboardBackend[PynputKey]):
         """
         self.callbacks: KeyboardCallList = KeyboardCallList()
         self.controller = Controller()
+        self.table: PynputKeyTable = KEY_TABLE
 
     def on_press(self, key: PynputKey) -> None:
         """
@@ -36,7 +163,7 @@ class PynputKeyboardEvent(KeyboardBackend[PynputKey]):
         Args:
             key (PynputKey): The key that was pressed.
         """
-        self.notify_callbacks(key, KeyboardTypeEvent.PRESS) 
+        self.notify_callbacks(KeyboardTypeEvent.PRESS, KeyInput(key, True, self.table.scan(key)))
 
     def on_release(self, key: PynputKey) -> None:
         """
@@ -45,7 +172,9 @@ class PynputKeyboardEvent(KeyboardBackend[PynputKey]):
         Args:
             key (PynputKey): The key that was released.
         """
-        self.notify_callbacks(key, KeyboardTypeEvent.RELEASE)
+        self.notify_callbacks(
+            KeyboardTypeEvent.RELEASE, KeyInput(key, False, self.table.scan(key))
+        )
     
     def insert(self, key: str) -> None:
         """
@@ -54,51 +183,29 @@ class PynputKeyboardEvent(KeyboardBackend[PynputKey]):
         Args:
             key (str): The key to press. Can be a special key name or character.
         """
-        if hasattr(Key, key):
-            self.controller.press(getattr(Key, key))
-        else:
-            self.controller.press(key)
-    
-    def add_callback(
-        self, 
-        cb: Callable[..., None], 
-        kind: KeyboardTypeEvent
-    ) -> None:
-        """
-        Register a callback function for keyboard events.
-        
-        Args:
-            cb (Callable): The callback function to register.
-            kind (KeyboardTypeEvent): The type of keyboard event to listen for.
-        """
-        match kind:
-            case KeyboardTypeEvent.PRESS:
-                self.callbacks.press.append(cb)
+        code = self.table.parse(key)
 
-            case KeyboardTypeEvent.RELEASE:
-                self.callbacks.release.append(cb)
+        if code is not None:
+            self.insert_code(code)
 
-    def notify_callbacks(
-        self, 
-        key: PynputKey, 
-        kind: KeyboardTypeEvent
-    ) -> None:
+    def insert_code(self, code: int, pressed: bool = True) -> None:
         """
-        Notify all registered callbacks for a keyboard event.
-        
+        Simulate pressing or releasing a key given its numeric code.
+
         Args:
-            key (PynputKey): The key involved in the event.
-            kind (KeyboardTypeEvent): The type of keyboard event.
-        """
-        match kind:
-            case KeyboardTypeEvent.PRESS:
-                for cb in self.callbacks.press:
-                    cb(key)
-                    
-            case KeyboardTypeEvent.RELEASE:
-                for cb in self.callbacks.release:
-                    cb(key)
+            code (int): The key code, as produced by PynputKeyTable.code.
+            pressed (bool): True to press the key, False to release it.
+        """
+        key = self.table.key(code)
 
+        if key is None:
+            return
+
+        if pressed:
+            self.controller.press(key)
+        else:
+            self.controller.release(key)
+    
     def listen(self) -> None:
         """
         Start listening for keyboard events.
@@ -125,9 +232,10 @@ class PynputMouseEvent(MouseBackend[PynputButton]):
         """
         Initialize the Pynput mouse event handler.
         
-        Sets up the callback list for mouse events.
+        Sets up the mouse controller and the callback list for mouse events.
         """
         self.callbacks: MouseCallList = MouseCallList()
+        self.controller = mouse.Controller()
 
     def on_move(
         self,
@@ -141,13 +249,10 @@ class PynputMouseEvent(MouseBackend[PynputButton]):
             mouse_position_x (int): The X coordinate of the mouse position.
             mouse_position_y (int): The Y coordinate of the mouse position.
         """
-        self.notify_callbacks(
-            MouseTypeEvent.MOVE, 
-            **{
-                "mouse_position_x": mouse_position_x,
-                "mouse_position_y": mouse_position_y
-            }
-        )
+        event = self.move_input(mouse_position_x, mouse_position_y)
+
+        for cb in self.callbacks.move:
+            cb(event)
     
     def on_click(
         self, 
@@ -166,13 +271,8 @@ class PynputMouseEvent(MouseBackend[PynputButton]):
             pressed (bool): True if button was pressed, False if released.
         """
         self.notify_callbacks(
-            MouseTypeEvent.CLICK, 
-            **{
-                "mouse_position_x": mouse_position_x,
-                "mouse_position_y": mouse_position_y,
-                "button": button,
-                "pressed": pressed
-            }
+            MouseTypeEvent.CLICK,
+            ClickInput(mouse_position_x, mouse_position_y, button, pressed)
         )
     
     def on_scroll(
@@ -192,62 +292,57 @@ class PynputMouseEvent(MouseBackend[PynputButton]):
             scroll_change_y (int): The vertical scroll change amount.
         """
         self.notify_callbacks(
-            MouseTypeEvent.SCROLL, 
-            **{
-                "mouse_position_x": mouse_position_x,
-                "mouse_position_y": mouse_position_y,
-                "scroll_change_x": scroll_change_x,
-                "scroll_change_y": scroll_change_y
-            }
+            MouseTypeEvent.SCROLL,
+            ScrollInput(mouse_position_x, mouse_position_y, scroll_change_x, scroll_change_y)
         )
-    
-    def add_callback(
-        self, 
-        cb: Callable[..., Any], 
-        kind: MouseTypeEvent
+
+    def insert_move(
+        self,
+        mouse_position_x: int,
+        mouse_position_y: int
     ) -> None:
         """
-        Register a callback function for mouse events.
-        
+        Simulate moving the mouse to a position.
+
         Args:
-            cb (Callable): The callback function to register.
-            kind (MouseTypeEvent): The type of mouse event to listen for.
-        """
-        match kind:
-            case MouseTypeEvent.CLICK:
-                self.callbacks.click.append(cb)
-            
-            case MouseTypeEvent.MOVE:
-                self.callbacks.move.append(cb)
-            
-            case MouseTypeEvent.SCROLL:
-                self.callbacks.scroll.append(cb)
-    
-    def notify_callbacks(
-        self, 
-        kind: MouseTypeEvent, 
-        **kwargs: object
-    ) -> None:
+            mouse_position_x (int): The X coordinate to move to.
+            mouse_position_y (int): The Y coordinate to move to.
         """
-        Notify all registered callbacks for a mouse event.
-        
+        self.controller.position = (mouse_position_x, mouse_position_y)
+
+    def insert_motion(self, delta_x: int, delta_y: int) -> None:
+        """
+        Simulate moving the mouse relative to its current position.
+
         Args:
-            kind (MouseTypeEvent): The type of mouse event.
-            **kwargs: Additional event-specific arguments to pass to callbacks.
-        """
-        match kind:
-            case MouseTypeEvent.CLICK:
-                for cb in self.callbacks.click:
-                    cb(**kwargs)                
-                    
-            case MouseTypeEvent.MOVE:
-                for cb in self.callbacks.move:
-                    cb(**kwargs)
-                
-            case MouseTypeEvent.SCROLL:
-                for cb in self.callbacks.scroll:
-                    cb(**kwargs)                        
+            delta_x (int): The horizontal distance to move.
+            delta_y (int): The vertical distance to move.
+        """
+        self.controller.move(delta_x, delta_y)
+
+    def insert_click(self, button: PynputButton, pressed: bool) -> None:
+        """
+        Simulate pressing or releasing a mouse button.
+
+        Args:
+            button (PynputButton): The mouse button to simulate.
+            pressed (bool): True to press the button, False to release it.
+        """
+        if pressed:
+            self.controller.press(button)
+        else:
+            self.controller.release(button)
+
+    def insert_scroll(self, scroll_change_x: int, scroll_change_y: int) -> None:
+        """
+        Simulate scrolling the mouse wheel.
 
+        Args:
+            scroll_change_x (int): The horizontal scroll amount.
+            scroll_change_y (int): The vertical scroll amount.
+        """
+        self.controller.scroll(scroll_change_x, scroll_change_y)
+    
     def listen(self) -> None:
         """
         Start listening for mouse events.
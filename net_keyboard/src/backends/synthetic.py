@@ -0,0 +1,449 @@
+"""Synthetic backend module generating and recording events without devices."""
+from typing import Any, Callable, Deque, Iterable, Iterator, NamedTuple, Optional, Tuple
+from collections import deque
+from src.backends.base import KeyboardBackend, MouseBackend, MouseTypeEvent,\
+    KeyboardTypeEvent, KeyboardCallList, MouseCallList, KeyInput, ClickInput, ScrollInput
+from src.backends.keycodes import SPECIAL_CODES, BUTTON_CODES
+import threading
+import random
+import time
+
+
+SyntheticKey = int
+SyntheticButton = int
+
+KeyStep = Tuple[float, KeyboardTypeEvent, SyntheticKey]
+MouseStep = Tuple[float, MouseTypeEvent, Tuple[int, ...]]
+
+
+class Injected(NamedTuple):
+    """
+    Event injected into a synthetic backend.
+
+    Attributes:
+        kind (str): The injected action, such as "press" or "motion".
+        code (int): Key or button code, 0 for pointer actions.
+        x (int): First coordinate, delta or scroll amount.
+        y (int): Second coordinate, delta or scroll amount.
+        timestamp (int): Monotonic injection time in nanoseconds.
+    """
+    kind: str
+    code: int
+    x: int
+    y: int
+    timestamp: int
+
+
+class InjectionLog:
+    """
+    Bounded in-memory log of injected events.
+
+    Appends are thread-safe and the oldest entries are discarded once the
+    log is full, so a long stress run keeps a constant memory footprint
+    while the counter still reflects every injection.
+    """
+
+    def __init__(self, size: Optional[int] = 100000) -> None:
+        """
+        Initialize an empty log.
+
+        Args:
+            size (Optional[int]): Maximum amount of entries kept, None for no limit.
+        """
+        self.entries: Deque[Injected] = deque(maxlen=size)
+        self.count: int = 0
+        self.lock = threading.Lock()
+
+    def append(self, kind: str, code: int = 0, x: int = 0, y: int = 0) -> None:
+        """
+        Record an injected event with the current monotonic time.
+
+        Args:
+            kind (str): The injected action.
+            code (int): Key or button code.
+            x (int): First coordinate, delta or scroll amount.
+            y (int): Second coordinate, delta or scroll amount.
+        """
+        entry = Injected(kind, code, x, y, time.monotonic_ns())
+
+        with self.lock:
+            self.entries.append(entry)
+            self.count += 1
+
+    def clear(self) -> None:
+        """
+        Discard every entry and reset the counter.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.count = 0
+
+    def __len__(self) -> int:
+        """
+        Get the amount of entries kept.
+
+        Returns:
+            int: The number of entries currently in the log.
+        """
+        return len(self.entries)
+
+
+def typing_bursts(
+    count: int,
+    rate: float = 12.0,
+    word: Tuple[int, int] = (2, 9),
+    pause: float = 0.4,
+    seed: Optional[int] = None
+) -> Iterator[KeyStep]:
+    """
+    Generate words typed in bursts, separated by a space and a pause.
+
+    Key presses follow an exponential distribution around the given rate,
+    and each key is released shortly before the next one is pressed.
+
+    Args:
+        count (int): Amount of keys to type.
+        rate (float): Average keys per second within a burst.
+        word (Tuple[int, int]): Shortest and longest word length.
+        pause (float): Average pause in seconds between words.
+        seed (Optional[int]): Seed of the random generator, for reproducible runs.
+
+    Yields:
+        KeyStep: Offset in seconds from the start, event kind and key code.
+    """
+    generator = random.Random(seed)
+    space = SPECIAL_CODES["space"]
+    offset = 0.0
+    left = generator.randint(*word)
+
+    for _ in range(count):
+        if left:
+            code = ord("a") + generator.randrange(26)
+            left -= 1
+        else:
+            code = space
+            left = generator.randint(*word)
+            offset += generator.expovariate(1 / pause)
+
+        hold = generator.expovariate(rate) / 2
+        yield offset, KeyboardTypeEvent.PRESS, code
+        yield offset + hold, KeyboardTypeEvent.RELEASE, code
+        offset += hold + generator.expovariate(rate)
+
+
+def mouse_sweep(
+    count: int,
+    rate: float = 1000.0,
+    width: int = 1920,
+    height: int = 1080,
+    step: int = 4
+) -> Iterator[MouseStep]:
+    """
+    Generate a pointer sweeping back and forth across the screen.
+
+    Args:
+        count (int): Amount of moves.
+        rate (float): Moves per second, like a 1000 Hz mouse.
+        width (int): Screen width in pixels.
+        height (int): Screen height in pixels.
+        step (int): Pixels moved horizontally per event.
+
+    Yields:
+        MouseStep: Offset in seconds, event kind and the (x, y) position.
+    """
+    span = max(width // step, 1)
+
+    for index in range(count):
+        lap, position = divmod(index, span)
+        x = position * step if lap % 2 == 0 else width - 1 - position * step
+        yield index / rate, MouseTypeEvent.MOVE, (x, lap * step % height)
+
+
+def scroll_storm(
+    count: int,
+    rate: float = 500.0,
+    burst: int = 40,
+    x: int = 960,
+    y: int = 540
+) -> Iterator[MouseStep]:
+    """
+    Generate bursts of wheel notches that change direction every burst.
+
+    Args:
+        count (int): Amount of scroll events.
+        rate (float): Scroll events per second.
+        burst (int): Notches scrolled before the direction flips.
+        x (int): X coordinate of the pointer while scrolling.
+        y (int): Y coordinate of the pointer while scrolling.
+
+    Yields:
+        MouseStep: Offset in seconds, event kind and (x, y, dx, dy).
+    """
+    for index in range(count):
+        direction = -1 if index // burst % 2 == 0 else 1
+        yield index / rate, MouseTypeEvent.SCROLL, (x, y, 0, direction)
+
+
+def clicks(count: int, rate: float = 20.0, x: int = 960, y: int = 540) -> Iterator[MouseStep]:
+    """
+    Generate left button presses and releases at a fixed rate.
+
+    Args:
+        count (int): Amount of button changes.
+        rate (float): Button changes per second.
+        x (int): X coordinate of the clicks.
+        y (int): Y coordinate of the clicks.
+
+    Yields:
+        MouseStep: Offset in seconds, event kind and (x, y, button, pressed).
+    """
+    for index in range(count):
+        yield index / rate, MouseTypeEvent.CLICK, (x, y, BUTTON_CODES["left"], index % 2 == 0)
+
+
+def play(steps: Iterable[Tuple[float, Any, Any]], speed: float, emit: Callable[..., None]) -> None:
+    """
+    Replay timed steps against the monotonic clock.
+
+    Steps are scheduled from the start time rather than from the previous
+    step, so sleep overshoot does not accumulate.
+
+    Args:
+        steps (Iterable[Tuple[float, Any, Any]]): Offsets in seconds with their event.
+        speed (float): Time scale, 2.0 plays twice as fast and 0 plays
+            without waiting at all.
+        emit (Callable[..., None]): Callable receiving the kind and event of each step.
+    """
+    start = time.monotonic()
+
+    for offset, kind, event in steps:
+        if speed > 0:
+            delay = start + offset / speed - time.monotonic()
+
+            if delay > 0:
+                time.sleep(delay)
+
+        emit(kind, event)
+
+
+class SyntheticKeyboardEvent(KeyboardBackend[SyntheticKey]):
+    """
+    Keyboard backend that needs no display or input device.
+
+    Keys are the numeric codes of src.backends.keycodes. ``listen`` plays a
+    generated workload through the registered callbacks, and injected keys
+    are recorded in an in-memory log instead of reaching the system.
+    """
+
+    def __init__(
+        self,
+        workload: Optional[Iterable[KeyStep]] = None,
+        speed: float = 1.0,
+        log: Optional[InjectionLog] = None
+    ) -> None:
+        """
+        Initialize the synthetic keyboard.
+
+        Args:
+            workload (Optional[Iterable[KeyStep]]): Timed key events played by
+                listen, such as typing_bursts.
+            speed (float): Time scale of the workload, 0 plays it at full speed.
+            log (Optional[InjectionLog]): Log receiving injected keys.
+        """
+        self.callbacks: KeyboardCallList = KeyboardCallList()
+        self.workload: Iterable[KeyStep] = workload or ()
+        self.speed: float = speed
+        self.log: InjectionLog = log if log is not None else InjectionLog()
+
+    def on_press(self, key: SyntheticKey) -> None:
+        """
+        Handle keyboard press events.
+
+        Args:
+            key (SyntheticKey): The code of the key that was pressed.
+        """
+        self.notify_callbacks(KeyboardTypeEvent.PRESS, KeyInput(key, True))
+
+    def on_release(self, key: SyntheticKey) -> None:
+        """
+        Handle keyboard release events.
+
+        Args:
+            key (SyntheticKey): The code of the key that was released.
+        """
+        self.notify_callbacks(KeyboardTypeEvent.RELEASE, KeyInput(key, False))
+
+    def insert(self, key: str) -> None:
+        """
+        Simulate pressing a key.
+
+        Args:
+            key (str): A special key name or a single character.
+        """
+        code = SPECIAL_CODES.get(key, ord(key[0]) if len(key) == 1 else None)
+
+        if code is not None:
+            self.insert_code(code)
+
+    def insert_code(self, code: int, pressed: bool = True) -> None:
+        """
+        Record a simulated key press or release.
+
+        Args:
+            code (int): The key code.
+            pressed (bool): True to press the key, False to release it.
+        """
+        self.log.append("press" if pressed else "release", code)
+
+    def listen(self) -> None:
+        """
+        Play the workload through the callbacks.
+
+        Blocks until every step has been played.
+        """
+        handlers = {KeyboardTypeEvent.PRESS: self.on_press, KeyboardTypeEvent.RELEASE: self.on_release}
+        play(self.workload, self.speed, lambda kind, key: handlers[kind](key))
+
+
+class SyntheticMouseEvent(MouseBackend[SyntheticButton]):
+    """
+    Mouse backend that needs no display or input device.
+
+    Buttons are the indexes of BUTTON_NAMES. ``listen`` plays a generated
+    workload through the registered callbacks, and injected pointer
+    events are recorded in an in-memory log while a virtual position is
+    kept up to date.
+    """
+
+    def __init__(
+        self,
+        workload: Optional[Iterable[MouseStep]] = None,
+        speed: float = 1.0,
+        log: Optional[InjectionLog] = None
+    ) -> None:
+        """
+        Initialize the synthetic mouse.
+
+        Args:
+            workload (Optional[Iterable[MouseStep]]): Timed pointer events
+                played by listen, such as mouse_sweep or scroll_storm.
+            speed (float): Time scale of the workload, 0 plays it at full speed.
+            log (Optional[InjectionLog]): Log receiving injected events.
+        """
+        self.callbacks: MouseCallList = MouseCallList()
+        self.workload: Iterable[MouseStep] = workload or ()
+        self.speed: float = speed
+        self.log: InjectionLog = log if log is not None else InjectionLog()
+        self.position_x: int = 0
+        self.position_y: int = 0
+
+    def on_move(self, mouse_position_x: int, mouse_position_y: int) -> None:
+        """
+        Handle mouse movement events.
+
+        Args:
+            mouse_position_x (int): The X coordinate of the mouse position.
+            mouse_position_y (int): The Y coordinate of the mouse position.
+        """
+        event = self.move_input(mouse_position_x, mouse_position_y)
+
+        for cb in self.callbacks.move:
+            cb(event)
+
+    def on_click(
+        self,
+        mouse_position_x: int,
+        mouse_position_y: int,
+        button: SyntheticButton,
+        pressed: bool
+    ) -> None:
+        """
+        Handle mouse click events.
+
+        Args:
+            mouse_position_x (int): The X coordinate of the click position.
+            mouse_position_y (int): The Y coordinate of the click position.
+            button (SyntheticButton): The mouse button that was clicked.
+            pressed (bool): True if button was pressed, False if released.
+        """
+        self.notify_callbacks(
+            MouseTypeEvent.CLICK,
+            ClickInput(mouse_position_x, mouse_position_y, button, pressed)
+        )
+
+    def on_scroll(
+        self,
+        mouse_position_x: int,
+        mouse_position_y: int,
+        scroll_change_x: int,
+        scroll_change_y: int
+    ) -> None:
+        """
+        Handle mouse scroll events.
+
+        Args:
+            mouse_position_x (int): The X coordinate of the scroll position.
+            mouse_position_y (int): The Y coordinate of the scroll position.
+            scroll_change_x (int): The horizontal scroll change amount.
+            scroll_change_y (int): The vertical scroll change amount.
+        """
+        self.notify_callbacks(
+            MouseTypeEvent.SCROLL,
+            ScrollInput(mouse_position_x, mouse_position_y, scroll_change_x, scroll_change_y)
+        )
+
+    def insert_move(self, mouse_position_x: int, mouse_position_y: int) -> None:
+        """
+        Record a simulated move to a position.
+
+        Args:
+            mouse_position_x (int): The X coordinate to move to.
+            mouse_position_y (int): The Y coordinate to move to.
+        """
+        self.position_x, self.position_y = mouse_position_x, mouse_position_y
+        self.log.append("move", 0, mouse_position_x, mouse_position_y)
+
+    def insert_motion(self, delta_x: int, delta_y: int) -> None:
+        """
+        Record a simulated relative move.
+
+        Args:
+            delta_x (int): The horizontal distance to move.
+            delta_y (int): The vertical distance to move.
+        """
+        self.position_x += delta_x
+        self.position_y += delta_y
+        self.log.append("motion", 0, delta_x, delta_y)
+
+    def insert_click(self, button: SyntheticButton, pressed: bool) -> None:
+        """
+        Record a simulated button press or release.
+
+        Args:
+            button (SyntheticButton): The button code.
+            pressed (bool): True to press the button, False to release it.
+        """
+        self.log.append("click" if pressed else "unclick", button, self.position_x, self.position_y)
+
+    def insert_scroll(self, scroll_change_x: int, scroll_change_y: int) -> None:
+        """
+        Record a simulated scroll.
+
+        Args:
+            scroll_change_x (int): The horizontal scroll amount.
+            scroll_change_y (int): The vertical scroll amount.
+        """
+        self.log.append("scroll", 0, scroll_change_x, scroll_change_y)
+
+    def listen(self) -> None:
+        """
+        Play the workload through the callbacks.
+
+        Blocks until every step has been played.
+        """
+        handlers = {
+            MouseTypeEvent.MOVE: self.on_move,
+            MouseTypeEvent.CLICK: self.on_click,
+            MouseTypeEvent.SCROLL: self.on_scroll
+        }
+        play(self.workload, self.speed, lambda kind, event: handlers[kind](*event))
@@ -0,0 +1,307 @@
+"""Uinput module for injecting keyboard and mouse events through the kernel."""
+from typing import Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+import threading
+import struct
+import os
+from evdev import UInput, ecodes
+from src.backends.keycodes import KEY_NAMES, SPECIAL_BASE, BUTTON_NAMES, is_special
+
+
+INPUT_EVENT = struct.Struct("llHHi")
+
+SPECIAL_KEYS: Dict[str, str] = {
+    "alt": "KEY_LEFTALT", "alt_l": "KEY_LEFTALT", "alt_r": "KEY_RIGHTALT",
+    "alt_gr": "KEY_RIGHTALT", "backspace": "KEY_BACKSPACE", "caps_lock": "KEY_CAPSLOCK",
+    "cmd": "KEY_LEFTMETA", "cmd_l": "KEY_LEFTMETA", "cmd_r": "KEY_RIGHTMETA",
+    "ctrl": "KEY_LEFTCTRL", "ctrl_l": "KEY_LEFTCTRL", "ctrl_r": "KEY_RIGHTCTRL",
+    "delete": "KEY_DELETE", "down": "KEY_DOWN", "end": "KEY_END",
+    "enter": "KEY_ENTER", "esc": "KEY_ESC", "home": "KEY_HOME",
+    "left": "KEY_LEFT", "page_down": "KEY_PAGEDOWN", "page_up": "KEY_PAGEUP",
+    "right": "KEY_RIGHT", "shift": "KEY_LEFTSHIFT", "shift_l": "KEY_LEFTSHIFT",
+    "shift_r": "KEY_RIGHTSHIFT", "space": "KEY_SPACE", "tab": "KEY_TAB", "up": "KEY_UP",
+    "media_play_pause": "KEY_PLAYPAUSE", "media_volume_mute": "KEY_MUTE",
+    "media_volume_down": "KEY_VOLUMEDOWN", "media_volume_up": "KEY_VOLUMEUP",
+    "media_previous": "KEY_PREVIOUSSONG", "media_next": "KEY_NEXTSONG",
+    "insert": "KEY_INSERT", "menu": "KEY_COMPOSE", "num_lock": "KEY_NUMLOCK",
+    "pause": "KEY_PAUSE", "print_screen": "KEY_SYSRQ", "scroll_lock": "KEY_SCROLLLOCK",
+    **{f"f{number}": f"KEY_F{number}" for number in range(1, 25)}
+}
+
+US_LAYOUT: Dict[str, Tuple[str, bool]] = {
+    **{char: (f"KEY_{char.upper()}", False) for char in "abcdefghijklmnopqrstuvwxyz"},
+    **{char.upper(): (f"KEY_{char.upper()}", True) for char in "abcdefghijklmnopqrstuvwxyz"},
+    **{char: (f"KEY_{char}", False) for char in "0123456789"},
+    **{char: (f"KEY_{digit}", True) for char, digit in zip("!@#$%^&*()", "1234567890")},
+    "-": ("KEY_MINUS", False), "_": ("KEY_MINUS", True),
+    "=": ("KEY_EQUAL", False), "+": ("KEY_EQUAL", True),
+    "[": ("KEY_LEFTBRACE", False), "{": ("KEY_LEFTBRACE", True),
+    "]": ("KEY_RIGHTBRACE", False), "}": ("KEY_RIGHTBRACE", True),
+    ";": ("KEY_SEMICOLON", False), ":": ("KEY_SEMICOLON", True),
+    "'": ("KEY_APOSTROPHE", False), "\"": ("KEY_APOSTROPHE", True),
+    "`": ("KEY_GRAVE", False), "~": ("KEY_GRAVE", True),
+    "\\": ("KEY_BACKSLASH", False), "|": ("KEY_BACKSLASH", True),
+    ",": ("KEY_COMMA", False), "<": ("KEY_COMMA", True),
+    ".": ("KEY_DOT", False), ">": ("KEY_DOT", True),
+    "/": ("KEY_SLASH", False), "?": ("KEY_SLASH", True),
+    " ": ("KEY_SPACE", False), "\t": ("KEY_TAB", False), "\n": ("KEY_ENTER", False)
+}
+
+BUTTONS: Dict[str, str] = {
+    "left": "BTN_LEFT",
+    "middle": "BTN_MIDDLE",
+    "right": "BTN_RIGHT",
+    "x1": "BTN_SIDE",
+    "x2": "BTN_EXTRA"
+}
+
+
+class EvdevKeyTable:
+    """
+    Bidirectional table between evdev key codes and numeric key codes.
+
+    Named keys map one to one. Characters follow the US layout, so an
+    uppercase or shifted character resolves to its key plus left shift,
+    and captured letter keys are reported as their unshifted character.
+    Both directions are resolved with a single list index.
+    """
+
+    def __init__(self) -> None:
+        """
+        Precompute the lookups in both directions.
+        """
+        self.specials: List[Optional[int]] = [
+            getattr(ecodes, SPECIAL_KEYS[name], None) for name in KEY_NAMES
+        ]
+        self.chars: List[Optional[Tuple[int, bool]]] = [None] * 0x80
+        self.codes: List[Optional[int]] = [None] * (ecodes.KEY_MAX + 1)
+        self.buttons: List[Optional[int]] = [
+            getattr(ecodes, BUTTONS[name]) if name in BUTTONS else None
+            for name in BUTTON_NAMES
+        ]
+        self.button_codes: Dict[int, int] = {
+            button: index for index, button in enumerate(self.buttons) if button is not None
+        }
+
+        for char, (name, shifted) in US_LAYOUT.items():
+            keycode = getattr(ecodes, name)
+            self.chars[ord(char)] = (keycode, shifted)
+
+            if not shifted and self.codes[keycode] is None:
+                self.codes[keycode] = ord(char)
+
+        for index, keycode in enumerate(self.specials):
+            if keycode is not None:
+                self.codes[keycode] = SPECIAL_BASE + index
+
+    def keycode(self, code: int) -> Optional[Tuple[int, bool]]:
+        """
+        Get the evdev key code for a numeric code.
+
+        Args:
+            code (int): The key code received from the network.
+
+        Returns:
+            Optional[Tuple[int, bool]]: The evdev key code and whether shift
+            must be held, or None if the key cannot be typed.
+        """
+        if code < len(self.chars):
+            return self.chars[code]
+
+        if is_special(code):
+            keycode = self.specials[code - SPECIAL_BASE]
+            return None if keycode is None else (keycode, False)
+
+        return None
+
+    def code(self, keycode: int) -> Optional[int]:
+        """
+        Get the numeric code for a captured evdev key code.
+
+        Args:
+            keycode (int): The evdev key code.
+
+        Returns:
+            Optional[int]: The key code, or None if the key is not mapped.
+        """
+        if 0 <= keycode < len(self.codes):
+            return self.codes[keycode]
+
+        return None
+
+    def button(self, code: int) -> Optional[int]:
+        """
+        Get the evdev button code for a numeric button code.
+
+        Args:
+            code (int): The button code, an index of BUTTON_NAMES.
+
+        Returns:
+            Optional[int]: The evdev button code, or None if unknown.
+        """
+        if 0 <= code < len(self.buttons):
+            return self.buttons[code]
+
+        return None
+
+    def button_code(self, button: int) -> int:
+        """
+        Get the numeric button code for a captured evdev button code.
+
+        Args:
+            button (int): The evdev button code.
+
+        Returns:
+            int: The index of the button in BUTTON_NAMES, 0 if unknown.
+        """
+        return self.button_codes.get(button, 0)
+
+
+KEY_TABLE = EvdevKeyTable()
+
+
+def capabilities() -> Dict[int, List[int]]:
+    """
+    Build the capabilities of the virtual injection device.
+
+    Returns:
+        Dict[int, List[int]]: Every mapped key and button, plus relative axes.
+    """
+    keys = {keycode for keycode, _ in filter(None, KEY_TABLE.chars)}
+    keys.update(filter(None, KEY_TABLE.specials))
+    keys.update(filter(None, KEY_TABLE.buttons))
+    keys.add(ecodes.KEY_LEFTSHIFT)
+
+    return {
+        ecodes.EV_KEY: sorted(keys),
+        ecodes.EV_REL: [ecodes.REL_X, ecodes.REL_Y, ecodes.REL_WHEEL, ecodes.REL_HWHEEL]
+    }
+
+
+class UInputWriter:
+    """
+    Frame-batched writer for a uinput device.
+
+    Events are packed as struct input_event into a pending buffer and the
+    whole frame, closed by a single SYN_REPORT, goes to the kernel in one
+    write. Nested frames share the outermost one, so several inserts can
+    land in the same report. The writer only needs an object exposing the
+    file descriptor as ``fd``, so a pipe can stand in for the device when
+    running headless.
+    """
+
+    def __init__(self, device: Optional[UInput] = None, name: str = "net-keyboard") -> None:
+        """
+        Initialize the writer and create the virtual device if none is given.
+
+        Args:
+            device (Optional[UInput]): The uinput device, or any object with an
+                ``fd`` attribute, to write frames to.
+            name (str): Name of the virtual device created by default.
+        """
+        self.device = device if device is not None else UInput(capabilities(), name=name)
+        self.frames: int = 0
+        self.lock = threading.RLock()
+
+        self._pending: bytearray = bytearray()
+        self._depth: int = 0
+
+    def emit(self, type: int, code: int, value: int) -> None:
+        """
+        Append an event to the current frame.
+
+        Args:
+            type (int): The evdev event type.
+            code (int): The evdev event code.
+            value (int): The event value.
+        """
+        self._pending += INPUT_EVENT.pack(0, 0, type, code, value)
+
+    @contextmanager
+    def frame(self) -> Iterator["UInputWriter"]:
+        """
+        Group the events emitted inside the block into a single frame.
+
+        The frame is written when the outermost block exits.
+
+        Yields:
+            UInputWriter: The writer itself.
+        """
+        with self.lock:
+            self._depth += 1
+
+            try:
+                yield self
+
+            finally:
+                self._depth -= 1
+
+                if self._depth == 0:
+                    self.flush()
+
+    def flush(self) -> None:
+        """
+        Close the pending frame with SYN_REPORT and write it in one call.
+        """
+        with self.lock:
+            if not self._pending:
+                return
+
+            self.emit(ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+            os.write(self.device.fd, self._pending)
+            self._pending.clear()
+            self.frames += 1
+
+    def close(self) -> None:
+        """
+        Write any pending frame and close the device.
+        """
+        self.flush()
+        self.device.close()
+
+
+def decode_frames(data: bytes) -> List[List[Tuple[int, int, int]]]:
+    """
+    Split raw written bytes back into frames of events.
+
+    Meant for checking what a writer produced when it writes to a pipe.
+
+    Args:
+        data (bytes): The bytes written by one or more flushes.
+
+    Returns:
+        List[List[Tuple[int, int, int]]]: Each frame as (type, code, value)
+        events, without the closing SYN_REPORT.
+    """
+    frames: List[List[Tuple[int, int, int]]] = []
+    current: List[Tuple[int, int, int]] = []
+
+    for _, _, type, code, value in INPUT_EVENT.iter_unpack(data):
+        if type == ecodes.EV_SYN and code == ecodes.SYN_REPORT:
+            frames.append(current)
+            current = []
+        else:
+            current.append((type, code, value))
+
+    return frames
+
+
+_shared: Optional[UInputWriter] = None
+
+
+def shared_writer() -> UInputWriter:
+    """
+    Get the writer shared by the keyboard and mouse injection backends.
+
+    Sharing one device lets a motion delta and a button change be written
+    in the same frame.
+
+    Returns:
+        UInputWriter: The process-wide writer, created on first use.
+    """
+    global _shared
+
+    if _shared is None:
+        _shared = UInputWriter()
+
+    return _shared
@@ -0,0 +1,129 @@
+"""Heartbeat pipeline module for link liveness and round-trip time estimates."""
+from typing import Dict, Optional
+from src.tcp.protocol import Event, EventKind, EventType, encode
+from src.pipeline.trace import STAMP
+import time
+
+
+RTT_GAIN = 1 / 8
+JITTER_GAIN = 1 / 4
+
+
+class Heartbeat:
+    """
+    Periodic ping/pong on the reliable connection.
+
+    The owner sends ``ping`` frames every ``interval`` seconds and hands
+    the echoed pongs to ``pong``. Each answer gives a round-trip sample,
+    smoothed the way TCP does: an exponentially weighted moving average of
+    the RTT plus one of its deviation, reported as jitter. Any traffic
+    from the peer counts as a sign of life, and once nothing has arrived
+    for longer than the timeout the peer is considered dead.
+    """
+
+    def __init__(self, interval: float = 1.0, timeout: Optional[float] = 5.0) -> None:
+        """
+        Initialize the heartbeat.
+
+        Args:
+            interval (float): Seconds between pings.
+            timeout (Optional[float]): Seconds of silence after which the peer
+                is considered dead, None to never give up on it.
+        """
+        self.interval: float = interval
+        self.timeout: Optional[float] = timeout
+        self.pings: int = 0
+        self.samples: int = 0
+        self.smoothed: Optional[float] = None
+        self.deviation: Optional[float] = None
+        self.lowest: Optional[float] = None
+
+        self._seen: float = time.monotonic()
+
+    def ping(self) -> bytes:
+        """
+        Build a ping frame stamped with the local send time.
+
+        Returns:
+            bytes: The encoded ping.
+        """
+        self.pings += 1
+        return encode(EventType.CONTROL, EventKind.PING, payload=STAMP.pack(time.monotonic_ns()))
+
+    def pong(self, event: Event, received: int) -> None:
+        """
+        Take a round-trip sample from an echoed ping.
+
+        Args:
+            event (Event): The pong carrying the original send stamp.
+            received (int): Monotonic time the pong was received.
+        """
+        self._seen = time.monotonic()
+
+        if len(event.payload) < STAMP.size:
+            return
+
+        (sent,) = STAMP.unpack_from(event.payload)
+        sample = (received - sent) / 1e9
+        self.samples += 1
+
+        if self.smoothed is None or self.deviation is None:
+            self.smoothed = sample
+            self.deviation = sample / 2
+        else:
+            self.deviation += JITTER_GAIN * (abs(sample - self.smoothed) - self.deviation)
+            self.smoothed += RTT_GAIN * (sample - self.smoothed)
+
+        if self.lowest is None or sample < self.lowest:
+            self.lowest = sample
+
+    def seen(self) -> None:
+        """
+        Record traffic from the peer.
+        """
+        self._seen = time.monotonic()
+
+    def expired(self) -> bool:
+        """
+        Check whether the peer has been silent for longer than the timeout.
+
+        Returns:
+            bool: True if the peer is considered dead.
+        """
+        return self.timeout is not None and time.monotonic() - self._seen > self.timeout
+
+    def rtt(self) -> Optional[float]:
+        """
+        Get the smoothed round-trip time.
+
+        Designed to be used as the RTT provider of a MotionCoalescer.
+
+        Returns:
+            Optional[float]: The RTT in seconds, or None before the first sample.
+        """
+        return self.smoothed
+
+    def jitter(self) -> Optional[float]:
+        """
+        Get the smoothed deviation of the round-trip time.
+
+        Returns:
+            Optional[float]: The jitter in seconds, or None before the first sample.
+        """
+        return self.deviation
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """
+        Get the current link measurements.
+
+        Returns:
+            Dict[str, Optional[float]]: Smoothed RTT, jitter and lowest RTT in
+            milliseconds, with the amount of pings and answered samples.
+        """
+        return {
+            "rtt_ms": None if self.smoothed is None else round(self.smoothed * 1e3, 3),
+            "jitter_ms": None if self.deviation is None else round(self.deviation * 1e3, 3),
+            "min_ms": None if self.lowest is None else round(self.lowest * 1e3, 3),
+            "pings": self.pings,
+            "samples": self.samples
+        }
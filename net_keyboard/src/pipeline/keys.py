@@ -0,0 +1,257 @@
+"""Key state module for tracking pressed keys on both ends of the connection."""
+from typing import Callable, Dict, List, Optional, Set
+from src.backends.keycodes import CHAR_CACHE, SPECIAL_BASE, is_special
+import threading
+import time
+
+
+ReleaseSink = Callable[[List[int]], None]
+
+
+class PressedKeys:
+    """
+    Compact set of pressed key codes.
+
+    Latin-1 characters and named keys, which cover almost every key on a
+    keyboard, are kept as bits of a single integer. Any other code falls
+    back to a regular set.
+
+    The typed character of a key can change while it is held, as with
+    Shift let go before the letter: pressed as 'A', released as 'a'.
+    When the physical key is known, the code it was pressed with is kept
+    for it, and its release releases that code whatever it typed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty key set.
+        """
+        self.bits: int = 0
+        self.overflow: Set[int] = set()
+        self.scans: Dict[int, int] = {}
+
+    @staticmethod
+    def slot(code: int) -> Optional[int]:
+        """
+        Get the bit index of a key code.
+
+        Args:
+            code (int): The key code.
+
+        Returns:
+            Optional[int]: The bit index, or None if the code is kept in the
+            overflow set.
+        """
+        if code < CHAR_CACHE:
+            return code
+
+        if is_special(code):
+            return CHAR_CACHE + code - SPECIAL_BASE
+
+        return None
+
+    def press(self, code: int, scan: Optional[int] = None) -> bool:
+        """
+        Mark a key as pressed.
+
+        Args:
+            code (int): The key code.
+            scan (Optional[int]): The physical key, None if unknown.
+
+        Returns:
+            bool: True if the key was up, False if it was already held,
+            which means the press is an auto-repeat.
+        """
+        if scan is not None and scan in self.scans:
+            return False
+
+        slot = self.slot(code)
+
+        if slot is None:
+            if code in self.overflow:
+                return False
+
+            self.overflow.add(code)
+        else:
+            bit = 1 << slot
+
+            if self.bits & bit:
+                return False
+
+            self.bits |= bit
+
+        if scan is not None:
+            self.scans[scan] = code
+
+        return True
+
+    def release(self, code: int, scan: Optional[int] = None) -> Optional[int]:
+        """
+        Mark a key as released.
+
+        Args:
+            code (int): The key code.
+            scan (Optional[int]): The physical key, None if unknown.
+
+        Returns:
+            Optional[int]: The code the key was pressed with, which differs
+            from the given one when its typed character changed while
+            held, or None if the key was already up.
+        """
+        if scan is not None and scan in self.scans:
+            code = self.scans.pop(scan)
+
+        slot = self.slot(code)
+
+        if slot is None:
+            if code not in self.overflow:
+                return None
+
+            self.overflow.discard(code)
+            return code
+
+        bit = 1 << slot
+
+        if not self.bits & bit:
+            return None
+
+        self.bits &= ~bit
+        return code
+
+    def drain(self) -> List[int]:
+        """
+        Release every key and return the codes that were held.
+
+        Returns:
+            List[int]: The codes of the keys that were held.
+        """
+        codes = list(self.overflow)
+        bits = self.bits
+
+        while bits:
+            lowest = bits & -bits
+            slot = lowest.bit_length() - 1
+            codes.append(slot if slot < CHAR_CACHE else SPECIAL_BASE + slot - CHAR_CACHE)
+            bits ^= lowest
+
+        self.bits = 0
+        self.overflow.clear()
+        self.scans.clear()
+        return codes
+
+    def __contains__(self, code: int) -> bool:
+        """
+        Check whether a key is held.
+
+        Args:
+            code (int): The key code.
+
+        Returns:
+            bool: True if the key is held.
+        """
+        slot = self.slot(code)
+
+        if slot is None:
+            return code in self.overflow
+
+        return bool(self.bits >> slot & 1)
+
+    def __len__(self) -> int:
+        """
+        Get the number of held keys.
+
+        Returns:
+            int: The amount of keys currently held.
+        """
+        return self.bits.bit_count() + len(self.overflow)
+
+
+class StuckKeyGuard:
+    """
+    Injection-side key state that releases held keys when the link fails.
+
+    Presses and releases go through the guard, which drops duplicates and
+    remembers what is held. When the connection drops, or no input event
+    arrives for longer than the idle timeout, every held key is handed to
+    the release sink in a single batch. Heartbeats and other control
+    frames do not count as input, so a live but idle link still releases.
+    """
+
+    def __init__(self, sink: ReleaseSink, idle_timeout: Optional[float] = None) -> None:
+        """
+        Initialize the guard.
+
+        Args:
+            sink (ReleaseSink): Callable that releases a batch of key codes.
+            idle_timeout (Optional[float]): Seconds without events before held
+                keys are released, None to only release on disconnect.
+        """
+        self.sink: ReleaseSink = sink
+        self.idle_timeout: Optional[float] = idle_timeout
+        self.keys: PressedKeys = PressedKeys()
+        self.lock = threading.Lock()
+        self.recovered: int = 0
+
+        self._last: float = time.monotonic()
+
+    def press(self, code: int) -> bool:
+        """
+        Record a key press received from the network.
+
+        Args:
+            code (int): The key code.
+
+        Returns:
+            bool: True if the key should be injected.
+        """
+        with self.lock:
+            self._last = time.monotonic()
+            return self.keys.press(code)
+
+    def release(self, code: int) -> bool:
+        """
+        Record a key release received from the network.
+
+        Args:
+            code (int): The key code.
+
+        Returns:
+            bool: True if the key was held and should be released.
+        """
+        with self.lock:
+            self._last = time.monotonic()
+            return self.keys.release(code) is not None
+
+    def touch(self) -> None:
+        """
+        Record an input event that does not change a key, such as motion or a click.
+        """
+        self._last = time.monotonic()
+
+    def release_all(self) -> None:
+        """
+        Release every held key in one batch.
+        """
+        with self.lock:
+            codes = self.keys.drain()
+
+            if codes:
+                self.recovered += len(codes)
+                self.sink(codes)
+
+    def start(self) -> None:
+        """
+        Start the idle watchdog thread, if an idle timeout is set.
+        """
+        if self.idle_timeout is not None:
+            threading.Thread(target=self._watch, daemon=True).start()
+
+    def _watch(self) -> None:
+        """
+        Release held keys whenever the connection stays idle too long.
+        """
+        while True:
+            time.sleep(self.idle_timeout / 2)
+
+            if len(self.keys) and time.monotonic() - self._last > self.idle_timeout:
+                self.release_all()
@@ -0,0 +1,360 @@
+"""Lanes pipeline module for sending discrete events ahead of queued motion."""
+from typing import Callable, Deque, Dict, List, Optional
+from collections import deque
+from src.tcp.protocol import Event, EventKind, FrameDecoder, encode
+import threading
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+PacketSink = Callable[[bytes], None]
+DepthHook = Callable[[int], None]
+OVERFLOW_POLICIES = ("drop", "block", "disconnect")
+
+
+class LaneScheduler:
+    """
+    Pipeline stage sending frames through two priority lanes.
+
+    Discrete frames (keys, clicks, control) and continuous frames (moves,
+    scroll) wait in separate queues, and a single sender thread writes
+    them to the sink. Whenever discrete frames are waiting they are sent
+    first, so a keystroke never sits behind a backlog of pointer motion.
+    Continuous frames that pile up past the limit are collapsed: within
+    each run of consecutive frames of the same kind, absolute moves keep
+    only the latest position, while relative motion and scroll deltas are
+    added together. Frames of different kinds keep their order.
+
+    Both lanes share a bounded capacity, so a stalled connection only
+    fills the queue instead of blocking the capture callbacks. What
+    happens once it is full is set by the overflow policy:
+
+    - ``"drop"``: the oldest waiting motion frame is dropped. Without
+      motion to drop, a new motion frame is dropped instead, while a
+      discrete one is handled as under ``"disconnect"``: keys and clicks
+      are never dropped, and the caller never waits.
+    - ``"block"``: the caller waits until there is room again. This is
+      the only policy that waits.
+    - ``"disconnect"``: the overflow hook is called to close the
+      connection and every later frame is discarded until the scheduler
+      is reopened for the next connection.
+
+    The high-water hook is called when the depth reaches the high-water
+    mark, and the low-water hook when it falls back to the low-water mark.
+    """
+
+    def __init__(
+        self,
+        sink: PacketSink,
+        motion_limit: int = 8,
+        capacity: int = 1024,
+        policy: str = "drop",
+        high_water: Optional[int] = None,
+        low_water: Optional[int] = None,
+        on_high_water: Optional[DepthHook] = None,
+        on_low_water: Optional[DepthHook] = None,
+        on_overflow: Optional[DepthHook] = None
+    ) -> None:
+        """
+        Initialize the lane scheduler.
+
+        Args:
+            sink (PacketSink): Callable writing a batch of frames to the connection.
+            motion_limit (int): Continuous frames allowed to wait before they
+                are collapsed.
+            capacity (int): Maximum frames waiting in both lanes together.
+            policy (str): What to do when the queue is full, one of
+                OVERFLOW_POLICIES.
+            high_water (Optional[int]): Depth that triggers the high-water
+                hook, three quarters of the capacity by default.
+            low_water (Optional[int]): Depth that triggers the low-water
+                hook, a quarter of the capacity by default.
+            on_high_water (Optional[DepthHook]): Called with the depth when
+                the queue reaches the high-water mark.
+            on_low_water (Optional[DepthHook]): Called with the depth when
+                the queue drains back to the low-water mark.
+            on_overflow (Optional[DepthHook]): Called with the depth, from a
+                thread of its own, when the queue overflows under the
+                disconnect policy.
+
+        Raises:
+            ValueError: If the policy is unknown.
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}")
+
+        self.sink: PacketSink = sink
+        self.motion_limit: int = motion_limit
+        self.capacity: int = capacity
+        self.policy: str = policy
+        self.high_water: int = high_water if high_water is not None else capacity * 3 // 4
+        self.low_water: int = low_water if low_water is not None else capacity // 4
+        self.on_high_water: Optional[DepthHook] = on_high_water
+        self.on_low_water: Optional[DepthHook] = on_low_water
+        self.on_overflow: Optional[DepthHook] = on_overflow
+        self.condition = threading.Condition()
+        self.sent: int = 0
+        self.collapsed: int = 0
+        self.preempted: int = 0
+        self.dropped: int = 0
+        self.blocked: int = 0
+        self.overflows: int = 0
+        self.high_water_hits: int = 0
+        self.closed: bool = False
+
+        self._above: bool = False
+        self._discrete: Deque[bytes] = deque()
+        self._continuous: Deque[bytes] = deque()
+        self._thread: threading.Thread = threading.Thread(target=self._send_loop, daemon=True)
+
+    def discrete(self, packet: bytes, ordered: bool = False) -> None:
+        """
+        Queue a frame that must never be dropped or delayed by motion.
+
+        Args:
+            packet (bytes): The encoded frame to send.
+            ordered (bool): Whether queued continuous frames must be sent
+                before this one, as a click needs the pointer in place.
+        """
+        with self.condition:
+            if not self._admit(True):
+                return
+
+            if ordered and self._continuous:
+                self._discrete.extend(self._continuous)
+                self._continuous.clear()
+
+            self._discrete.append(packet)
+            self.condition.notify_all()
+            rising = self._rising()
+
+        if rising and self.on_high_water is not None:
+            self.on_high_water(self.high_water)
+
+    def continuous(self, packet: bytes) -> None:
+        """
+        Queue a move or scroll frame, collapsing the lane if it falls behind.
+
+        Args:
+            packet (bytes): The encoded frame to send.
+        """
+        with self.condition:
+            if not self._admit(False):
+                return
+
+            self._continuous.append(packet)
+
+            if len(self._continuous) > self.motion_limit:
+                self._collapse()
+
+            self.condition.notify_all()
+            rising = self._rising()
+
+        if rising and self.on_high_water is not None:
+            self.on_high_water(self.high_water)
+
+    def depth(self) -> int:
+        """
+        Get the number of frames waiting in both lanes.
+
+        Designed to be used as the depth provider of a MotionCoalescer.
+
+        Returns:
+            int: The depth of the send queue.
+        """
+        return len(self._discrete) + len(self._continuous)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the queue depths and counters of the scheduler.
+
+        Returns:
+            Dict[str, int]: Waiting frames per lane, frames sent, frames
+            removed by collapsing, batches that jumped ahead of motion,
+            frames dropped, waits for room, overflows and high-water hits.
+        """
+        with self.condition:
+            return {
+                "discrete": len(self._discrete),
+                "continuous": len(self._continuous),
+                "sent": self.sent,
+                "collapsed": self.collapsed,
+                "preempted": self.preempted,
+                "dropped": self.dropped,
+                "blocked": self.blocked,
+                "overflows": self.overflows,
+                "high_water_hits": self.high_water_hits
+            }
+
+    def start(self) -> None:
+        """
+        Start the sender thread.
+        """
+        self._thread.start()
+
+    def close(self) -> None:
+        """
+        Discard every waiting frame and refuse new ones.
+
+        Blocked callers are released and the sender thread stops.
+        """
+        with self.condition:
+            self.closed = True
+            self._discrete.clear()
+            self._continuous.clear()
+            self.condition.notify_all()
+
+    def reopen(self) -> None:
+        """
+        Accept frames again after the scheduler was closed.
+
+        Meant for a new connection replacing the one the scheduler was
+        closed for: the previous sender thread is waited for and a new
+        one is started, with both lanes empty.
+        """
+        with self.condition:
+            if not self.closed:
+                return
+
+        if self._thread.is_alive():
+            self._thread.join()
+
+        with self.condition:
+            self.closed = False
+            self._above = False
+            self._discrete.clear()
+            self._continuous.clear()
+
+        self._thread = threading.Thread(target=self._send_loop, daemon=True)
+        self._thread.start()
+
+    def _admit(self, discrete: bool) -> bool:
+        """
+        Make room for one more frame according to the overflow policy.
+
+        Must be called with the condition held. Only waits under the block
+        policy; a discrete frame that finds no motion to drop under the
+        drop policy disconnects instead.
+
+        Args:
+            discrete (bool): Whether the frame is discrete, which is never dropped.
+
+        Returns:
+            bool: True if the frame can be queued, False if it is discarded.
+        """
+        if self.closed:
+            return False
+
+        if self.depth() < self.capacity:
+            return True
+
+        self.overflows += 1
+
+        match self.policy:
+            case "drop" if self._continuous or not discrete:
+                self.dropped += 1
+
+                if self._continuous:
+                    self._continuous.popleft()
+                    return True
+
+                return False
+
+            case "block":
+                self.blocked += 1
+                self.condition.wait_for(lambda: self.closed or self.depth() < self.capacity)
+                return not self.closed
+
+            case _:
+                self.close()
+
+                if self.on_overflow is not None:
+                    threading.Thread(target=self.on_overflow, args=(self.capacity,), daemon=True).start()
+
+                return False
+
+    def _rising(self) -> bool:
+        """
+        Check whether the depth just reached the high-water mark.
+
+        Must be called with the condition held.
+
+        Returns:
+            bool: True the first time the mark is reached since the last drain.
+        """
+        if self._above or self.depth() < self.high_water:
+            return False
+
+        self._above = True
+        self.high_water_hits += 1
+        return True
+
+    def _collapse(self) -> None:
+        """
+        Merge each run of consecutive frames of the same kind into one.
+
+        Must be called with the condition held.
+        """
+        events = FrameDecoder().feed(b"".join(self._continuous))
+        merged: List[Event] = []
+
+        for event in events:
+            previous = merged[-1] if merged else None
+
+            if previous is None or previous.kind != event.kind:
+                merged.append(event)
+                continue
+
+            if event.kind != EventKind.MOVE:
+                event = event._replace(x=previous.x + event.x, y=previous.y + event.y)
+
+            merged[-1] = event
+
+        self._continuous.clear()
+        self._continuous.extend(encode(*event) for event in merged)
+        self.collapsed += len(events) - len(merged)
+
+    def _send_loop(self) -> None:
+        """
+        Write waiting frames to the sink, discrete lane first.
+
+        Every frame waiting in the chosen lane is written in one call.
+        Stops when the scheduler is closed or the sink fails, as the
+        connection is gone.
+        """
+        while True:
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: self.closed or self._discrete or self._continuous
+                )
+
+                if self.closed:
+                    return
+
+                if self._discrete:
+                    if self._continuous:
+                        self.preempted += 1
+
+                    frames, self._discrete = self._discrete, deque()
+                else:
+                    frames, self._continuous = self._continuous, deque()
+
+                self.condition.notify_all()
+                falling = self._above and self.depth() <= self.low_water
+
+                if falling:
+                    self._above = False
+
+            if falling and self.on_low_water is not None:
+                self.on_low_water(self.low_water)
+
+            try:
+                self.sink(b"".join(frames))
+
+            except OSError as error:
+                logger.warning("Send lanes stopped: %s", error)
+                self.close()
+                return
+
+            self.sent += len(frames)
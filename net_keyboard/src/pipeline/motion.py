@@ -0,0 +1,156 @@
+"""Motion pipeline module for coalescing mouse moves before they are sent."""
+from typing import Callable, Optional, Tuple
+from src.backends.base import MoveInput
+import threading
+import time
+
+
+MotionSink = Callable[[int, int], None]
+RttProvider = Callable[[], Optional[float]]
+DepthProvider = Callable[[], int]
+
+
+class MotionCoalescer:
+    """
+    Pipeline stage that merges pending mouse moves into one delta per tick.
+
+    Absolute positions reported by the mouse backend are accumulated and a
+    single relative delta is handed to the sink on every tick. For a
+    lossy channel, where a lost delta would shift the remote pointer for
+    good, the sink can be handed the latest absolute position instead.
+    The tick interval adapts to the measured round-trip time and the
+    depth of the send queue, and stays between the minimum and maximum
+    rates, the maximum winning when they conflict.
+
+    The sink is always called with the internal lock held, so a discrete
+    event that calls flush first is guaranteed to be sent after any motion
+    that happened before it.
+    """
+
+    def __init__(
+        self,
+        sink: MotionSink,
+        max_rate: float = 250.0,
+        min_rate: float = 30.0,
+        rtt: Optional[RttProvider] = None,
+        depth: Optional[DepthProvider] = None,
+        depth_limit: int = 64,
+        absolute: bool = False
+    ) -> None:
+        """
+        Initialize the motion coalescer.
+
+        Args:
+            sink (MotionSink): Callable receiving each coalesced delta (dx, dy),
+                or position (x, y) when absolute.
+            max_rate (float): Maximum deltas sent per second.
+            min_rate (float): Minimum deltas sent per second while moving,
+                lowered to the maximum rate if above it.
+            rtt (Optional[RttProvider]): Callable returning the smoothed
+                round-trip time in seconds, or None while unknown.
+            depth (Optional[DepthProvider]): Callable returning the number of
+                packets waiting in the send queue.
+            depth_limit (int): Queue depth at which the tick interval doubles.
+            absolute (bool): Hand the sink positions instead of deltas.
+        """
+        self.sink: MotionSink = sink
+        self.max_rate: float = max_rate
+        self.min_rate: float = min(min_rate, max_rate)
+        self.absolute: bool = absolute
+        self.rtt: Optional[RttProvider] = rtt
+        self.depth: Optional[DepthProvider] = depth
+        self.depth_limit: int = depth_limit
+        self.lock = threading.Lock()
+        self.merged: int = 0
+        self.sent: int = 0
+
+        self._origin: Optional[Tuple[int, int]] = None
+        self._position: Optional[Tuple[int, int]] = None
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def move(self, event: MoveInput) -> None:
+        """
+        Record a new mouse position reported by the backend.
+
+        Designed to be registered as a MouseTypeEvent.MOVE callback.
+
+        Args:
+            event (MoveInput): The new mouse position.
+        """
+        with self.lock:
+            if self._origin is None and not self.absolute:
+                self._origin = (event.x, event.y)
+
+            self._position = (event.x, event.y)
+            self.merged += 1
+
+    def flush(self) -> None:
+        """
+        Send the pending delta right away, if there is one.
+
+        Call this before sending a click or scroll so the remote pointer is
+        at the right place when the discrete event lands.
+        """
+        with self.lock:
+            if self._position is None or self._position == self._origin:
+                return
+
+            if self.absolute:
+                self.sink(*self._position)
+            else:
+                self.sink(
+                    self._position[0] - self._origin[0], self._position[1] - self._origin[1]
+                )
+
+            self._origin = self._position
+            self.sent += 1
+
+    def interval(self) -> float:
+        """
+        Compute the current tick interval.
+
+        The base interval is set by the maximum rate. It is raised to a
+        quarter of the round-trip time, since sending faster than that only
+        piles up in flight, and stretched further as the send queue grows,
+        up to the interval of the minimum rate.
+
+        Returns:
+            float: The seconds to wait before the next tick.
+        """
+        interval = 1.0 / self.max_rate
+
+        if self.rtt is not None and (rtt := self.rtt()) is not None:
+            interval = max(interval, rtt / 4)
+
+        if self.depth is not None:
+            interval *= 1 + self.depth() / self.depth_limit
+
+        return max(min(interval, 1.0 / self.min_rate), 1.0 / self.max_rate)
+
+    def start(self) -> None:
+        """
+        Start the tick thread.
+        """
+        self._running.set()
+        self._thread = threading.Thread(target=self._tick, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the tick thread and send whatever motion is still pending.
+        """
+        self._running.clear()
+
+        if self._thread is not None:
+            self._thread.join()
+
+        self.flush()
+
+    def _tick(self) -> None:
+        """
+        Flush the pending delta once per interval until stopped.
+        """
+        while self._running.is_set():
+            time.sleep(self.interval())
+            self.flush()
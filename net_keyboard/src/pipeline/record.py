@@ -0,0 +1,327 @@
+"""Record module for logging captured sessions and replaying them."""
+from typing import Iterator, Optional, Tuple
+from src.tcp.protocol import Event, EventKind, EventType
+from src.backends.base import KeyboardBackend, MouseBackend
+from src.backends.synthetic import play
+import threading
+import struct
+import mmap
+import os
+import time
+
+
+MAGIC = b"NKEVLOG\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHH4x")
+RECORD = struct.Struct("<QBBxxIii")
+SESSION = (EventType.CONTROL, EventKind.HELLO)
+FLUSH_INTERVAL = 1.0
+
+
+class Recorder:
+    """
+    Append-only writer of captured events.
+
+    Each event is one fixed-width little-endian record holding the
+    monotonic capture time, type, kind, code and both coordinates, after
+    a small header identifying the format. Records are only ever added at
+    the end, so a log can be read while it is still being written. Every
+    recorder starts its session with a marker record, since the monotonic
+    clock of one process means nothing to the next one appending to the
+    same log. A background thread flushes the log every
+    ``flush_interval`` seconds, so at most that much of the session is
+    lost if the process dies.
+    """
+
+    def __init__(self, path: str, flush_interval: float = FLUSH_INTERVAL) -> None:
+        """
+        Open the log for appending, writing the header if it is new.
+
+        A record left half-written by a process that died is cut off before
+        the session marker is appended.
+
+        Args:
+            path (str): The file to record to.
+            flush_interval (float): Seconds between flushes of buffered records.
+
+        Raises:
+            ValueError: If the file exists but is not an event log.
+        """
+        self.path: str = path
+        self.flush_interval: float = flush_interval
+        self.count: int = 0
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+
+        if os.path.exists(path) and (size := os.path.getsize(path)) > 0:
+            check_header(path)
+            complete = HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size
+
+            if complete != size:
+                os.truncate(path, complete)
+
+            self._file = open(path, "ab")
+        else:
+            self._file = open(path, "ab")
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+        self._file.write(RECORD.pack(time.monotonic_ns(), *SESSION, 0, 0, 0))
+
+        threading.Thread(target=self._flush_loop, daemon=True).start()
+
+    def record(
+        self,
+        type: int,
+        kind: int,
+        code: int = 0,
+        x: int = 0,
+        y: int = 0,
+        timestamp: int = 0
+    ) -> None:
+        """
+        Append one event to the log. Events after the log is closed are ignored.
+
+        Args:
+            type (int): The device the event comes from.
+            kind (int): The action of the event.
+            code (int): Numeric key or button code.
+            x (int): First coordinate or delta of the event.
+            y (int): Second coordinate or delta of the event.
+            timestamp (int): Monotonic capture time in nanoseconds. When zero,
+                the current monotonic time is used.
+        """
+        data = RECORD.pack(timestamp or time.monotonic_ns(), type, kind, code, x, y)
+
+        with self.lock:
+            if self._file.closed:
+                return
+
+            self._file.write(data)
+            self.count += 1
+
+    def flush(self) -> None:
+        """
+        Write buffered records to the file.
+        """
+        with self.lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self) -> None:
+        """
+        Flush and close the log, stopping the periodic flush.
+        """
+        self.closed.set()
+
+        with self.lock:
+            self._file.close()
+
+    def _flush_loop(self) -> None:
+        """
+        Flush the log once per flush interval until it is closed.
+        """
+        while not self.closed.wait(self.flush_interval):
+            self.flush()
+
+
+def check_header(path: str) -> None:
+    """
+    Check that a file starts with a supported event log header.
+
+    Args:
+        path (str): The file to check.
+
+    Raises:
+        ValueError: If the header is missing, foreign or of another version.
+    """
+    with open(path, "rb") as raw:
+        data = raw.read(HEADER.size)
+
+    if len(data) < HEADER.size:
+        raise ValueError("Not an event log, header is truncated")
+
+    magic, version, size = HEADER.unpack(data)
+
+    if magic != MAGIC or version != VERSION or size != RECORD.size:
+        raise ValueError("Not an event log or unsupported version")
+
+
+class EventLog:
+    """
+    Memory-mapped reader of an event log.
+
+    Records are unpacked straight from the mapping on access, so opening
+    a long session costs nothing up front. A trailing record that was
+    only partially written is ignored. Session markers are records too,
+    see is_session.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Map the log into memory.
+
+        Args:
+            path (str): The file to read.
+
+        Raises:
+            ValueError: If the file is not an event log.
+        """
+        check_header(path)
+
+        with open(path, "rb") as raw:
+            self._map = mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.count: int = (len(self._map) - HEADER.size) // RECORD.size
+
+    def __len__(self) -> int:
+        """
+        Get the amount of complete records.
+
+        Returns:
+            int: The number of events in the log.
+        """
+        return self.count
+
+    def __getitem__(self, index: int) -> Event:
+        """
+        Read one record.
+
+        Args:
+            index (int): The position of the record, negative counts from the end.
+
+        Returns:
+            Event: The recorded event.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        if index < 0:
+            index += self.count
+
+        if not 0 <= index < self.count:
+            raise IndexError("Event log index out of range")
+
+        timestamp, type, kind, code, x, y = RECORD.unpack_from(
+            self._map, HEADER.size + index * RECORD.size
+        )
+        return Event(type, kind, code, x, y, timestamp)
+
+    def __iter__(self) -> Iterator[Event]:
+        """
+        Iterate over every record in order.
+
+        Yields:
+            Event: Each recorded event.
+        """
+        end = HEADER.size + self.count * RECORD.size
+
+        with memoryview(self._map) as view:
+            for timestamp, type, kind, code, x, y in RECORD.iter_unpack(view[HEADER.size:end]):
+                yield Event(type, kind, code, x, y, timestamp)
+
+    def duration(self) -> float:
+        """
+        Get the time between the first and the last record.
+
+        The gaps between sessions are left out, as they are when playing.
+
+        Returns:
+            float: The length of the recording in seconds.
+        """
+        offset = 0.0
+
+        for offset, _, _ in steps(self):
+            pass
+
+        return offset
+
+    def close(self) -> None:
+        """
+        Unmap the log.
+        """
+        self._map.close()
+
+
+def is_session(event: Event) -> bool:
+    """
+    Check whether a record is the marker starting a recording session.
+
+    Args:
+        event (Event): The recorded event.
+
+    Returns:
+        bool: True if the record starts a session.
+    """
+    return (event.type, event.kind) == SESSION
+
+
+def steps(log: EventLog) -> Iterator[Tuple[float, int, Event]]:
+    """
+    Turn recorded events into timed steps relative to the first one.
+
+    Each session marker restarts the clock, so a session follows the
+    previous one right after its last event, whatever clock it was
+    recorded against. Markers themselves are not yielded.
+
+    Args:
+        log (EventLog): The recorded session.
+
+    Yields:
+        Tuple[float, int, Event]: Offset in seconds, event kind and event.
+    """
+    start: Optional[int] = None
+    elapsed = 0.0
+    offset = 0.0
+
+    for event in log:
+        if is_session(event):
+            start = None
+            elapsed = offset
+            continue
+
+        if start is None:
+            start = event.timestamp
+
+        offset = elapsed + (event.timestamp - start) / 1e9
+        yield offset, event.kind, event
+
+
+def replay(
+    log: EventLog,
+    keyboard: KeyboardBackend,
+    mouse: MouseBackend,
+    speed: float = 1.0
+) -> None:
+    """
+    Replay a recorded session through the callbacks of two backends.
+
+    Recorded codes are passed as keys and buttons, so the backends are
+    expected to use wire codes, as the synthetic backends do. Feeding
+    their callbacks puts the replay through the whole capture pipeline of
+    the adapter and whatever transport it runs on.
+
+    Args:
+        log (EventLog): The recorded session.
+        keyboard (KeyboardBackend): The keyboard whose callbacks are fed.
+        mouse (MouseBackend): The mouse whose callbacks are fed.
+        speed (float): Time scale, 1.0 keeps the original timing, 2.0 plays
+            twice as fast and 0 plays at maximum speed.
+    """
+    def emit(kind: int, event: Event) -> None:
+        match kind:
+            case EventKind.KEY_PRESS:
+                keyboard.on_press(event.code)
+
+            case EventKind.KEY_RELEASE:
+                keyboard.on_release(event.code)
+
+            case EventKind.MOVE:
+                mouse.on_move(event.x, event.y)
+
+            case EventKind.BUTTON_PRESS | EventKind.BUTTON_RELEASE:
+                mouse.on_click(event.x, event.y, event.code, kind == EventKind.BUTTON_PRESS)
+
+            case EventKind.SCROLL:
+                mouse.on_scroll(0, 0, event.x, event.y)
+
+    play(steps(log), speed, emit)
@@ -0,0 +1,225 @@
+"""Ring pipeline module for passing input records between processes."""
+from typing import Any, Optional, Tuple
+from multiprocessing import shared_memory
+import struct
+import time
+
+
+COUNTER = struct.Struct("=Q")
+RECORD = struct.Struct("=BBxxIiiii")
+
+HEAD = 0
+SLOTS = 8
+TAIL = 64
+SLEEPING = 72
+DATA = 128
+
+RECHECK = 0.05
+SPIN = 0.001
+BLOCK_TIMEOUT = 1.0
+RESERVE = 4
+
+Record = Tuple[int, int, int, int, int, int, int]
+
+
+def attach_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Open a shared memory block created by another process.
+
+    The block is left out of this process' resource tracking, so only
+    its creator removes it.
+
+    Args:
+        name (str): The name of the block.
+
+    Returns:
+        shared_memory.SharedMemory: The attached block.
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+
+    except TypeError:
+        return shared_memory.SharedMemory(name)
+
+
+class EventRing:
+    """
+    Single-producer, single-consumer ring of fixed-size input records.
+
+    Records live in a shared memory block so two processes can exchange
+    them without pickling, sockets or locks. The producer owns the head
+    counter and the consumer the tail counter, each on its own cache
+    line, and every slot holds one RECORD: the event type and kind, a
+    code and four integers. Records that may be lost are dropped once the
+    ring is all but one RESERVE-th full, which keeps that last part free
+    for records that must not be lost, such as key and button releases.
+    Only when even that part is full does the producer of such a record
+    wait, SPIN seconds at a time and for at most BLOCK_TIMEOUT seconds,
+    for the consumer to make room.
+
+    A consumer that finds the ring empty raises a sleeping flag and waits
+    on the wakeup semaphore, which the producer releases when it sees the
+    flag, so an idle consumer costs nothing and a busy one never touches
+    the semaphore. The ring is checked again every RECHECK seconds anyway,
+    so a wakeup lost to the flag and the counter being seen out of order
+    only delays a record.
+    """
+
+    def __init__(
+        self,
+        slots: int = 4096,
+        wakeup: Any = None,
+        name: Optional[str] = None
+    ) -> None:
+        """
+        Create a ring, or attach to one created by another process.
+
+        Args:
+            slots (int): Records the ring holds, rounded up to a power of
+                two. Ignored when attaching.
+            wakeup (Any): Semaphore shared by both processes, such as a
+                multiprocessing Semaphore starting at zero.
+            name (Optional[str]): Name of the ring to attach to, None to create one.
+        """
+        if name is None:
+            slots = 1 << max(slots - 1, 1).bit_length()
+            self.memory = shared_memory.SharedMemory(create=True, size=DATA + slots * RECORD.size)
+            self.memory.buf[:DATA] = bytes(DATA)
+            COUNTER.pack_into(self.memory.buf, SLOTS, slots)
+        else:
+            self.memory = attach_memory(name)
+
+        self.buffer: memoryview = self.memory.buf
+        self.slots: int = COUNTER.unpack_from(self.buffer, SLOTS)[0]
+        self.wakeup: Any = wakeup
+        self.owner: bool = name is None
+        self.dropped: int = 0
+        self.expired: int = 0
+
+        self._mask: int = self.slots - 1
+        self._lossy: int = self.slots - self.slots // RESERVE
+        self._head: int = COUNTER.unpack_from(self.buffer, HEAD)[0]
+        self._tail: int = COUNTER.unpack_from(self.buffer, TAIL)[0]
+
+    @property
+    def name(self) -> str:
+        """
+        Get the name other processes attach to.
+
+        Returns:
+            str: The name of the shared memory block.
+        """
+        return self.memory.name
+
+    def put(
+        self,
+        type: int,
+        kind: int,
+        code: int = 0,
+        x: int = 0,
+        y: int = 0,
+        extra_x: int = 0,
+        extra_y: int = 0,
+        block: bool = False
+    ) -> bool:
+        """
+        Append a record. Only the producer may call this.
+
+        Args:
+            type (int): The device of the event (see EventType).
+            kind (int): The action of the event (see EventKind).
+            code (int): Key or button code.
+            x (int): First coordinate of the event.
+            y (int): Second coordinate of the event.
+            extra_x (int): Horizontal scroll amount.
+            extra_y (int): Vertical scroll amount.
+            block (bool): Whether the record must not be lost: it may use
+                the reserved part of the ring, and waits up to BLOCK_TIMEOUT
+                seconds for room once the whole ring is full.
+
+        Returns:
+            bool: False if the record was dropped, or given up on after
+            waiting.
+        """
+        buffer = self.buffer
+        head = self._head
+        limit = self.slots if block else self._lossy
+        deadline = None
+
+        while head - COUNTER.unpack_from(buffer, TAIL)[0] >= limit:
+            if not block:
+                self.dropped += 1
+                return False
+
+            if deadline is None:
+                deadline = time.monotonic() + BLOCK_TIMEOUT
+
+            elif time.monotonic() >= deadline:
+                self.expired += 1
+                return False
+
+            time.sleep(SPIN)
+
+        RECORD.pack_into(
+            buffer, DATA + (head & self._mask) * RECORD.size,
+            type, kind, code, x, y, extra_x, extra_y
+        )
+        self._head = head + 1
+        COUNTER.pack_into(buffer, HEAD, head + 1)
+
+        if buffer[SLEEPING]:
+            buffer[SLEEPING] = 0
+            self.wakeup.release()
+
+        return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Record]:
+        """
+        Take the oldest record. Only the consumer may call this.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for a record, 0 to not
+                wait and None to wait for as long as it takes.
+
+        Returns:
+            Optional[Record]: The record, or None if none arrived in time.
+        """
+        buffer = self.buffer
+        tail = self._tail
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while tail == COUNTER.unpack_from(buffer, HEAD)[0]:
+            remaining = RECHECK if deadline is None else deadline - time.monotonic()
+
+            if remaining <= 0:
+                return None
+
+            buffer[SLEEPING] = 1
+
+            if tail == COUNTER.unpack_from(buffer, HEAD)[0]:
+                self.wakeup.acquire(timeout=min(remaining, RECHECK))
+
+            buffer[SLEEPING] = 0
+
+        record = RECORD.unpack_from(buffer, DATA + (tail & self._mask) * RECORD.size)
+        self._tail = tail + 1
+        COUNTER.pack_into(buffer, TAIL, tail + 1)
+        return record
+
+    def __len__(self) -> int:
+        """
+        Get the number of records waiting.
+
+        Returns:
+            int: The amount of records written and not read yet.
+        """
+        return COUNTER.unpack_from(self.buffer, HEAD)[0] - COUNTER.unpack_from(self.buffer, TAIL)[0]
+
+    def close(self) -> None:
+        """
+        Detach from the ring, removing it if this process created it.
+        """
+        self.memory.close()
+
+        if self.owner:
+            self.memory.unlink()
@@ -0,0 +1,163 @@
+"""Routing pipeline module for choosing which targets receive captured events."""
+from typing import Iterable, Optional, Set, Tuple
+from src.backends.keycodes import SPECIAL_CODES
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+ROUTING_MODES = ("active", "broadcast")
+
+
+def parse_hotkey(names: Iterable[str]) -> Tuple[int, ...]:
+    """
+    Convert key names into the wire codes of a hotkey.
+
+    Args:
+        names (Iterable[str]): Special key names from KEY_NAMES, or single
+            characters, with the trigger key last.
+
+    Returns:
+        Tuple[int, ...]: The key codes, in the same order.
+
+    Raises:
+        ValueError: If a name is neither a special key nor a single character.
+    """
+    codes = []
+
+    for name in names:
+        if name in SPECIAL_CODES:
+            codes.append(SPECIAL_CODES[name])
+        elif len(name) == 1:
+            codes.append(ord(name))
+        else:
+            raise ValueError(f"Unknown hotkey key {name!r}")
+
+    return tuple(codes)
+
+
+class Router:
+    """
+    Chooses the targets every captured event is sent to.
+
+    In active mode events only reach the selected target, and in
+    broadcast mode they reach all of them. Two hotkeys change the route:
+    one selects the next target, the other toggles broadcasting. A hotkey
+    fires when its last key is pressed while the others are held, and the
+    keys it is made of are tracked here on their own, so a hotkey can be
+    repeated while its modifiers stay down, while auto-repeat of a held
+    trigger never fires it twice.
+    """
+
+    def __init__(
+        self,
+        targets: int,
+        mode: str = "active",
+        switch: Tuple[int, ...] = (),
+        broadcast: Tuple[int, ...] = ()
+    ) -> None:
+        """
+        Initialize the router.
+
+        Args:
+            targets (int): The amount of targets to route to.
+            mode (str): The starting mode, one of ROUTING_MODES.
+            switch (Tuple[int, ...]): Key codes of the hotkey selecting the
+                next target, empty to disable it.
+            broadcast (Tuple[int, ...]): Key codes of the hotkey toggling
+                broadcast mode, empty to disable it.
+
+        Raises:
+            ValueError: If the mode is unknown or there are no targets.
+        """
+        if mode not in ROUTING_MODES:
+            raise ValueError(f"Unknown routing mode {mode!r}")
+
+        if targets < 1:
+            raise ValueError("Routing needs at least one target")
+
+        self.count: int = targets
+        self.active: int = 0
+        self.broadcasting: bool = mode == "broadcast"
+        self.switch: Tuple[int, ...] = switch
+        self.broadcast: Tuple[int, ...] = broadcast
+        self.switches: int = 0
+
+        self._all: Tuple[int, ...] = tuple(range(targets))
+        self._watched: Set[int] = set(switch) | set(broadcast)
+        self._held: Set[int] = set()
+
+    def targets(self) -> Tuple[int, ...]:
+        """
+        Get the targets events are currently sent to.
+
+        Returns:
+            Tuple[int, ...]: Positions of the targets in the pool.
+        """
+        return self._all if self.broadcasting else (self.active,)
+
+    def select(self, index: int) -> None:
+        """
+        Send events to one target only.
+
+        Args:
+            index (int): Position of the target in the pool.
+
+        Raises:
+            IndexError: If there is no such target.
+        """
+        if not 0 <= index < self.count:
+            raise IndexError("Routing target out of range")
+
+        self.active = index
+        self.broadcasting = False
+        self.switches += 1
+        logger.info("Routing events to target %d", index)
+
+    def next(self) -> None:
+        """
+        Send events to the target after the active one, wrapping around.
+
+        Leaving broadcast mode keeps the active target instead.
+        """
+        self.select(self.active if self.broadcasting else (self.active + 1) % self.count)
+
+    def toggle(self) -> None:
+        """
+        Switch between broadcast mode and the active target.
+        """
+        self.broadcasting = not self.broadcasting
+        self.switches += 1
+        logger.info(
+            "Routing events to %s", "every target" if self.broadcasting else f"target {self.active}"
+        )
+
+    def hotkey(self, code: int, pressed: bool) -> Optional[str]:
+        """
+        Follow a key change and check whether it completes a hotkey.
+
+        The route is not changed here, so the caller can finish with the
+        current targets first.
+
+        Args:
+            code (int): The key code.
+            pressed (bool): True for a press, False for a release.
+
+        Returns:
+            Optional[str]: "switch" or "broadcast" when the press completes
+            that hotkey, None otherwise.
+        """
+        if code not in self._watched or pressed and code in self._held:
+            return None
+
+        if not pressed:
+            self._held.discard(code)
+            return None
+
+        self._held.add(code)
+
+        for action, keys in (("switch", self.switch), ("broadcast", self.broadcast)):
+            if keys and code == keys[-1] and self._held.issuperset(keys):
+                return action
+
+        return None
@@ -0,0 +1,150 @@
+"""Screens pipeline module for switching targets at the edges of their screens."""
+from typing import List, Optional, Sequence, Tuple
+
+
+Rect = Tuple[int, int, int, int]
+Size = Tuple[int, int]
+
+LEFT, RIGHT, TOP, BOTTOM = range(4)
+
+
+class ScreenLayout:
+    """
+    Cached geometry of the target screens, placed side by side.
+
+    Every target owns a rectangle (x, y, width, height) of a virtual
+    desktop, the way monitors are arranged, and the local screen stands
+    for whichever target is active: local positions are scaled onto its
+    rectangle. When the pointer reaches a local edge, the target sharing
+    that edge at the same point becomes active and the pointer lands at
+    the matching point just inside the far edge of its screen.
+
+    The neighbour along every edge of every screen is worked out once, in
+    a table indexed by the position along the edge, so checking a move
+    costs a few comparisons and at most one lookup.
+    """
+
+    def __init__(self, screens: Sequence[Rect], local: Size, margin: int = 2) -> None:
+        """
+        Initialize the layout and precompute the edge tables.
+
+        Args:
+            screens (Sequence[Rect]): The rectangle of every target, in pool order.
+            local (Size): Width and height of the local screen.
+            margin (int): Local pixels between the landing point and the edge,
+                so landing never counts as crossing back.
+
+        Raises:
+            ValueError: If a screen or the local size is empty.
+        """
+        if any(width <= 0 or height <= 0 for _, _, width, height in screens):
+            raise ValueError("Screens must have a positive width and height")
+
+        if local[0] <= 2 * margin or local[1] <= 2 * margin:
+            raise ValueError("Local screen is too small")
+
+        self.screens: Tuple[Rect, ...] = tuple(screens)
+        self.width: int = local[0]
+        self.height: int = local[1]
+        self.margin: int = margin
+        self.crossings: int = 0
+
+        self._scales: Tuple[Tuple[float, float], ...] = tuple(
+            (width / self.width, height / self.height) for _, _, width, height in screens
+        )
+        self._edges: Tuple[Tuple[Tuple[int, ...], ...], ...] = tuple(
+            self._neighbours(index) for index in range(len(screens))
+        )
+
+    def translate(self, index: int, x: int, y: int) -> Tuple[int, int]:
+        """
+        Scale a local position onto the screen of a target.
+
+        Args:
+            index (int): Position of the target in the pool.
+            x (int): Local X coordinate.
+            y (int): Local Y coordinate.
+
+        Returns:
+            Tuple[int, int]: The matching position on the target screen.
+        """
+        scale_x, scale_y = self._scales[index]
+        return int(x * scale_x), int(y * scale_y)
+
+    def cross(self, index: int, x: int, y: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Check whether a local position leaves the active screen for another.
+
+        Args:
+            index (int): Position of the active target in the pool.
+            x (int): Local X coordinate.
+            y (int): Local Y coordinate.
+
+        Returns:
+            Optional[Tuple[int, int, int]]: The target entered and the local
+            position the pointer lands at, or None if no edge was crossed.
+        """
+        if x <= 0:
+            edge, along = LEFT, y
+        elif x >= self.width - 1:
+            edge, along = RIGHT, y
+        elif y <= 0:
+            edge, along = TOP, x
+        elif y >= self.height - 1:
+            edge, along = BOTTOM, x
+        else:
+            return None
+
+        table = self._edges[index][edge]
+        scale = self._scales[index][1 if edge < TOP else 0]
+        offset = min(int(along * scale), len(table) - 1)
+        entered = table[offset]
+
+        if entered < 0:
+            return None
+
+        self.crossings += 1
+        left, top, _, _ = self.screens[index]
+        other_left, other_top, _, _ = self.screens[entered]
+        other_x, other_y = self._scales[entered]
+
+        if edge < TOP:
+            landing = int((top + offset - other_top) / other_y)
+            return entered, self.width - 1 - self.margin if edge == LEFT else self.margin, landing
+
+        landing = int((left + offset - other_left) / other_x)
+        return entered, landing, self.height - 1 - self.margin if edge == TOP else self.margin
+
+    def _neighbours(self, index: int) -> Tuple[Tuple[int, ...], ...]:
+        """
+        Build the neighbour tables of the four edges of a screen.
+
+        Args:
+            index (int): Position of the screen in the layout.
+
+        Returns:
+            Tuple[Tuple[int, ...], ...]: For the left, right, top and bottom
+            edges, the screen across every point of the edge, -1 for none.
+        """
+        left, top, width, height = self.screens[index]
+        tables: List[List[int]] = [[-1] * height, [-1] * height, [-1] * width, [-1] * width]
+
+        for other, (other_left, other_top, other_width, other_height) in enumerate(self.screens):
+            if other == index:
+                continue
+
+            if other_left + other_width == left or other_left == left + width:
+                edge = LEFT if other_left + other_width == left else RIGHT
+                start = max(top, other_top) - top
+                end = min(top + height, other_top + other_height) - top
+            elif other_top + other_height == top or other_top == top + height:
+                edge = TOP if other_top + other_height == top else BOTTOM
+                start = max(left, other_left) - left
+                end = min(left + width, other_left + other_width) - left
+            else:
+                continue
+
+            for offset in range(start, end):
+                tables[edge][offset] = other
+
+        return tuple(tuple(table) for table in tables)
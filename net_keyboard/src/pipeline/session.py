@@ -0,0 +1,214 @@
+"""Session pipeline module for resuming a dropped connection without losing events."""
+from typing import Deque, List, Tuple, Union
+from collections import deque
+from src.tcp.protocol import PREFIX, Event, EventKind, EventType
+import threading
+import logging
+import struct
+import time
+import os
+
+
+logger = logging.getLogger(__name__)
+
+SEQUENCE = struct.Struct("!I")
+TOKEN_SIZE = 8
+SEQUENCED_KINDS = frozenset((
+    EventKind.KEY_PRESS,
+    EventKind.KEY_RELEASE,
+    EventKind.BUTTON_PRESS,
+    EventKind.BUTTON_RELEASE
+))
+
+
+def sequence(frame: bytes, number: int) -> bytes:
+    """
+    Append a sequence number to the end of an encoded frame.
+
+    Any payload already in the frame, such as a trace stamp, is kept in
+    front of the number.
+
+    Args:
+        frame (bytes): The encoded frame.
+        number (int): The sequence number of the event.
+
+    Returns:
+        bytes: The frame with the number at the end of its payload.
+    """
+    numbered = bytearray(frame)
+    PREFIX.pack_into(numbered, 0, len(frame) - PREFIX.size + SEQUENCE.size)
+    numbered += SEQUENCE.pack(number)
+    return bytes(numbered)
+
+
+def sequenced(event: Event) -> bool:
+    """
+    Check whether an event is numbered within a session.
+
+    Only discrete events are numbered, as they are the ones replayed.
+
+    Args:
+        event (Event): The decoded event.
+
+    Returns:
+        bool: True for key and button events.
+    """
+    return event.type != EventType.CONTROL and event.kind in SEQUENCED_KINDS
+
+
+def sequence_of(event: Event) -> int:
+    """
+    Read the sequence number at the end of a numbered event.
+
+    Args:
+        event (Event): The decoded event.
+
+    Returns:
+        int: The sequence number, 0 if the event carries none.
+    """
+    if len(event.payload) < SEQUENCE.size:
+        return 0
+
+    (number,) = SEQUENCE.unpack_from(event.payload, len(event.payload) - SEQUENCE.size)
+    return number
+
+
+class SessionLog:
+    """
+    Server side of a resumable session.
+
+    Discrete frames are numbered as they are sent and kept in a ring for a
+    limited time, so that after a reconnect whatever the client missed can
+    be sent again. The session is identified by a random token, sent to
+    every client as soon as it connects. Until the client answers with
+    the token it knew and the last number it received, frames are held
+    back, so replayed and new frames reach it in order.
+
+    Two locks are used, always taken in this order: ``order`` keeps
+    numbering and queueing of a frame atomic, so frames reach the
+    connection in sequence, and ``lock`` guards the connection itself
+    while it is written to or replaced.
+    """
+
+    def __init__(self, window: float = 2.0, size: int = 1024) -> None:
+        """
+        Initialize the session.
+
+        Args:
+            window (float): Seconds a sent frame can still be replayed.
+            size (int): Maximum frames kept for replay.
+        """
+        self.window: float = window
+        self.token: bytes = os.urandom(TOKEN_SIZE)
+        self.number: int = 0
+        self.accepted: int = 0
+        self.ready: bool = False
+        self.replayed: int = 0
+        self.missed: int = 0
+        self.order = threading.Lock()
+        self.lock = threading.Lock()
+
+        self._ring: Deque[Tuple[int, float, bytes]] = deque(maxlen=size)
+
+    def append(self, frame: bytes) -> bytes:
+        """
+        Number a discrete frame and keep it for replay.
+
+        Must be called with ``order`` held, until the frame is queued.
+
+        Args:
+            frame (bytes): The encoded frame.
+
+        Returns:
+            bytes: The numbered frame to send.
+        """
+        self.number += 1
+        numbered = sequence(frame, self.number)
+        self._ring.append((self.number, time.monotonic(), numbered))
+        return numbered
+
+    def since(self, number: int) -> List[bytes]:
+        """
+        Get the kept frames numbered after a given one.
+
+        Must be called with ``order`` held. Frames older than the window
+        are not replayed. When some of the frames the client missed are no
+        longer kept, the gap is counted and logged.
+
+        Args:
+            number (int): The last sequence number the client received.
+
+        Returns:
+            List[bytes]: The frames to send again, in order.
+        """
+        horizon = time.monotonic() - self.window
+        frames = [
+            frame for sent_number, sent, frame in self._ring
+            if sent_number > number and sent >= horizon
+        ]
+        lost = self.number - number - len(frames)
+
+        if lost > 0:
+            self.missed += lost
+            logger.warning("Session resumed with %d events no longer kept for replay", lost)
+
+        self.replayed += len(frames)
+        return frames
+
+    def resume(self, token: Union[bytes, memoryview], number: int) -> List[bytes]:
+        """
+        Get the frames to send to a client that just greeted the server.
+
+        A client of this session gets everything after the last frame it
+        received. Any other client gets what was sent since its connection
+        was accepted.
+
+        Must be called with both locks held.
+
+        Args:
+            token (Union[bytes, memoryview]): The session token the client knows.
+            number (int): The last sequence number the client received.
+
+        Returns:
+            List[bytes]: The frames to send again, in order.
+        """
+        if bytes(token) != self.token:
+            number = self.accepted
+
+        return self.since(number)
+
+
+class Backoff:
+    """
+    Exponential backoff between reconnection attempts.
+
+    The first retry comes quickly, so a short drop costs little, and the
+    delay doubles up to a maximum while the server stays unreachable.
+    """
+
+    def __init__(self, initial: float = 0.05, maximum: float = 5.0, factor: float = 2.0) -> None:
+        """
+        Initialize the backoff.
+
+        Args:
+            initial (float): Seconds before the first retry.
+            maximum (float): Longest wait between retries.
+            factor (float): Growth of the wait after every failed attempt.
+        """
+        self.initial: float = initial
+        self.maximum: float = maximum
+        self.factor: float = factor
+        self.attempts: int = 0
+
+    def wait(self) -> None:
+        """
+        Sleep before the next attempt and grow the delay.
+        """
+        time.sleep(min(self.initial * self.factor ** self.attempts, self.maximum))
+        self.attempts += 1
+
+    def reset(self) -> None:
+        """
+        Start over from the initial delay after a successful attempt.
+        """
+        self.attempts = 0
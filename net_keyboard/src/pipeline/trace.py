@@ -0,0 +1,323 @@
+"""Trace module for measuring per-stage event latency between both peers."""
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import deque
+from src.tcp.protocol import FRAME_SIZE, PREFIX, Event, EventKind, EventType, encode
+import threading
+import struct
+import json
+import time
+
+
+STAMP = struct.Struct("!Q")
+
+SUB_BITS = 3
+SUB_BUCKETS = 1 << SUB_BITS
+BUCKETS = 200
+
+SYNC_SAMPLES = 8
+SYNC_SPACING = 0.05
+SYNC_INTERVAL = 30.0
+
+STAGES: Tuple[str, ...] = ("capture_send", "network", "receive_inject", "inject", "total")
+PERCENTILES: Tuple[Tuple[str, float], ...] = (("p50", 0.50), ("p99", 0.99))
+
+
+def stamp(frame: bytes, timestamp: int = 0) -> bytes:
+    """
+    Put a send timestamp in front of the payload of an encoded frame.
+
+    Whatever payload the frame already carries, such as a session sequence
+    number, is kept after the timestamp.
+
+    Args:
+        frame (bytes): The encoded frame.
+        timestamp (int): Monotonic send time in nanoseconds. When zero, the
+            current monotonic time is used.
+
+    Returns:
+        bytes: The frame with the timestamp at the start of its payload.
+    """
+    stamped = bytearray(frame[:FRAME_SIZE])
+    PREFIX.pack_into(stamped, 0, len(frame) - PREFIX.size + STAMP.size)
+    stamped += STAMP.pack(timestamp or time.monotonic_ns())
+    stamped += frame[FRAME_SIZE:]
+    return bytes(stamped)
+
+
+def stamp_frames(packet: bytes, timestamp: int = 0) -> bytes:
+    """
+    Stamp every input frame of a packet with the same send time.
+
+    Control frames are left as they are, since their payload has a meaning
+    of its own.
+
+    Args:
+        packet (bytes): One or more encoded frames, back to back.
+        timestamp (int): Monotonic send time in nanoseconds. When zero, the
+            current monotonic time is used.
+
+    Returns:
+        bytes: The packet with its input frames stamped.
+    """
+    timestamp = timestamp or time.monotonic_ns()
+    frames: List[bytes] = []
+    offset = 0
+
+    while offset < len(packet):
+        (length,) = PREFIX.unpack_from(packet, offset)
+        end = offset + PREFIX.size + length
+        frame = packet[offset:end]
+
+        if frame[PREFIX.size] != EventType.CONTROL:
+            frame = stamp(frame, timestamp)
+
+        frames.append(frame)
+        offset = end
+
+    return b"".join(frames)
+
+
+class Histogram:
+    """
+    Fixed-size latency histogram in microseconds.
+
+    Buckets are log-linear: each power of two is split into eight equal
+    buckets, which keeps percentiles within about 12% of the real value
+    with a fixed list of counters and no allocation per sample.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty histogram.
+        """
+        self.counts: List[int] = [0] * BUCKETS
+        self.count: int = 0
+        self.max: int = 0
+
+    @staticmethod
+    def bucket(value: int) -> int:
+        """
+        Get the bucket index of a value.
+
+        Args:
+            value (int): The value in microseconds.
+
+        Returns:
+            int: The index of the bucket holding the value.
+        """
+        if value < 2 * SUB_BUCKETS:
+            return max(value, 0)
+
+        shift = value.bit_length() - SUB_BITS - 1
+        return min(SUB_BUCKETS * shift + (value >> shift), BUCKETS - 1)
+
+    @staticmethod
+    def upper(index: int) -> int:
+        """
+        Get the highest value that falls into a bucket.
+
+        Args:
+            index (int): The bucket index.
+
+        Returns:
+            int: The upper bound of the bucket in microseconds.
+        """
+        if index < 2 * SUB_BUCKETS:
+            return index
+
+        shift = index // SUB_BUCKETS - 1
+        return ((index % SUB_BUCKETS + SUB_BUCKETS + 1) << shift) - 1
+
+    def add(self, nanoseconds: int) -> None:
+        """
+        Record a sample.
+
+        Args:
+            nanoseconds (int): The measured latency in nanoseconds.
+        """
+        value = nanoseconds // 1000
+        self.counts[self.bucket(value)] += 1
+        self.count += 1
+
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> int:
+        """
+        Get the value below which a fraction of the samples fall.
+
+        Args:
+            fraction (float): The percentile as a fraction between 0 and 1.
+
+        Returns:
+            int: The upper bound of the matching bucket in microseconds,
+            capped at the highest sample, or 0 if there are no samples.
+        """
+        if not self.count:
+            return 0
+
+        target = fraction * self.count
+        seen = 0
+
+        for index, count in enumerate(self.counts):
+            seen += count
+
+            if seen >= target:
+                return min(self.upper(index), self.max)
+
+        return self.max
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Summarize the histogram.
+
+        Returns:
+            Dict[str, int]: The sample count, percentiles and maximum.
+        """
+        summary = {"count": self.count}
+        summary.update({name: self.percentile(fraction) for name, fraction in PERCENTILES})
+        summary["max"] = self.max
+        return summary
+
+
+class Tracer:
+    """
+    Client-side latency tracer.
+
+    The server stamps every event at capture, in the frame header, and at
+    send, in front of the payload by ``stamp``. The client stamps the batch
+    at receive and each event around injection. A small NTP-style exchange
+    of ping and pong control events estimates the offset between both
+    monotonic clocks, keeping the sample with the lowest round trip among
+    the latest ones, so server stamps can be compared with local ones.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the tracer with empty histograms.
+        """
+        self.stages: Dict[str, Histogram] = {name: Histogram() for name in STAGES}
+        self.offset: Optional[int] = None
+        self.rtt: Optional[int] = None
+        self.lock = threading.Lock()
+
+        self._samples: Deque[Tuple[int, int]] = deque(maxlen=SYNC_SAMPLES)
+
+    def ping(self) -> bytes:
+        """
+        Build a clock synchronization request.
+
+        Returns:
+            bytes: A ping control frame carrying the local send time.
+        """
+        return encode(
+            EventType.CONTROL, EventKind.PING, payload=STAMP.pack(time.monotonic_ns())
+        )
+
+    def control(self, event: Event, received: int) -> None:
+        """
+        Handle a control event addressed to the tracer.
+
+        Args:
+            event (Event): The control event.
+            received (int): Monotonic time the event was received.
+        """
+        if event.kind != EventKind.PONG or len(event.payload) < STAMP.size:
+            return
+
+        (sent,) = STAMP.unpack_from(event.payload)
+        rtt = received - sent
+
+        with self.lock:
+            self._samples.append((rtt, event.timestamp - (sent + received) // 2))
+            self.rtt, self.offset = min(self._samples)
+
+    def record(self, event: Event, received: int, start: int, end: int) -> None:
+        """
+        Record the stage latencies of an injected event.
+
+        Args:
+            event (Event): The injected event.
+            received (int): Monotonic time the batch was received.
+            start (int): Monotonic time injection started.
+            end (int): Monotonic time injection finished.
+        """
+        with self.lock:
+            self.stages["receive_inject"].add(start - received)
+            self.stages["inject"].add(end - start)
+
+            if len(event.payload) >= STAMP.size:
+                (sent,) = STAMP.unpack_from(event.payload)
+                self.stages["capture_send"].add(sent - event.timestamp)
+
+                if self.offset is not None:
+                    self.stages["network"].add(received - (sent - self.offset))
+
+            if self.offset is not None:
+                self.stages["total"].add(end - (event.timestamp - self.offset))
+
+    def snapshot(self) -> Dict:
+        """
+        Get the current latency statistics.
+
+        Returns:
+            Dict: Clock offset and round trip in nanoseconds, and per stage
+            the sample count, p50, p99 and maximum in microseconds.
+        """
+        with self.lock:
+            return {
+                "offset_ns": self.offset,
+                "rtt_ns": self.rtt,
+                "stages": {name: histogram.summary() for name, histogram in self.stages.items()}
+            }
+
+    def dump(self, path: str) -> None:
+        """
+        Write the current statistics to a JSON file.
+
+        Args:
+            path (str): The file to write.
+        """
+        with open(path, "w") as raw:
+            json.dump(self.snapshot(), fp=raw, indent=2)
+
+    def start(self, path: str, interval: float = 5.0) -> None:
+        """
+        Periodically write the statistics to a file in a background thread.
+
+        Args:
+            path (str): The file to write.
+            interval (float): Seconds between writes.
+        """
+        def write() -> None:
+            while True:
+                time.sleep(interval)
+                self.dump(path)
+
+        threading.Thread(target=write, daemon=True).start()
+
+
+def format_stats(stats: Dict) -> str:
+    """
+    Format latency statistics as a table.
+
+    Args:
+        stats (Dict): Statistics as returned by Tracer.snapshot.
+
+    Returns:
+        str: A human readable table of the stage latencies.
+    """
+    offset, rtt = stats.get("offset_ns"), stats.get("rtt_ns")
+    lines = [
+        "clock offset: " + ("unknown" if offset is None else f"{offset / 1000:.1f} us"),
+        "round trip:   " + ("unknown" if rtt is None else f"{rtt / 1000:.1f} us"),
+        "",
+        f"{'stage':<16}{'count':>10}{'p50 us':>10}{'p99 us':>10}{'max us':>10}"
+    ]
+
+    for name, stage in stats["stages"].items():
+        lines.append(
+            f"{name:<16}{stage['count']:>10}{stage['p50']:>10}{stage['p99']:>10}{stage['max']:>10}"
+        )
+
+    return "\n".join(lines)
@@ -1,8 +1,28 @@
+from .base import MultiPeer
 from .client import BaseClient
 from .server import BaseServer
+from .async_server import AsyncServer
+from .pool import ConnectionPool
+from .udp import UDPClient, UDPServer
+from .local import LocalClient, LocalServer
+from .protocol import Event, EventKind, EventType, FrameDecoder, encode
+from .buffer import ReceiveBuffer
 
 
 __all__ = [
+    "AsyncServer",
     "BaseClient",
-    "BaseServer"
+    "BaseServer",
+    "ConnectionPool",
+    "Event",
+    "EventKind",
+    "EventType",
+    "FrameDecoder",
+    "LocalClient",
+    "LocalServer",
+    "MultiPeer",
+    "ReceiveBuffer",
+    "UDPClient",
+    "UDPServer",
+    "encode"
 ]
@@ -0,0 +1,288 @@
+"""Asyncio server module for feeding many TCP clients at once."""
+from typing import Dict, List, Optional, Tuple, Union
+from src.tcp.base import TCP, MultiPeer, Peer
+from src.tcp.fanout import BEHIND, DROPPED, PeerQueue
+from src.tcp.options import SocketOptions, apply_socket_options, report_options
+import asyncio
+import threading
+import logging
+import queue
+
+
+logger = logging.getLogger(__name__)
+
+
+Address = Tuple[str, int]
+
+
+class AsyncServer(TCP, MultiPeer):
+    """
+    Asyncio-based TCP server that fans events out to many clients.
+
+    The event loop runs in a single background thread that keeps accepting
+    connections. Every client gets its own bounded write queue, so a slow
+    subscriber only delays itself, and packets sent from any thread are
+    broadcast to all connected clients. A full queue is handled by the
+    overflow policy, as described in PeerQueue.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None,
+        queue_size: int = 1024,
+        overflow: str = "drop"
+    ) -> None:
+        """
+        Initialize the asyncio server and start accepting clients.
+
+        Args:
+            host (str): The hostname or IP address to bind the server to.
+            port (int): The port number to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings, defaults
+                to the low-latency SocketOptions defaults.
+            queue_size (int): Packets buffered per client before the overflow
+                policy applies.
+            overflow (str): What to do when a client's queue is full, one of
+                the lane scheduler OVERFLOW_POLICIES.
+        """
+        self.host: str = host
+        self.port: int = port
+        self.options: SocketOptions = options or SocketOptions()
+        self.queue_size: int = queue_size
+        self.overflow: str = overflow
+        self.clients: Dict[Address, PeerQueue] = {}
+        self.dropped: int = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._server: Optional[asyncio.Server] = None
+        self._inbox: queue.Queue[Tuple[Peer, bytes]] = queue.Queue()
+
+        self.connect()
+
+    def send(self, packet: Union[str, bytes]) -> None:
+        """
+        Broadcast a data packet to every connected client.
+
+        Safe to call from any thread; the packet is handed to the event loop
+        and queued on each client's write queue. Under the block policy the
+        call returns once every client had room for it.
+
+        Args:
+            packet (Union[str, bytes]): The data packet to send as a string or bytes.
+        """
+        if isinstance(packet, str):
+            packet = packet.encode()
+
+        elif not isinstance(packet, bytes):
+            raise TypeError("Invalid data type, cannot be sent over the network")
+
+        if self.overflow == "block":
+            asyncio.run_coroutine_threadsafe(self._broadcast_waiting(packet), self._loop).result()
+        else:
+            self._loop.call_soon_threadsafe(self._broadcast, packet)
+
+    def receive(self) -> bytes:
+        """
+        Receive data from any connected client.
+
+        Blocks until one of the clients sends something.
+
+        Returns:
+            bytes: The received data.
+        """
+        while True:
+            _, data = self._inbox.get()
+
+            if data:
+                return data
+
+    def receive_from(self) -> Tuple[Address, bytes]:
+        """
+        Receive data from any connected client, with the client that sent it.
+
+        Returns:
+            Tuple[Address, bytes]: The address of the client and the data,
+            empty once the client disconnected.
+        """
+        return self._inbox.get()
+
+    def reply(self, peer: Address, packet: bytes) -> None:
+        """
+        Send a data packet to a single client.
+
+        Args:
+            peer (Address): The address of the client.
+            packet (bytes): The data packet to send.
+        """
+        self._loop.call_soon_threadsafe(self._queue, peer, packet)
+
+    def connected_peers(self) -> List[Address]:
+        """
+        Get the addresses of the connected clients.
+
+        Returns:
+            List[Address]: The address of every client currently subscribed.
+        """
+        return list(self.clients)
+
+    def close_peer(self, peer: Address) -> None:
+        """
+        Close the connection of a single client.
+
+        Args:
+            peer (Address): The address of the client.
+        """
+        client = self.clients.get(peer)
+
+        if client is not None:
+            self._loop.call_soon_threadsafe(client.close)
+
+    def connect(self) -> None:
+        """
+        Start the event loop thread and bind the listening socket.
+
+        Returns once the server is listening; clients are accepted in the
+        background for the lifetime of the server.
+        """
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    def disconnect(self) -> None:
+        """
+        Close the listening socket and every client connection.
+        """
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def drop(self) -> None:
+        """
+        Close every client connection, keeping the listening socket open.
+        """
+        if self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close_clients)
+
+    def run(self) -> None:
+        """
+        Run the server main loop.
+
+        This method is intended to be implemented by subclasses to define
+        the main server execution logic.
+        """
+        pass
+
+    def subscribers(self) -> int:
+        """
+        Get the number of connected clients.
+
+        Returns:
+            int: The amount of clients currently subscribed.
+        """
+        return len(self.clients)
+
+    def peers(self) -> List[str]:
+        """
+        Get the hosts of the connected clients.
+
+        Returns:
+            List[str]: The address of every client currently subscribed.
+        """
+        return [address[0] for address in list(self.clients)]
+
+    async def _start(self) -> None:
+        """
+        Bind the listening socket and begin accepting clients.
+        """
+        self._server = await asyncio.start_server(
+            self._handle_client,
+            self.host,
+            self.port,
+            reuse_address=self.options.reuse_address
+        )
+
+    async def _stop(self) -> None:
+        """
+        Stop accepting clients and close every open connection.
+        """
+        if self._server is not None:
+            self._server.close()
+            self._server.close_clients()
+            await self._server.wait_closed()
+
+    def _broadcast(self, packet: bytes) -> None:
+        """
+        Queue a packet on every client's write queue.
+
+        Args:
+            packet (bytes): The packet to queue.
+        """
+        for address in list(self.clients):
+            self._queue(address, packet)
+
+    async def _broadcast_waiting(self, packet: bytes) -> None:
+        """
+        Queue a packet on every client's write queue, waiting for room in each.
+
+        Args:
+            packet (bytes): The packet to queue.
+        """
+        for address in list(self.clients):
+            client = self.clients.get(address)
+
+            if client is not None:
+                await client.room()
+                self._queue(address, packet)
+
+    def _queue(self, address: Address, packet: bytes) -> None:
+        """
+        Queue a packet on the write queue of one client, if still connected.
+
+        A client too far behind to take the packet is disconnected.
+
+        Args:
+            address (Address): The address of the client.
+            packet (bytes): The packet to queue.
+        """
+        client = self.clients.get(address)
+
+        if client is None or client.closed:
+            return
+
+        status = client.put(packet)
+
+        if status == DROPPED:
+            self.dropped += 1
+
+        elif status == BEHIND:
+            logger.warning(
+                "Client %s:%d fell %d packets behind, disconnecting it",
+                address[0], address[1], len(client)
+            )
+            client.close()
+
+    async def _handle_client(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serve a single client until it disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): The client's read stream.
+            writer (asyncio.StreamWriter): The client's write stream.
+        """
+        address: Address = writer.get_extra_info("peername")
+        report_options(address, apply_socket_options(writer.get_extra_info("socket"), self.options))
+        client = PeerQueue(writer, self.queue_size, self.overflow)
+        self.clients[address] = client
+
+        try:
+            await client.serve(reader, lambda data: self._inbox.put((address, data)))
+
+        finally:
+            del self.clients[address]
+            self._inbox.put((address, b""))
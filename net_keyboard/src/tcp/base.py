@@ -1,8 +1,11 @@
 """Base module for TCP communication abstraction."""
-from typing import Union
+from typing import Hashable, List, Tuple, Union
 from abc import ABC, abstractmethod
 
 
+Peer = Hashable
+
+
 class TCP(ABC):
     """
     Abstract base class for TCP communication.
@@ -51,3 +54,59 @@ class TCP(ABC):
         Execute the main communication loop.
         """
         pass
+
+
+class MultiPeer(ABC):
+    """
+    Abstract base class for engines serving several peers at once.
+
+    Received data is tagged with the peer that sent it, so callers can
+    keep state per peer, such as a frame decoder, and answer that peer
+    alone. An empty chunk tells that the peer went away. Engines whose
+    peers may only ever listen set ``silent_peers``, so a peer is only
+    held to a heartbeat once it has answered a ping.
+    """
+
+    silent_peers: bool = False
+
+    @abstractmethod
+    def receive_from(self) -> Tuple[Peer, bytes]:
+        """
+        Receive data from any peer.
+
+        Returns:
+            Tuple[Peer, bytes]: The peer and the data it sent, empty once
+            its connection closed.
+        """
+        pass
+
+    @abstractmethod
+    def reply(self, peer: Peer, packet: bytes) -> None:
+        """
+        Send a data packet to a single peer.
+
+        Args:
+            peer (Peer): The peer, as given by receive_from.
+            packet (bytes): The data packet to send.
+        """
+        pass
+
+    @abstractmethod
+    def connected_peers(self) -> List[Peer]:
+        """
+        Get the peers currently connected.
+
+        Returns:
+            List[Peer]: Every peer with an open connection.
+        """
+        pass
+
+    @abstractmethod
+    def close_peer(self, peer: Peer) -> None:
+        """
+        Close the connection of a single peer.
+
+        Args:
+            peer (Peer): The peer, as given by receive_from.
+        """
+        pass
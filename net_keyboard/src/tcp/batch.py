@@ -0,0 +1,300 @@
+"""Batch module for gathering frames written close together into one send."""
+from typing import Callable, List, Optional
+from src.tcp.options import SocketOptions
+import threading
+import socket
+import time
+
+
+IOV_MAX = 1024
+
+SocketProvider = Callable[[], Optional[socket.socket]]
+
+
+def send_vectored(sock: socket.socket, frames: List[bytes]) -> None:
+    """
+    Write several frames with scatter-gather sends, without joining them.
+
+    Partial sends are resumed from where they stopped, like sendall does.
+    Frames are taken off the front of the list as they are written, and a
+    frame written in part is replaced by its rest, so when a send fails the
+    list holds exactly what is left. Platforms without sendmsg fall back
+    to a single joined sendall, which leaves the list as it was.
+
+    Args:
+        sock (socket.socket): The connected socket.
+        frames (List[bytes]): The frames to write, in order.
+
+    Raises:
+        OSError: If a send fails.
+    """
+    if not hasattr(sock, "sendmsg"):
+        sock.sendall(b"".join(frames))
+        frames.clear()
+        return
+
+    views = [memoryview(frame) for frame in frames]
+    start = 0
+
+    try:
+        while start < len(views):
+            sent = sock.sendmsg(views[start:start + IOV_MAX])
+
+            while sent:
+                if sent >= len(views[start]):
+                    sent -= len(views[start])
+                    start += 1
+                else:
+                    views[start] = views[start][sent:]
+                    sent = 0
+
+    finally:
+        frames[:] = [bytes(view) for view in views[start:]]
+
+
+class FrameBatcher:
+    """
+    Send-side batching of frames into vectored writes.
+
+    A frame written after a whole flush window without any send goes out
+    at once, so an isolated keystroke is never delayed. Frames that
+    follow within the window are kept, and written together in one
+    ``sendmsg`` call once the window closes or the frame count or byte
+    limit is reached, whichever comes first. A background thread closes
+    the windows. Sends happen outside the lock, one at a time, so writers
+    only ever wait for a send of their own, and frames written meanwhile
+    are kept for the next batch. Frames a failed send did not write are
+    put back in front of the kept ones; an error the background thread
+    runs into is raised by the next write, so the owner sees failed sends
+    as it would without batching and can take its reconnect path.
+    """
+
+    def __init__(self, target: SocketProvider, options: SocketOptions) -> None:
+        """
+        Initialize the batcher.
+
+        Args:
+            target (SocketProvider): Callable returning the socket to write to,
+                None while there is no connection.
+            options (SocketOptions): Settings holding the flush policy.
+        """
+        self.target: SocketProvider = target
+        self.count: int = min(options.batch_count, IOV_MAX)
+        self.size: int = options.batch_bytes
+        self.window: float = (options.batch_window_us or 0) / 1e6
+        self.condition = threading.Condition()
+        self.sends: int = 0
+        self.frames: int = 0
+
+        self._pending: List[bytes] = []
+        self._bytes: int = 0
+        self._deadline: Optional[float] = None
+        self._last: float = 0.0
+        self._sending: bool = False
+        self._generation: int = 0
+        self._taken: int = 0
+        self._error: Optional[OSError] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self, packet: bytes) -> None:
+        """
+        Send a frame now or keep it for the next batch.
+
+        While another send is in progress the frame is kept, and goes out
+        with the batch after it.
+
+        Args:
+            packet (bytes): The encoded frames to send.
+
+        Raises:
+            OSError: If this write or an earlier background flush failed.
+        """
+        with self.condition:
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+
+            now = time.monotonic()
+            idle = not self._pending and now - self._last >= self.window
+            self._pending.append(packet)
+            self._bytes += len(packet)
+
+            if self._sending or not idle and not self._full():
+                self._schedule(now)
+                return
+
+            frames = self._take()
+
+        self._send(frames)
+
+    def flush(self) -> None:
+        """
+        Send every kept frame right away.
+
+        Waits for a send in progress to finish first.
+
+        Raises:
+            OSError: If the send fails.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: not self._sending)
+            frames = self._take()
+
+        if frames:
+            self._send(frames)
+        else:
+            self._done(self._taken, frames)
+
+    def reset(self) -> None:
+        """
+        Forget kept frames and errors, as after a new connection.
+
+        Frames that never left belong to the old connection: within a
+        session the discrete ones are sent again by its replay.
+        """
+        with self.condition:
+            self._pending = []
+            self._bytes = 0
+            self._deadline = None
+            self._error = None
+            self._generation += 1
+
+    def _full(self) -> bool:
+        """
+        Check whether the kept frames reached the count or byte limit.
+
+        Must be called with the condition held.
+
+        Returns:
+            bool: True if the batch must be sent without waiting for its window.
+        """
+        return len(self._pending) >= self.count or self._bytes >= self.size
+
+    def _schedule(self, now: float) -> None:
+        """
+        Open a flush window for the kept frames, if none is open.
+
+        Must be called with the condition held.
+
+        Args:
+            now (float): The current monotonic time.
+        """
+        if self._deadline is None:
+            self._deadline = now + self.window
+            self._start()
+            self.condition.notify_all()
+
+    def _start(self) -> None:
+        """
+        Start the flush thread on first use.
+
+        Must be called with the condition held.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self._thread.start()
+
+    def _take(self) -> List[bytes]:
+        """
+        Take every kept frame for a send, marking the send in progress.
+
+        Must be called with the condition held.
+
+        Returns:
+            List[bytes]: The frames to write, in order.
+        """
+        frames = self._pending
+        self._pending = []
+        self._bytes = 0
+        self._deadline = None
+        self._sending = True
+        self._taken = self._generation
+        return frames
+
+    def _send(self, frames: List[bytes]) -> None:
+        """
+        Write frames to the current socket, without holding the condition.
+
+        Frames left unwritten by a failure are put back in front of the
+        kept ones, unless the batcher was reset meanwhile.
+
+        Args:
+            frames (List[bytes]): The frames to write, in order.
+
+        Raises:
+            ConnectionError: If there is no connection.
+            OSError: If the send fails.
+        """
+        generation = self._taken
+        count = len(frames)
+
+        try:
+            sock = self.target()
+
+            if sock is None:
+                raise ConnectionError("No active connection. Cannot send packets")
+
+            send_vectored(sock, frames)
+
+        except OSError:
+            self._done(generation, frames)
+            raise
+
+        self._done(generation, frames, count)
+
+    def _done(self, generation: int, unsent: List[bytes], count: int = 0) -> None:
+        """
+        End a send, putting back the frames it did not write.
+
+        After a success, frames kept meanwhile get a flush window of their
+        own; after a failure they wait for the next write.
+
+        Args:
+            generation (int): The reset count when the send started.
+            unsent (List[bytes]): The frames still to write, in order.
+            count (int): The amount of frames written, zero after a failure.
+        """
+        with self.condition:
+            self._sending = False
+
+            if count:
+                self._last = time.monotonic()
+                self.sends += 1
+                self.frames += count
+
+                if self._pending:
+                    self._schedule(self._last)
+
+            elif unsent and generation == self._generation:
+                self._pending[:0] = unsent
+                self._bytes += sum(len(frame) for frame in unsent)
+
+            self.condition.notify_all()
+
+    def _flush_loop(self) -> None:
+        """
+        Send kept frames whenever their flush window closes.
+
+        A send that fails leaves its frames kept and its error for the
+        next write, which also opens the window that tries them again.
+        """
+        while True:
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: self._deadline is not None and not self._sending
+                    and self._error is None
+                )
+                remaining = self._deadline - time.monotonic()
+
+                if remaining > 0 and not self._full():
+                    self.condition.wait(remaining)
+                    continue
+
+                frames = self._take()
+
+            try:
+                self._send(frames)
+
+            except OSError as error:
+                with self.condition:
+                    self._error = error
@@ -0,0 +1,163 @@
+"""Receive buffer module for reading and decoding frames without copies."""
+from typing import Callable, Dict
+from src.tcp.protocol import PREFIX, HEADER, FRAME_SIZE, MAX_FRAME_LENGTH, Event
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+RecvInto = Callable[[memoryview], int]
+EventHandler = Callable[[Event], None]
+
+DEFAULT_CAPACITY = 1 << 17
+
+
+class ReceiveBuffer:
+    """
+    Preallocated receive buffer that frames are decoded from in place.
+
+    Data is read straight into a fixed bytearray through ``recv_into`` on a
+    memoryview of its free tail, and frames are unpacked from it with struct
+    offsets. Consumed bytes are never deleted: the read and write offsets
+    advance and wrap back to the start once the buffer is drained, and a
+    partial frame is only moved when it reaches the end. The capacity always
+    fits a frame of the maximum length.
+
+    The highest amount of buffered bytes is tracked as the high-water mark
+    and logged each time it doubles.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity (int): Size of the buffer in bytes, raised to hold at
+                least one frame of the maximum length.
+        """
+        self.capacity: int = max(capacity, PREFIX.size + MAX_FRAME_LENGTH)
+        self.buffer: bytearray = bytearray(self.capacity)
+        self.view: memoryview = memoryview(self.buffer)
+        self.high_water: int = 0
+        self.reads: int = 0
+        self.compactions: int = 0
+
+        self._start: int = 0
+        self._end: int = 0
+        self._reported: int = FRAME_SIZE
+
+    def fill(self, recv_into: RecvInto) -> int:
+        """
+        Read from the connection into the free space of the buffer.
+
+        Args:
+            recv_into (RecvInto): Callable that reads into a memoryview and
+                returns the amount of bytes read, like ``socket.recv_into``.
+
+        Returns:
+            int: The amount of bytes read, zero when the peer closed.
+        """
+        if self._end == self.capacity:
+            self._compact()
+
+        count = recv_into(self.view[self._end:])
+        self._end += count
+        self.reads += 1
+
+        buffered = self._end - self._start
+
+        if buffered > self.high_water:
+            self.high_water = buffered
+
+            if buffered >= self._reported * 2:
+                self._reported = buffered
+                logger.debug(
+                    "Receive buffer high-water mark: %d of %d bytes", buffered, self.capacity
+                )
+
+        return count
+
+    def drain(self, handler: EventHandler) -> int:
+        """
+        Decode every complete frame and pass each event to the handler.
+
+        The payload of an event is a memoryview into the buffer, only valid
+        until the handler returns.
+
+        Args:
+            handler (EventHandler): Callable receiving each decoded event.
+
+        Returns:
+            int: The amount of events handled.
+
+        Raises:
+            ValueError: If a frame declares a length shorter than the header.
+        """
+        buffer = self.buffer
+        view = self.view
+        end = self._end
+        offset = self._start
+        count = 0
+
+        try:
+            while end - offset >= PREFIX.size:
+                (length,) = PREFIX.unpack_from(buffer, offset)
+
+                if length < HEADER.size:
+                    raise ValueError("Malformed frame, length shorter than header")
+
+                stop = offset + PREFIX.size + length
+
+                if stop > end:
+                    break
+
+                start = offset + FRAME_SIZE
+                payload = view[start:stop] if stop > start else b""
+                handler(Event(*HEADER.unpack_from(buffer, offset + PREFIX.size), payload))
+                offset = stop
+                count += 1
+        finally:
+            if offset == end:
+                self._start = self._end = 0
+            else:
+                self._start = offset
+
+        return count
+
+    def pending(self) -> int:
+        """
+        Get the number of buffered bytes not yet decoded.
+
+        Returns:
+            int: The amount of bytes waiting for the rest of their frame.
+        """
+        return self._end - self._start
+
+    def reset(self) -> None:
+        """
+        Discard any partially received frame.
+        """
+        self._start = self._end = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the buffer usage counters.
+
+        Returns:
+            Dict[str, int]: Capacity, high-water mark, reads and compactions.
+        """
+        return {
+            "capacity": self.capacity,
+            "high_water": self.high_water,
+            "reads": self.reads,
+            "compactions": self.compactions
+        }
+
+    def _compact(self) -> None:
+        """
+        Move the partial frame at the end of the buffer back to the start.
+        """
+        pending = self._end - self._start
+        self.view[:pending] = self.view[self._start:self._end]
+        self._start, self._end = 0, pending
+        self.compactions += 1
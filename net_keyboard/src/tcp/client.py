@@ -1,6 +1,9 @@
 """Client module for TCP communication."""
-from typing import Union
+from typing import Optional, Union
 from src.tcp.base import TCP
+from src.tcp.options import SocketOptions, apply_listener_options, apply_socket_options,\
+    rearm_quickack, report_options
+from src.tcp.batch import FrameBatcher
 import socket
 
 
@@ -9,39 +12,71 @@ class BaseClient(TCP):
     Base TCP client class for establishing network connections.
     
     This class extends the TCP base class and provides client-side functionality
-    for connecting to and communicating with TCP servers.
+    for connecting to and communicating with TCP servers. A listening client
+    waits for the server to connect to it instead, as a target driven by a
+    connection pool does.
     """
 
-    def __init__(self, host: str, port: int) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None,
+        listen: bool = False
+    ) -> None:
         """
         Initialize the TCP client and connect to the server.
         
         Args:
-            host (str): The hostname or IP address of the server to connect to.
-            port (int): The port number of the server.
+            host (str): The hostname or IP address of the server to connect to,
+                or the address to bind to when listening.
+            port (int): The port number of the server, or the one to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings, defaults
+                to the low-latency SocketOptions defaults.
+            listen (bool): Whether to wait for the server to connect instead.
         """
-        self._client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._client = self.open_socket()
         self.host: str = host
         self.port: int = port
+        self.options: SocketOptions = options or SocketOptions()
+        self.listen: bool = listen
+        self.batcher: Optional[FrameBatcher] = None
+        self._listener: Optional[socket.socket] = None
+
+        if self.options.batch_window_us is not None:
+            self.batcher = FrameBatcher(lambda: self._client, self.options)
 
         self.connect()
 
+    def open_socket(self) -> socket.socket:
+        """
+        Create the socket used to reach the server.
+
+        Returns:
+            socket.socket: A new TCP socket.
+        """
+        return socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
     def send(self, packet: Union[str, bytes]) -> None:
         """
         Send data packet to the connected server.
+
+        With batching on, packets written close together leave in one send.
         
         Args:
             packet (Union[str, bytes]): The data packet to send as a string or bytes.
         """
         if isinstance(packet, str):
-            self._client.sendall(packet.encode())
+            packet = packet.encode()
         
-        elif isinstance(packet, bytes):
-            self._client.sendall(packet)
-            
-        else:
+        elif not isinstance(packet, bytes):
             raise TypeError("Invalid data type, cannot be sent over the network")
 
+        if self.batcher is not None:
+            self.batcher.write(packet)
+        else:
+            self._client.sendall(packet)
+
     def receive(self) -> bytes:
         """
         Receive data from the connected server.
@@ -49,13 +84,55 @@ class BaseClient(TCP):
         Returns:
             bytes: The received data.
         """
-        return self._client.recv(1024)
+        data = self._client.recv(1024)
+        rearm_quickack(self._client, self.options)
+        return data
+
+    def receive_into(self, view: memoryview) -> int:
+        """
+        Receive data from the connected server into a preallocated buffer.
+
+        Args:
+            view (memoryview): Writable view the data is read into.
+
+        Returns:
+            int: The amount of bytes read, zero when the server closed.
+        """
+        count = self._client.recv_into(view)
+        rearm_quickack(self._client, self.options)
+        return count
         
     def connect(self) -> None:
         """
         Connect to the TCP server using the configured host and port.
+
+        The socket options are applied before connecting, so buffer sizes
+        take part in the handshake, and reported once connected. A listening
+        client binds on first use and waits for the server to connect.
         """
+        if self.listen:
+            self.accept()
+            return
+
+        effective = apply_socket_options(self._client, self.options)
         self._client.connect((self.host, self.port))
+        report_options((self.host, self.port), effective)
+
+    def accept(self) -> None:
+        """
+        Wait for the server to connect to a listening client.
+
+        The socket options are applied to the accepted connection and reported.
+        """
+        if self._listener is None:
+            self._listener = self.open_socket()
+            apply_listener_options(self._listener, self.options)
+            self._listener.bind((self.host, self.port))
+            self._listener.listen()
+
+        self._client.close()
+        self._client, address = self._listener.accept()
+        report_options(address, apply_socket_options(self._client, self.options))
 
     def disconnect(self) -> None:
         """
@@ -63,6 +140,37 @@ class BaseClient(TCP):
         """
         self._client.close()
 
+        if self._listener is not None:
+            self._listener.close()
+
+    def drop(self) -> None:
+        """
+        Shut down the connection without closing the socket.
+
+        Threads blocked sending or receiving on it wake up.
+        """
+        try:
+            self._client.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def reconnect(self) -> None:
+        """
+        Replace the client socket with a new one and connect again.
+
+        A listening client waits for the server to connect again instead.
+
+        Raises:
+            OSError: If the server cannot be reached.
+        """
+        self._client.close()
+        self._client = self.open_socket()
+
+        if self.batcher is not None:
+            self.batcher.reset()
+
+        self.connect()
+
     def run(self) -> None:
         """
         Run the client main loop.
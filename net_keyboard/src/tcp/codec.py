@@ -0,0 +1,294 @@
+"""Codec module for compact delta encoding of pointer datagrams."""
+from typing import List, Optional, Tuple, Union
+from src.tcp.protocol import PREFIX, HEADER, EventKind, EventType
+import struct
+
+
+COMPACT = 0x80
+HISTORY = 256
+SEQUENCE_MASK = 0xFFFFFFFF
+
+FRAME = struct.Struct("!H" + HEADER.format[1:])
+DELTA_KINDS = frozenset((EventKind.MOVE, EventKind.MOTION, EventKind.SCROLL))
+
+State = Tuple[int, int, int, int]
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def put_varint(buffer: bytearray, value: int) -> None:
+    """
+    Append an unsigned integer as a base-128 varint.
+
+    Args:
+        buffer (bytearray): The buffer to append to.
+        value (int): The non-negative value to write.
+    """
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+
+    buffer.append(value)
+
+
+def get_varint(data: Buffer, offset: int) -> Tuple[int, int]:
+    """
+    Read a base-128 varint.
+
+    Args:
+        data (Buffer): The encoded bytes.
+        offset (int): Where the varint starts.
+
+    Returns:
+        Tuple[int, int]: The value and the offset right after it.
+
+    Raises:
+        ValueError: If the varint is truncated or longer than 64 bits.
+    """
+    result = shift = 0
+
+    while True:
+        if offset >= len(data) or shift > 63:
+            raise ValueError("Malformed varint")
+
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+
+        if byte < 0x80:
+            return result, offset
+
+        shift += 7
+
+
+def zigzag(value: int) -> int:
+    """
+    Map a signed integer onto an unsigned one, small magnitudes first.
+
+    Args:
+        value (int): The signed value.
+
+    Returns:
+        int: 0, 1, 2, 3... for 0, -1, 1, -2...
+    """
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def unzigzag(value: int) -> int:
+    """
+    Undo zigzag.
+
+    Args:
+        value (int): The unsigned value.
+
+    Returns:
+        int: The signed value it stands for.
+    """
+    return (value >> 1) ^ -(value & 1)
+
+
+class DeltaEncoder:
+    """
+    Sender side of the compact pointer codec.
+
+    A compact datagram starts with the COMPACT marker and the distance,
+    in sequence numbers, back to the datagram it is relative to, 0 for
+    a keyframe. Every event follows as its kind and three zigzag
+    varints: absolute moves as the change from the previous position,
+    relative motion and scroll as they are, and timestamps as the change
+    from the previous one. A keyframe is relative to zero, so it stands
+    on its own.
+
+    Datagrams are only made relative to one the receiver acknowledged,
+    never to the one sent just before, so a lost datagram costs nothing
+    but itself. Until an acknowledgement arrives, and every ``keyframe``
+    datagrams, a keyframe is sent instead. Packets holding anything other
+    than pointer frames without a payload, such as traced frames, are
+    left for the caller to send as they are.
+    """
+
+    def __init__(self, keyframe: int = 64) -> None:
+        """
+        Initialize the encoder.
+
+        Args:
+            keyframe (int): Datagrams between two keyframes.
+
+        Raises:
+            ValueError: If the keyframe interval is not positive.
+        """
+        if keyframe < 1:
+            raise ValueError("Keyframe interval must be positive")
+
+        self.keyframe: int = keyframe
+        self.keyframes: int = 0
+        self.deltas: int = 0
+
+        self._history: List[Optional[State]] = [None] * HISTORY
+        self._base: Optional[State] = None
+        self._since: int = keyframe
+
+    def encode(self, sequence: int, packet: bytes) -> Optional[bytes]:
+        """
+        Encode the frames of a datagram.
+
+        Args:
+            sequence (int): The sequence number the datagram is sent with.
+            packet (bytes): The encoded frames.
+
+        Returns:
+            Optional[bytes]: The compact datagram, or None if the packet
+            holds frames the codec does not carry.
+        """
+        base = self._base
+        distance = (sequence - base[0]) & SEQUENCE_MASK if base is not None else 0
+
+        if base is None or self._since >= self.keyframe or not 0 < distance < HISTORY:
+            distance = 0
+            x = y = timestamp = 0
+        else:
+            _, x, y, timestamp = base
+
+        compact = bytearray((COMPACT,))
+        put_varint(compact, distance)
+        offset = 0
+
+        while offset < len(packet):
+            (length,) = PREFIX.unpack_from(packet, offset)
+            _, kind, code, event_x, event_y, event_timestamp = HEADER.unpack_from(
+                packet, offset + PREFIX.size
+            )
+
+            if length != HEADER.size or code or kind not in DELTA_KINDS:
+                return None
+
+            compact.append(kind)
+
+            if kind == EventKind.MOVE:
+                put_varint(compact, zigzag(event_x - x))
+                put_varint(compact, zigzag(event_y - y))
+                x, y = event_x, event_y
+            else:
+                put_varint(compact, zigzag(event_x))
+                put_varint(compact, zigzag(event_y))
+
+            put_varint(compact, zigzag(event_timestamp - timestamp))
+            timestamp = event_timestamp
+            offset += PREFIX.size + length
+
+        self._history[sequence % HISTORY] = (sequence, x, y, timestamp)
+
+        if distance:
+            self._since += 1
+            self.deltas += 1
+        else:
+            self._since = 1
+            self.keyframes += 1
+
+        return bytes(compact)
+
+    def acknowledge(self, sequence: int) -> None:
+        """
+        Make later datagrams relative to one the receiver decoded.
+
+        Args:
+            sequence (int): The sequence number acknowledged.
+        """
+        state = self._history[sequence % HISTORY]
+
+        if state is None or state[0] != sequence:
+            return
+
+        base = self._base
+
+        if base is None or 0 < (sequence - base[0]) & SEQUENCE_MASK < 0x80000000:
+            self._base = state
+
+    def reset(self) -> None:
+        """
+        Forget acknowledgements, so the next datagram is a keyframe.
+        """
+        self._history = [None] * HISTORY
+        self._base = None
+        self._since = self.keyframe
+
+
+class DeltaDecoder:
+    """
+    Receiver side of the compact pointer codec.
+
+    Compact datagrams are turned back into regular frames, so the rest
+    of the client handles them like any other. A datagram relative to
+    one that never arrived cannot be decoded and is skipped until the
+    next keyframe or a datagram relative to one that did arrive.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the decoder.
+        """
+        self.keyframe: bool = False
+        self.missing: int = 0
+
+        self._history: List[Optional[State]] = [None] * HISTORY
+
+    def decode(self, sequence: int, data: Buffer) -> Optional[bytes]:
+        """
+        Decode a compact datagram into frames.
+
+        Args:
+            sequence (int): The sequence number the datagram came with.
+            data (Buffer): The compact datagram, marker included.
+
+        Returns:
+            Optional[bytes]: The decoded frames, or None if the datagram it
+            is relative to is unknown.
+
+        Raises:
+            ValueError: If the datagram is malformed.
+        """
+        distance, offset = get_varint(data, 1)
+
+        if distance:
+            reference = (sequence - distance) & SEQUENCE_MASK
+            base = self._history[reference % HISTORY]
+
+            if base is None or base[0] != reference:
+                self.missing += 1
+                return None
+
+            _, x, y, timestamp = base
+        else:
+            x = y = timestamp = 0
+
+        frames = bytearray()
+
+        while offset < len(data):
+            kind = data[offset]
+
+            if kind not in DELTA_KINDS:
+                raise ValueError("Malformed compact datagram, unknown event kind")
+
+            event_x, offset = get_varint(data, offset + 1)
+            event_y, offset = get_varint(data, offset)
+            event_timestamp, offset = get_varint(data, offset)
+            event_x, event_y = unzigzag(event_x), unzigzag(event_y)
+            timestamp += unzigzag(event_timestamp)
+
+            if kind == EventKind.MOVE:
+                x += event_x
+                y += event_y
+                event_x, event_y = x, y
+
+            frames += FRAME.pack(
+                HEADER.size, EventType.MOUSE, kind, 0, event_x, event_y, timestamp
+            )
+
+        self._history[sequence % HISTORY] = (sequence, x, y, timestamp)
+        self.keyframe = not distance
+        return bytes(frames)
+
+    def reset(self) -> None:
+        """
+        Forget every decoded datagram, as when the sender restarted.
+        """
+        self._history = [None] * HISTORY
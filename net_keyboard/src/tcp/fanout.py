@@ -0,0 +1,144 @@
+"""Fanout module for the per-peer write queues of the asyncio engines."""
+from typing import Callable, Deque
+from collections import deque
+from src.tcp.protocol import is_lossy
+import asyncio
+
+
+QUEUED = "queued"
+DROPPED = "dropped"
+BEHIND = "behind"
+
+
+class PeerQueue:
+    """
+    Bounded write queue of one peer, drained by its own write loop.
+
+    Lives on the event loop of its engine and is only touched from there.
+    Once ``capacity`` packets wait, what happens to the next one follows
+    the overflow policy of the lane scheduler:
+
+    - ``"drop"``: moves and scroll are dropped. Keys, clicks and control
+      frames are never dropped; they may fill the queue up to twice the
+      capacity, and a peer too far behind to take one more must be closed.
+    - ``"block"``: the sender waits in ``room`` until there is room again.
+    - ``"disconnect"``: the peer must be closed.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, capacity: int, policy: str = "drop") -> None:
+        """
+        Initialize the queue of a connected peer.
+
+        Args:
+            writer (asyncio.StreamWriter): The peer's write stream.
+            capacity (int): Packets waiting before the overflow policy applies.
+            policy (str): One of the lane scheduler OVERFLOW_POLICIES.
+        """
+        self.writer: asyncio.StreamWriter = writer
+        self.capacity: int = capacity
+        self.policy: str = policy
+        self.closed: bool = False
+
+        self._packets: Deque[bytes] = deque()
+        self._waiting = asyncio.Event()
+        self._room = asyncio.Event()
+        self._room.set()
+
+    def __len__(self) -> int:
+        """
+        Get the number of packets waiting.
+
+        Returns:
+            int: The amount of packets queued and not written yet.
+        """
+        return len(self._packets)
+
+    def put(self, packet: bytes) -> str:
+        """
+        Queue a packet according to the overflow policy.
+
+        Args:
+            packet (bytes): The packet to queue.
+
+        Returns:
+            str: QUEUED, DROPPED if a move or scroll was left out, or BEHIND
+            if the peer is too far behind and must be closed.
+        """
+        size = len(self._packets)
+
+        if size >= self.capacity:
+            if self.policy == "disconnect":
+                return BEHIND
+
+            if is_lossy(packet):
+                return DROPPED
+
+            if size >= 2 * self.capacity:
+                return BEHIND
+
+        self._packets.append(packet)
+        self._waiting.set()
+
+        if len(self._packets) >= self.capacity:
+            self._room.clear()
+
+        return QUEUED
+
+    async def room(self) -> None:
+        """
+        Wait until the queue is below its capacity or closed.
+        """
+        while not self.closed and len(self._packets) >= self.capacity:
+            self._room.clear()
+            await self._room.wait()
+
+    def close(self) -> None:
+        """
+        Stop the queue, releasing any sender waiting for room.
+        """
+        self.closed = True
+        self._packets.clear()
+        self._room.set()
+        self.writer.close()
+
+    async def serve(self, reader: asyncio.StreamReader, received: Callable[[bytes], None]) -> None:
+        """
+        Serve the peer until its connection closes.
+
+        Runs the write loop in the background and hands everything the peer
+        sends to ``received``. The queue is closed once the peer is gone.
+
+        Args:
+            reader (asyncio.StreamReader): The peer's read stream.
+            received (Callable[[bytes], None]): Called with every chunk read.
+        """
+        writing = asyncio.create_task(self.write_loop())
+
+        try:
+            while data := await reader.read(1024):
+                received(data)
+
+        except ConnectionError:
+            pass
+
+        finally:
+            writing.cancel()
+            self.close()
+
+    async def write_loop(self) -> None:
+        """
+        Write queued packets to the peer, draining once the queue is empty.
+        """
+        try:
+            while not self.closed:
+                await self._waiting.wait()
+
+                while self._packets:
+                    self.writer.write(self._packets.popleft())
+
+                self._waiting.clear()
+                self._room.set()
+                await self.writer.drain()
+
+        except ConnectionError:
+            pass
@@ -0,0 +1,452 @@
+"""Local module for serving consumers on the same host over Unix domain sockets."""
+from typing import Dict, List, Optional, Tuple, Union
+from src.tcp.base import TCP, MultiPeer
+from src.tcp.client import BaseClient
+from src.tcp.options import SocketOptions
+from src.tcp.protocol import is_lossy
+import threading
+import logging
+import socket
+import queue
+import stat
+import os
+
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE = 1 << 17
+
+
+def local_socket() -> socket.socket:
+    """
+    Create a Unix domain socket that keeps message boundaries if it can.
+
+    SOCK_SEQPACKET is used where the platform offers it for Unix domain
+    sockets, SOCK_STREAM elsewhere.
+
+    Returns:
+        socket.socket: The new socket.
+    """
+    if hasattr(socket, "SOCK_SEQPACKET"):
+        try:
+            return socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+
+        except OSError:
+            pass
+
+    return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+
+def packets(sock: socket.socket) -> bool:
+    """
+    Check whether a socket keeps message boundaries.
+
+    Args:
+        sock (socket.socket): The socket to check.
+
+    Returns:
+        bool: True for SOCK_SEQPACKET sockets.
+    """
+    return sock.type == getattr(socket, "SOCK_SEQPACKET", None)
+
+
+class LocalServer(TCP, MultiPeer):
+    """
+    Unix domain socket server that fans events out to local consumers.
+
+    Recorders, macro engines and test harnesses on the capture host
+    connect to a socket path instead of TCP loopback, which skips the TCP
+    stack. Any number of consumers can connect, and every packet is sent
+    to all of them. Over SOCK_SEQPACKET each packet is one message.
+    Every consumer has a queue of its own, written by a thread of its
+    own, so a stalled consumer never delays capture or the others. Once
+    a queue holds ``queue_size`` packets, moves and scroll for that
+    consumer are dropped, while keys, clicks and control frames are
+    never dropped: they may fill the queue up to twice that, and a
+    consumer too far behind to take one more is closed instead.
+    Consumers such as recorders may never answer pings, so they
+    are only held to the heartbeat once they have answered one.
+    """
+
+    silent_peers: bool = True
+
+    def __init__(
+        self,
+        path: str,
+        options: Optional[SocketOptions] = None,
+        queue_size: int = 1024
+    ) -> None:
+        """
+        Initialize the server and start accepting consumers.
+
+        Args:
+            path (str): Filesystem path of the socket, or a name in the
+                abstract namespace starting with a NUL byte.
+            options (Optional[SocketOptions]): Socket settings, only the
+                buffer sizes apply to Unix domain sockets.
+            queue_size (int): Packets buffered per consumer before motion
+                is dropped for it.
+        """
+        self._server = local_socket()
+        self.path: str = path
+        self.options: SocketOptions = options or SocketOptions()
+        self.queue_size: int = queue_size
+        self.clients: Dict[int, socket.socket] = {}
+        self.pending: Dict[int, queue.Queue[Optional[bytes]]] = {}
+        self.dropped: int = 0
+
+        self._accepted: int = 0
+        self._lock = threading.Lock()
+        self._inbox: queue.Queue[Tuple[int, bytes]] = queue.Queue()
+
+        self.connect()
+
+    def send(self, packet: Union[str, bytes]) -> None:
+        """
+        Queue a data packet for every connected consumer.
+
+        A consumer whose queue is full misses the packet if it is a move
+        or scroll, and is removed otherwise.
+
+        Args:
+            packet (Union[str, bytes]): The data packet to send as a string or bytes.
+        """
+        if isinstance(packet, str):
+            packet = packet.encode()
+
+        elif not isinstance(packet, bytes):
+            raise TypeError("Invalid data type, cannot be sent over the network")
+
+        lossy = is_lossy(packet)
+
+        with self._lock:
+            pending = list(self.pending.items())
+
+        for number, waiting in pending:
+            self._queue(number, waiting, packet, lossy)
+
+    def receive(self) -> bytes:
+        """
+        Receive data from any connected consumer.
+
+        Blocks until one of the consumers sends something.
+
+        Returns:
+            bytes: The received data.
+        """
+        while True:
+            _, data = self._inbox.get()
+
+            if data:
+                return data
+
+    def receive_from(self) -> Tuple[int, bytes]:
+        """
+        Receive data from any consumer, with the consumer that sent it.
+
+        Returns:
+            Tuple[int, bytes]: The number the consumer was accepted with
+            and the data, empty once its connection closed.
+        """
+        return self._inbox.get()
+
+    def reply(self, peer: int, packet: bytes) -> None:
+        """
+        Send a data packet to a single consumer.
+
+        Args:
+            peer (int): The number the consumer was accepted with.
+            packet (bytes): The data packet to send.
+        """
+        with self._lock:
+            waiting = self.pending.get(peer)
+
+        if waiting is not None:
+            self._queue(peer, waiting, packet, False)
+
+    def connected_peers(self) -> List[int]:
+        """
+        Get the numbers of the connected consumers.
+
+        Returns:
+            List[int]: The number every connected consumer was accepted with.
+        """
+        with self._lock:
+            return list(self.clients)
+
+    def close_peer(self, peer: int) -> None:
+        """
+        Close the connection of a single consumer.
+
+        Args:
+            peer (int): The number the consumer was accepted with.
+        """
+        self._remove(peer)
+
+    def connect(self) -> None:
+        """
+        Bind the socket path and start accepting consumers in the background.
+
+        A socket left behind at the path by an earlier run is removed first.
+        """
+        if not self.path.startswith("\0") and os.path.exists(self.path):
+            if not stat.S_ISSOCK(os.stat(self.path).st_mode):
+                raise FileExistsError(f"{self.path} exists and is not a socket")
+
+            os.unlink(self.path)
+
+        self._server.bind(self.path)
+        self._server.listen()
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        logger.info("Serving local consumers at %s", self.path.replace("\0", "@"))
+
+    def disconnect(self) -> None:
+        """
+        Close every consumer connection and remove the socket path.
+        """
+        self.drop()
+        self._server.close()
+
+        if not self.path.startswith("\0"):
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def drop(self) -> None:
+        """
+        Close every consumer connection, keeping the socket path open.
+        """
+        with self._lock:
+            numbers = list(self.clients)
+
+        for number in numbers:
+            self._remove(number)
+
+    def run(self) -> None:
+        """
+        Run the server main loop.
+
+        This method is intended to be implemented by subclasses to define
+        the main server execution logic.
+        """
+        pass
+
+    def subscribers(self) -> int:
+        """
+        Get the number of connected consumers.
+
+        Returns:
+            int: The amount of consumers currently connected.
+        """
+        return len(self.clients)
+
+    def _accept_loop(self) -> None:
+        """
+        Accept consumers until the server socket is closed.
+        """
+        while True:
+            try:
+                client, _ = self._server.accept()
+
+            except OSError:
+                break
+
+            if self.options.send_buffer is not None:
+                client.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.options.send_buffer)
+
+            waiting: queue.Queue[Optional[bytes]] = queue.Queue()
+
+            with self._lock:
+                self._accepted += 1
+                number = self._accepted
+                self.clients[number] = client
+                self.pending[number] = waiting
+
+            threading.Thread(target=self._read_loop, args=(number, client), daemon=True).start()
+            threading.Thread(
+                target=self._write_loop, args=(number, client, waiting), daemon=True
+            ).start()
+
+    def _queue(
+        self,
+        number: int,
+        waiting: queue.Queue[Optional[bytes]],
+        packet: bytes,
+        lossy: bool
+    ) -> None:
+        """
+        Queue a packet for a single consumer, unless it is too far behind.
+
+        Args:
+            number (int): The number the consumer was accepted with.
+            waiting (queue.Queue[Optional[bytes]]): The queue of the consumer.
+            packet (bytes): The data packet to send.
+            lossy (bool): Whether the packet may be dropped for a full queue.
+        """
+        size = waiting.qsize()
+
+        if size < self.queue_size or (not lossy and size < 2 * self.queue_size):
+            waiting.put(packet)
+
+        elif lossy:
+            self.dropped += 1
+
+        else:
+            logger.warning("Local consumer %d fell %d packets behind, closing it", number, size)
+            self._remove(number)
+
+    def _write_loop(
+        self,
+        number: int,
+        client: socket.socket,
+        waiting: queue.Queue[Optional[bytes]]
+    ) -> None:
+        """
+        Write the queued packets to a consumer until it is removed.
+
+        Args:
+            number (int): The number the consumer was accepted with.
+            client (socket.socket): The consumer connection.
+            waiting (queue.Queue[Optional[bytes]]): The queue of the consumer,
+                ended by None.
+        """
+        message = packets(client)
+
+        try:
+            while (packet := waiting.get()) is not None:
+                if message:
+                    client.send(packet)
+                else:
+                    client.sendall(packet)
+
+        except OSError:
+            self._remove(number)
+
+    def _read_loop(self, number: int, client: socket.socket) -> None:
+        """
+        Queue whatever a consumer sends until its connection closes.
+
+        Args:
+            number (int): The number the consumer was accepted with.
+            client (socket.socket): The consumer connection.
+        """
+        try:
+            while data := client.recv(MAX_MESSAGE):
+                self._inbox.put((number, data))
+
+        except OSError:
+            pass
+
+        self._remove(number)
+        self._inbox.put((number, b""))
+
+    def _remove(self, number: int) -> None:
+        """
+        Close a consumer connection and forget it.
+
+        Args:
+            number (int): The number the consumer was accepted with.
+        """
+        with self._lock:
+            client = self.clients.pop(number, None)
+            waiting = self.pending.pop(number, None)
+
+        if waiting is not None:
+            waiting.put(None)
+
+        if client is None:
+            return
+
+        try:
+            client.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+        client.close()
+
+
+class LocalClient(BaseClient):
+    """
+    Client of a LocalServer, connecting to its Unix domain socket.
+
+    The host is the socket path and the port is unused. It can be mixed
+    in before an injection client to receive events locally. Over
+    SOCK_SEQPACKET a message that does not fit the caller's buffer would
+    be cut short, so it is then read whole into a buffer of its own and
+    handed out over as many reads as it takes.
+    """
+
+    _pending: memoryview = memoryview(b"")
+    _staging: Optional[bytearray] = None
+
+    def open_socket(self) -> socket.socket:
+        """
+        Create the socket used to reach the server.
+
+        Returns:
+            socket.socket: A new Unix domain socket.
+        """
+        return local_socket()
+
+    def receive(self) -> bytes:
+        """
+        Receive data from the server.
+
+        Returns:
+            bytes: The received data.
+        """
+        return self._client.recv(MAX_MESSAGE)
+
+    def receive_into(self, view: memoryview) -> int:
+        """
+        Receive data from the server into a preallocated buffer.
+
+        Args:
+            view (memoryview): Writable view the data is read into.
+
+        Returns:
+            int: The amount of bytes read, zero when the server closed.
+        """
+        if not self._pending:
+            if len(view) >= MAX_MESSAGE or not packets(self._client):
+                return self._client.recv_into(view)
+
+            if self._staging is None:
+                self._staging = bytearray(MAX_MESSAGE)
+
+            count = self._client.recv_into(self._staging)
+            self._pending = memoryview(self._staging)[:count]
+
+        count = min(len(view), len(self._pending))
+        view[:count] = self._pending[:count]
+        self._pending = self._pending[count:]
+        return count
+
+    def connect(self) -> None:
+        """
+        Connect to the socket path of the server.
+
+        A listening client binds the path on first use and waits for the
+        server to connect instead.
+        """
+        self._pending = memoryview(b"")
+
+        if self.listen:
+            self.accept()
+            return
+
+        self._client.connect(self.host)
+        logger.info("Connected to local server at %s", self.host.replace("\0", "@"))
+
+    def accept(self) -> None:
+        """
+        Wait for the server to connect to a listening client.
+        """
+        if self._listener is None:
+            self._listener = self.open_socket()
+            self._listener.bind(self.host)
+            self._listener.listen()
+
+        self._client.close()
+        self._client, _ = self._listener.accept()
@@ -0,0 +1,177 @@
+"""Socket options module for tuning TCP connections for low latency."""
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict, fields
+import logging
+import socket
+
+
+logger = logging.getLogger(__name__)
+
+Option = Tuple[str, int, int]
+
+
+@dataclass
+class SocketOptions:
+    """
+    Socket tuning settings applied to every TCP connection.
+
+    Attributes:
+        nodelay (bool): Disable Nagle's algorithm so small frames leave at once.
+        quickack (bool): Acknowledge immediately instead of delaying ACKs (Linux).
+        reuse_address (bool): Allow rebinding the server port while in TIME_WAIT.
+        send_buffer (Optional[int]): Send buffer size in bytes, None keeps the default.
+        receive_buffer (Optional[int]): Receive buffer size in bytes, None keeps the default.
+        keepalive (bool): Enable TCP keepalive probes.
+        keepalive_idle (int): Seconds of idle time before the first probe.
+        keepalive_interval (int): Seconds between probes.
+        keepalive_count (int): Failed probes before the connection is dropped.
+        dscp (Optional[int]): DSCP code point for IP_TOS marking, None keeps the default.
+        batch_window_us (Optional[int]): Microseconds frames written close
+            together are gathered into one send, None sends each one at once.
+        batch_count (int): Gathered frames that trigger a send.
+        batch_bytes (int): Gathered bytes that trigger a send.
+    """
+    nodelay: bool = True
+    quickack: bool = True
+    reuse_address: bool = True
+    send_buffer: Optional[int] = None
+    receive_buffer: Optional[int] = None
+    keepalive: bool = True
+    keepalive_idle: int = 10
+    keepalive_interval: int = 5
+    keepalive_count: int = 3
+    dscp: Optional[int] = None
+    batch_window_us: Optional[int] = None
+    batch_count: int = 32
+    batch_bytes: int = 1400
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SocketOptions":
+        """
+        Build socket options from a configuration mapping.
+
+        Unknown keys are ignored so older configuration files keep working.
+
+        Args:
+            data (Dict[str, Any]): The "socket" section of the configuration.
+
+        Returns:
+            SocketOptions: The parsed options.
+        """
+        names = {item.name for item in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the options into a configuration mapping.
+
+        Returns:
+            Dict[str, Any]: The options ready to be dumped as JSON.
+        """
+        return asdict(self)
+
+
+def _requested(options: SocketOptions) -> List[Tuple[Option, int]]:
+    """
+    Build the list of socket options to set for a connected socket.
+
+    Options not supported by the running platform are skipped.
+
+    Args:
+        options (SocketOptions): The requested settings.
+
+    Returns:
+        List[Tuple[Option, int]]: Each option with the value to set.
+    """
+    requested: List[Tuple[Option, int]] = [
+        (("TCP_NODELAY", socket.IPPROTO_TCP, socket.TCP_NODELAY), int(options.nodelay)),
+        (("SO_KEEPALIVE", socket.SOL_SOCKET, socket.SO_KEEPALIVE), int(options.keepalive))
+    ]
+
+    if options.send_buffer is not None:
+        requested.append((("SO_SNDBUF", socket.SOL_SOCKET, socket.SO_SNDBUF), options.send_buffer))
+
+    if options.receive_buffer is not None:
+        requested.append((("SO_RCVBUF", socket.SOL_SOCKET, socket.SO_RCVBUF), options.receive_buffer))
+
+    if options.dscp is not None:
+        requested.append((("IP_TOS", socket.IPPROTO_IP, socket.IP_TOS), options.dscp << 2))
+
+    if options.quickack and hasattr(socket, "TCP_QUICKACK"):
+        requested.append((("TCP_QUICKACK", socket.IPPROTO_TCP, socket.TCP_QUICKACK), 1))
+
+    if options.keepalive:
+        for name, value in (
+            ("TCP_KEEPIDLE", options.keepalive_idle),
+            ("TCP_KEEPINTVL", options.keepalive_interval),
+            ("TCP_KEEPCNT", options.keepalive_count)
+        ):
+            if hasattr(socket, name):
+                requested.append(((name, socket.IPPROTO_TCP, getattr(socket, name)), value))
+
+    return requested
+
+
+def apply_listener_options(sock: socket.socket, options: SocketOptions) -> None:
+    """
+    Apply the options that must be set on a listening socket before bind.
+
+    Args:
+        sock (socket.socket): The server socket, not yet bound.
+        options (SocketOptions): The requested settings.
+    """
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, int(options.reuse_address))
+
+
+def apply_socket_options(sock: socket.socket, options: SocketOptions) -> Dict[str, int]:
+    """
+    Apply the requested options to a connected socket.
+
+    Options rejected by the kernel are logged and skipped instead of
+    aborting the connection.
+
+    Args:
+        sock (socket.socket): The connected socket to tune.
+        options (SocketOptions): The requested settings.
+
+    Returns:
+        Dict[str, int]: The effective value of every option, read back with getsockopt.
+    """
+    effective: Dict[str, int] = {}
+
+    for (name, level, option), value in _requested(options):
+        try:
+            sock.setsockopt(level, option, value)
+            effective[name] = sock.getsockopt(level, option)
+
+        except OSError as error:
+            logger.warning("Socket option %s=%s not applied: %s", name, value, error)
+
+    return effective
+
+
+def rearm_quickack(sock: socket.socket, options: SocketOptions) -> None:
+    """
+    Set TCP_QUICKACK again after a receive.
+
+    Linux clears the flag on its own once the connection leaves quick-ack
+    mode, so it has to be re-armed after every read to stay in effect.
+
+    Args:
+        sock (socket.socket): The connected socket.
+        options (SocketOptions): The requested settings.
+    """
+    if options.quickack and hasattr(socket, "TCP_QUICKACK"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+
+def report_options(peer: object, effective: Dict[str, int]) -> None:
+    """
+    Log the socket options in effect for a connection.
+
+    Args:
+        peer (object): The remote address of the connection.
+        effective (Dict[str, int]): The options returned by apply_socket_options.
+    """
+    summary = ", ".join(f"{name}={value}" for name, value in effective.items())
+    logger.info("Socket options for %s: %s", peer, summary)
@@ -0,0 +1,333 @@
+"""Connection pool module for feeding many TCP targets from one capture host."""
+from typing import Iterable, List, Optional, Tuple, Union
+from src.tcp.base import TCP, MultiPeer
+from src.tcp.fanout import BEHIND, DROPPED, PeerQueue
+from src.tcp.options import SocketOptions, apply_socket_options, report_options
+import asyncio
+import threading
+import logging
+import queue
+
+
+logger = logging.getLogger(__name__)
+
+Address = Tuple[str, int]
+
+
+class ConnectionPool(TCP, MultiPeer):
+    """
+    Asyncio-based pool of outgoing connections, one per target.
+
+    A single event loop in a background thread connects to every target
+    and keeps the connection alive, reconnecting with exponential backoff
+    whenever it drops. Every target has its own bounded write queue, so a
+    slow or unreachable machine only delays itself, and a full queue is
+    handled by the overflow policy, as described in PeerQueue. Packets can
+    be sent to a chosen set of targets or broadcast to all of them, and
+    frames for a target that is not connected are discarded rather than
+    kept for later.
+    """
+
+    def __init__(
+        self,
+        targets: List[Address],
+        options: Optional[SocketOptions] = None,
+        queue_size: int = 1024,
+        overflow: str = "drop",
+        initial: float = 0.05,
+        maximum: float = 5.0
+    ) -> None:
+        """
+        Initialize the pool and start connecting to every target.
+
+        Args:
+            targets (List[Address]): Host and port of every target, in order.
+            options (Optional[SocketOptions]): Socket tuning settings, defaults
+                to the low-latency SocketOptions defaults.
+            queue_size (int): Packets buffered per target before the overflow
+                policy applies.
+            overflow (str): What to do when a target's queue is full, one of
+                the lane scheduler OVERFLOW_POLICIES.
+            initial (float): Seconds before the first reconnection attempt.
+            maximum (float): Longest wait between reconnection attempts.
+        """
+        self.targets: List[Address] = targets
+        self.options: SocketOptions = options or SocketOptions()
+        self.queue_size: int = queue_size
+        self.overflow: str = overflow
+        self.initial: float = initial
+        self.maximum: float = maximum
+        self.pending: List[Optional[PeerQueue]] = [None] * len(targets)
+        self.dropped: List[int] = [0] * len(targets)
+        self.discarded: List[int] = [0] * len(targets)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._inbox: queue.Queue[Tuple[int, bytes]] = queue.Queue()
+
+        self.connect()
+
+    def send(self, packet: Union[str, bytes]) -> None:
+        """
+        Broadcast a data packet to every connected target.
+
+        Args:
+            packet (Union[str, bytes]): The data packet to send as a string or bytes.
+        """
+        self.send_to(range(len(self.targets)), packet)
+
+    def send_to(self, indices: Iterable[int], packet: Union[str, bytes]) -> None:
+        """
+        Send a data packet to some of the targets.
+
+        Safe to call from any thread; the packet is handed to the event loop
+        and queued on the write queue of each chosen target. Under the block
+        policy the call returns once every chosen target had room for it.
+
+        Args:
+            indices (Iterable[int]): Positions of the targets in the pool.
+            packet (Union[str, bytes]): The data packet to send as a string or bytes.
+        """
+        if isinstance(packet, str):
+            packet = packet.encode()
+
+        elif not isinstance(packet, bytes):
+            raise TypeError("Invalid data type, cannot be sent over the network")
+
+        if self.overflow == "block":
+            asyncio.run_coroutine_threadsafe(
+                self._queue_waiting(tuple(indices), packet), self._loop
+            ).result()
+        else:
+            self._loop.call_soon_threadsafe(self._queue, tuple(indices), packet)
+
+    def receive(self) -> bytes:
+        """
+        Receive data from any connected target.
+
+        Blocks until one of the targets sends something.
+
+        Returns:
+            bytes: The received data.
+        """
+        while True:
+            _, data = self._inbox.get()
+
+            if data:
+                return data
+
+    def receive_from(self) -> Tuple[int, bytes]:
+        """
+        Receive data from any connected target, with the target that sent it.
+
+        Returns:
+            Tuple[int, bytes]: The position of the target in the pool and
+            the data, empty once its connection closed.
+        """
+        return self._inbox.get()
+
+    def reply(self, peer: int, packet: bytes) -> None:
+        """
+        Send a data packet to a single target.
+
+        Args:
+            peer (int): The position of the target in the pool.
+            packet (bytes): The data packet to send.
+        """
+        self.send_to((peer,), packet)
+
+    def connected_peers(self) -> List[int]:
+        """
+        Get the positions of the connected targets.
+
+        Returns:
+            List[int]: The position in the pool of every connected target.
+        """
+        return [index for index, target in enumerate(self.pending) if target is not None]
+
+    def close_peer(self, peer: int) -> None:
+        """
+        Close the connection of a single target, letting it reconnect.
+
+        Args:
+            peer (int): The position of the target in the pool.
+        """
+        target = self.pending[peer]
+
+        if target is not None:
+            self._loop.call_soon_threadsafe(target.close)
+
+    def connect(self) -> None:
+        """
+        Start the event loop thread and a connection keeper per target.
+
+        Returns right away; targets are connected in the background for
+        the lifetime of the pool.
+        """
+        self._thread.start()
+        for index in range(len(self.targets)):
+            asyncio.run_coroutine_threadsafe(self._keep(index), self._loop)
+
+    def disconnect(self) -> None:
+        """
+        Close every connection and stop reconnecting.
+
+        The tasks are cancelled and awaited on the event loop before it
+        stops, so every connection is closed while the loop still runs.
+        """
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def drop(self) -> None:
+        """
+        Close every connection, letting each one reconnect.
+        """
+        for target in self.pending:
+            if target is not None:
+                self._loop.call_soon_threadsafe(target.close)
+
+    def run(self) -> None:
+        """
+        Run the pool main loop.
+
+        This method is intended to be implemented by subclasses to define
+        the main execution logic.
+        """
+        pass
+
+    def subscribers(self) -> int:
+        """
+        Get the number of connected targets.
+
+        Returns:
+            int: The amount of targets currently connected.
+        """
+        return sum(target is not None for target in self.pending)
+
+    def connected(self, index: int) -> bool:
+        """
+        Check whether a target is connected.
+
+        Args:
+            index (int): Position of the target in the pool.
+
+        Returns:
+            bool: True if the target has an open connection.
+        """
+        return self.pending[index] is not None
+
+    def _queue(self, indices: Tuple[int, ...], packet: bytes) -> None:
+        """
+        Queue a packet on the write queues of some targets.
+
+        Frames for a target that is not connected are discarded, and a
+        target too far behind to take the packet is disconnected.
+
+        Args:
+            indices (Tuple[int, ...]): Positions of the targets in the pool.
+            packet (bytes): The packet to queue.
+        """
+        for index in indices:
+            target = self.pending[index]
+
+            if target is None:
+                self.discarded[index] += 1
+                continue
+
+            if target.closed:
+                continue
+
+            status = target.put(packet)
+
+            if status == DROPPED:
+                self.dropped[index] += 1
+
+            elif status == BEHIND:
+                host, port = self.targets[index]
+                logger.warning(
+                    "Target %s:%d fell %d packets behind, disconnecting it",
+                    host, port, len(target)
+                )
+                target.close()
+
+    async def _queue_waiting(self, indices: Tuple[int, ...], packet: bytes) -> None:
+        """
+        Queue a packet on the write queues of some targets, waiting for room in each.
+
+        Args:
+            indices (Tuple[int, ...]): Positions of the targets in the pool.
+            packet (bytes): The packet to queue.
+        """
+        for index in indices:
+            target = self.pending[index]
+
+            if target is not None:
+                await target.room()
+
+            self._queue((index,), packet)
+
+    async def _keep(self, index: int) -> None:
+        """
+        Keep one target connected for as long as the pool runs.
+
+        Args:
+            index (int): Position of the target in the pool.
+        """
+        host, port = self.targets[index]
+        attempts = 0
+
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+
+            except OSError as error:
+                delay = min(self.initial * 2 ** attempts, self.maximum)
+                attempts += 1
+
+                if attempts == 1:
+                    logger.info("Target %s:%d unreachable: %s", host, port, error)
+
+                await asyncio.sleep(delay)
+                continue
+
+            attempts = 0
+            effective = apply_socket_options(writer.get_extra_info("socket"), self.options)
+            report_options((host, port), effective)
+            await self._serve(index, reader, writer)
+            logger.warning("Target %s:%d disconnected, reconnecting", host, port)
+
+    async def _close(self) -> None:
+        """
+        Cancel every other task on the event loop and wait for them to end.
+        """
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _serve(
+        self,
+        index: int,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serve a connected target until its connection closes.
+
+        Args:
+            index (int): Position of the target in the pool.
+            reader (asyncio.StreamReader): The target's read stream.
+            writer (asyncio.StreamWriter): The target's write stream.
+        """
+        target = PeerQueue(writer, self.queue_size, self.overflow)
+        self.pending[index] = target
+
+        try:
+            await target.serve(reader, lambda data: self._inbox.put((index, data)))
+
+        finally:
+            self.pending[index] = None
+            self._inbox.put((index, b""))
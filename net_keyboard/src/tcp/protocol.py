@@ -0,0 +1,216 @@
+"""Binary wire protocol module for framing input events over a stream."""
+from typing import Iterator, List, NamedTuple, Union
+from enum import IntEnum
+import struct
+import time
+
+
+PREFIX = struct.Struct("!H")
+HEADER = struct.Struct("!BBIiiQ")
+FRAME_SIZE = PREFIX.size + HEADER.size
+MAX_FRAME_LENGTH = 0xFFFF
+
+
+class EventType(IntEnum):
+    """Enumeration of the device an event originates from."""
+    KEYBOARD = 1
+    MOUSE = 2
+    CONTROL = 3
+
+
+class EventKind(IntEnum):
+    """Enumeration of the action carried by an event."""
+    KEY_PRESS = 1
+    KEY_RELEASE = 2
+    MOVE = 3
+    BUTTON_PRESS = 4
+    BUTTON_RELEASE = 5
+    SCROLL = 6
+    MOTION = 7
+    PING = 8
+    PONG = 9
+    HELLO = 10
+    WELCOME = 11
+
+
+LOSSY_KINDS = (EventKind.MOVE, EventKind.MOTION, EventKind.SCROLL)
+
+
+class Event(NamedTuple):
+    """
+    Decoded input event.
+
+    Attributes:
+        type (int): The device the event comes from (see EventType).
+        kind (int): The action of the event (see EventKind).
+        code (int): Numeric key or button code.
+        x (int): First coordinate or delta of the event.
+        y (int): Second coordinate or delta of the event.
+        timestamp (int): Monotonic capture time in nanoseconds.
+        payload (bytes): Optional extra bytes appended to the header. Events
+            decoded by a ReceiveBuffer carry a memoryview into the buffer.
+    """
+    type: int
+    kind: int
+    code: int
+    x: int
+    y: int
+    timestamp: int
+    payload: bytes = b""
+
+
+def encode(
+    type: int,
+    kind: int,
+    code: int = 0,
+    x: int = 0,
+    y: int = 0,
+    timestamp: int = 0,
+    payload: bytes = b""
+) -> bytes:
+    """
+    Encode a single event into a length-prefixed frame.
+
+    Args:
+        type (int): The device the event comes from.
+        kind (int): The action of the event.
+        code (int): Numeric key or button code.
+        x (int): First coordinate or delta of the event.
+        y (int): Second coordinate or delta of the event.
+        timestamp (int): Monotonic capture time in nanoseconds. When zero,
+            the current monotonic time is used.
+        payload (bytes): Optional extra bytes appended to the header.
+
+    Returns:
+        bytes: The encoded frame.
+
+    Raises:
+        ValueError: If the frame exceeds the maximum frame length.
+    """
+    length = HEADER.size + len(payload)
+
+    if length > MAX_FRAME_LENGTH:
+        raise ValueError("Frame too large, cannot be sent over the network")
+
+    frame = bytearray(PREFIX.size + length)
+    PREFIX.pack_into(frame, 0, length)
+    HEADER.pack_into(
+        frame,
+        PREFIX.size,
+        type,
+        kind,
+        code,
+        x,
+        y,
+        timestamp or time.monotonic_ns()
+    )
+    frame[FRAME_SIZE:] = payload
+    return bytes(frame)
+
+
+def encode_event(event: Event) -> bytes:
+    """
+    Encode a decoded event back into a frame.
+
+    Args:
+        event (Event): The event to encode.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encode(*event)
+
+
+def is_lossy(packet: bytes) -> bool:
+    """
+    Check whether a packet starts with a frame that may be dropped.
+
+    Moves, relative motion and scroll are superseded by the next frame of
+    their kind, while keys, clicks and control frames must all arrive.
+
+    Args:
+        packet (bytes): One or more encoded frames.
+
+    Returns:
+        bool: True if the first frame is a move, motion or scroll.
+    """
+    return len(packet) > PREFIX.size + 1 and packet[PREFIX.size + 1] in LOSSY_KINDS
+
+
+class FrameDecoder:
+    """
+    Incremental decoder that splits a byte stream into events.
+
+    Incoming chunks are appended to an internal buffer and complete frames
+    are unpacked in place with struct offsets, so no intermediate slices
+    are created for the fixed header. Partial frames are kept until the
+    rest of their bytes arrive.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the decoder with an empty buffer.
+        """
+        self._buffer: bytearray = bytearray()
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> List[Event]:
+        """
+        Append data to the buffer and decode every complete frame.
+
+        Args:
+            data (Union[bytes, bytearray, memoryview]): The received chunk.
+
+        Returns:
+            List[Event]: The events decoded from the buffer, in order.
+        """
+        self._buffer += data
+        return list(self._drain())
+
+    def _drain(self) -> Iterator[Event]:
+        """
+        Decode complete frames from the buffer and discard consumed bytes.
+
+        Yields:
+            Event: Each complete event found in the buffer.
+
+        Raises:
+            ValueError: If a frame declares a length shorter than the header.
+        """
+        buffer = self._buffer
+        size = len(buffer)
+        offset = 0
+
+        try:
+            while size - offset >= PREFIX.size:
+                (length,) = PREFIX.unpack_from(buffer, offset)
+
+                if length < HEADER.size:
+                    raise ValueError("Malformed frame, length shorter than header")
+
+                end = offset + PREFIX.size + length
+
+                if end > size:
+                    break
+
+                start = offset + FRAME_SIZE
+                payload = bytes(buffer[start:end]) if end > start else b""
+                yield Event(*HEADER.unpack_from(buffer, offset + PREFIX.size), payload)
+                offset = end
+        finally:
+            if offset:
+                del buffer[:offset]
+
+    def pending(self) -> int:
+        """
+        Get the number of buffered bytes not yet decoded.
+
+        Returns:
+            int: The amount of bytes waiting for the rest of their frame.
+        """
+        return len(self._buffer)
+
+    def reset(self) -> None:
+        """
+        Discard any partially received frame.
+        """
+        self._buffer.clear()
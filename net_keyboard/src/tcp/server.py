@@ -1,6 +1,9 @@
 """Server module for TCP communication."""
-from typing import Optional, Union
+from typing import List, Optional, Union
 from src.tcp.base import TCP
+from src.tcp.options import SocketOptions, apply_listener_options, apply_socket_options,\
+    rearm_quickack, report_options
+from src.tcp.batch import FrameBatcher
 import socket
 
 
@@ -12,25 +15,39 @@ class BaseServer(TCP):
     for accepting and managing client connections over TCP.
     """
 
-    def __init__(self, host: str, port: int) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None
+    ) -> None:
         """
         Initialize the TCP server.
         
         Args:
             host (str): The hostname or IP address to bind the server to.
             port (int): The port number to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings, defaults
+                to the low-latency SocketOptions defaults.
         """
         self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.host: str = host
         self.port: int = port
+        self.options: SocketOptions = options or SocketOptions()
         self.connection: Optional[socket.socket] = None
         self.address: Optional[str] = None
+        self.batcher: Optional[FrameBatcher] = None
+
+        if self.options.batch_window_us is not None:
+            self.batcher = FrameBatcher(lambda: self.connection, self.options)
 
         self.connect()       
 
     def send(self, packet: Union[str, bytes]) -> None:
         """
         Send data packet to the connected client.
+
+        With batching on, packets written close together leave in one send.
         
         Args:
             packet (Union[str, bytes]): The data packet to send as a string or bytes.
@@ -42,13 +59,15 @@ class BaseServer(TCP):
             raise ConnectionError("No active connection. Cannot send packets")
 
         if isinstance(packet, str):
-            self.connection.sendall(packet.encode())
+            packet = packet.encode()
         
-        elif isinstance(packet, bytes):
-            self.connection.sendall(packet)
-            
-        else:
+        elif not isinstance(packet, bytes):
             raise TypeError("Invalid data type, cannot be sent over the network")
+
+        if self.batcher is not None:
+            self.batcher.write(packet)
+        else:
+            self.connection.sendall(packet)
         
     def receive(self) -> bytes:
         """
@@ -63,23 +82,95 @@ class BaseServer(TCP):
         if self.connection is None:
             raise ConnectionError("No active connection. Cannot receive packets")
         
-        return self.connection.recv(1024)
+        data = self.connection.recv(1024)
+        rearm_quickack(self.connection, self.options)
+        return data
+
+    def receive_into(self, view: memoryview) -> int:
+        """
+        Receive data from the connected client into a preallocated buffer.
+
+        Args:
+            view (memoryview): Writable view the data is read into.
+
+        Returns:
+            int: The amount of bytes read, zero when the client closed.
+
+        Raises:
+            ConnectionError: If no active connection is available.
+        """
+        if self.connection is None:
+            raise ConnectionError("No active connection. Cannot receive packets")
+
+        count = self.connection.recv_into(view)
+        rearm_quickack(self.connection, self.options)
+        return count
 
     def connect(self) -> None:
         """
         Establish the server connection and wait for client connections.
         
         Binds the server socket to the specified host and port, starts listening,
-        and accepts the first incoming client connection.
+        and accepts the first incoming client connection. The socket options
+        are applied to the accepted connection and reported.
         """
+        apply_listener_options(self._server, self.options)
         self._server.bind((self.host, self.port))
         self._server.listen()
+        self.accept()
+
+    def accept(self) -> None:
+        """
+        Wait for a client and make it the active connection.
+
+        The previous connection, if any, is closed first. The socket options
+        are applied to the accepted connection and reported.
+        """
+        if self.connection is not None:
+            self.connection.close()
+
+        if self.batcher is not None:
+            self.batcher.reset()
+
         self.connection, self.address = self._server.accept()
+        report_options(self.address, apply_socket_options(self.connection, self.options))
+
+    def drop(self) -> None:
+        """
+        Shut down the client connection, keeping the listening socket open.
+
+        Threads blocked sending to or receiving from the client wake up.
+        """
+        if self.connection is not None:
+            try:
+                self.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def peers(self) -> List[str]:
+        """
+        Get the host of the connected client.
+
+        Returns:
+            List[str]: The address of the client, empty before one connects.
+        """
+        return [] if self.address is None else [self.address[0]]
 
     def disconnect(self) -> None:
         """
         Close the server socket and disconnect from clients.
+
+        The client connection is shut down first, which also wakes up any
+        thread blocked sending to it.
         """
+        if self.connection is not None:
+            try:
+                self.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+            self.connection.close()
+
         self._server.close()
 
     def run(self) -> None:
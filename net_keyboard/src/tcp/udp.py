@@ -0,0 +1,374 @@
+"""UDP module for sending high-rate, loss-tolerant events."""
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from src.tcp.base import TCP
+from src.tcp.options import SocketOptions
+from src.tcp.codec import COMPACT, DeltaDecoder, DeltaEncoder
+import threading
+import socket
+import struct
+import queue
+import time
+
+
+SEQUENCE = struct.Struct("!I")
+SEQUENCE_MASK = 0xFFFFFFFF
+HELLO = b"\x00"
+HELLO_INTERVAL = 1.0
+SYNC_SIZE = len(HELLO) + SEQUENCE.size
+ACK = b"\x01"
+ACK_INTERVAL = 8
+MAX_DATAGRAM = 1472
+
+Address = Tuple[str, int]
+PeerProvider = Callable[[], List[str]]
+
+
+def is_newer(sequence: int, last: int) -> bool:
+    """
+    Check whether a sequence number comes after another one.
+
+    Comparison is done with serial number arithmetic, so the 32-bit
+    counter can wrap around without stalling the stream.
+
+    Args:
+        sequence (int): The received sequence number.
+        last (int): The last accepted sequence number.
+
+    Returns:
+        bool: True if the sequence number is newer than the last one.
+    """
+    return 0 < ((sequence - last) & SEQUENCE_MASK) < 0x80000000
+
+
+def _apply_tos(sock: socket.socket, options: Optional[SocketOptions]) -> None:
+    """
+    Mark the datagram socket with the configured DSCP code point.
+
+    Args:
+        sock (socket.socket): The UDP socket.
+        options (Optional[SocketOptions]): Socket tuning settings.
+    """
+    if options is not None and options.dscp is not None:
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_TOS, options.dscp << 2)
+
+
+class UDPServer(TCP):
+    """
+    UDP sender for the capture side of the connection.
+
+    The server binds a datagram socket and learns where to send from the
+    hello datagrams the clients send periodically. Every client that said
+    hello gets each packet, so motion fans out to all of them like the
+    reliable engine does. When the peers are known, only datagrams from
+    the hosts connected over the reliable engine are heard, and clients
+    whose host left are forgotten, so no other host can take the stream
+    over. Each hello is answered with the current sequence number, which
+    tells the client where the stream stands even after the server
+    restarted. Every packet is prefixed with a sequence number so the
+    client can discard stale ones. With a keyframe interval, pointer
+    frames are sent as compact deltas relative to the datagrams each
+    client acknowledges, with an encoder of its own per client.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None,
+        keyframe: Optional[int] = None
+    ) -> None:
+        """
+        Initialize the UDP server.
+
+        Args:
+            host (str): The hostname or IP address to bind the server to.
+            port (int): The port number to listen on.
+            options (Optional[SocketOptions]): Socket tuning settings.
+            keyframe (Optional[int]): Datagrams between two absolute
+                keyframes of the delta codec, None sends full frames.
+        """
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.host: str = host
+        self.port: int = port
+        self.options: Optional[SocketOptions] = options
+        self.keyframe: Optional[int] = keyframe
+        self.clients: Dict[Address, Optional[DeltaEncoder]] = {}
+        self.sequence: int = 0
+        self.peers: Optional[PeerProvider] = None
+        self.rejected: int = 0
+        self.datagram_bytes: int = 0
+
+        self._lock = threading.Lock()
+        self._inbox: queue.Queue[bytes] = queue.Queue()
+
+        self.connect()
+
+    def send(self, packet: Union[str, bytes]) -> None:
+        """
+        Send a data packet to every client as a single datagram each.
+
+        Packets sent before any client has said hello are dropped, which is
+        acceptable for the loss-tolerant events this channel carries. A
+        client whose host is no longer a peer, or whose datagrams cannot be
+        delivered, is forgotten until it says hello again.
+
+        Args:
+            packet (Union[str, bytes]): The data packet to send as a string or bytes.
+        """
+        if isinstance(packet, str):
+            packet = packet.encode()
+
+        elif not isinstance(packet, bytes):
+            raise TypeError("Invalid data type, cannot be sent over the network")
+
+        if not self.clients:
+            return
+
+        with self._lock:
+            self.sequence = (self.sequence + 1) & SEQUENCE_MASK
+            sequence = SEQUENCE.pack(self.sequence)
+            hosts = self.peers() if self.peers is not None else None
+
+            for address, encoder in list(self.clients.items()):
+                if hosts is not None and address[0] not in hosts:
+                    del self.clients[address]
+                    continue
+
+                datagram = packet
+
+                if encoder is not None:
+                    datagram = encoder.encode(self.sequence, packet) or packet
+
+                try:
+                    self.datagram_bytes += self._server.sendto(sequence + datagram, address)
+
+                except OSError:
+                    del self.clients[address]
+
+    def receive(self) -> bytes:
+        """
+        Receive a datagram from any client.
+
+        Returns:
+            bytes: The received data, without hello datagrams.
+        """
+        return self._inbox.get()
+
+    def connect(self) -> None:
+        """
+        Bind the datagram socket and start listening for clients.
+        """
+        _apply_tos(self._server, self.options)
+        self._server.bind((self.host, self.port))
+        threading.Thread(target=self._listen, daemon=True).start()
+
+    def disconnect(self) -> None:
+        """
+        Close the datagram socket.
+        """
+        self._server.close()
+
+    def run(self) -> None:
+        """
+        Run the server main loop.
+
+        This method is intended to be implemented by subclasses to define
+        the main server execution logic.
+        """
+        pass
+
+    def _listen(self) -> None:
+        """
+        Track the client addresses and queue any other incoming datagram.
+
+        Datagrams from hosts that are not peers are counted and ignored.
+        A hello adds the client, starts its delta codec over and is
+        answered with the current sequence number. Acknowledgements from a
+        client are handed to its own codec.
+        """
+        while True:
+            try:
+                data, address = self._server.recvfrom(MAX_DATAGRAM)
+
+            except OSError:
+                break
+
+            if self.peers is not None and address[0] not in self.peers():
+                self.rejected += 1
+                continue
+
+            if data == HELLO:
+                with self._lock:
+                    encoder = self.clients.get(address)
+
+                    if encoder is not None:
+                        encoder.reset()
+
+                    elif self.keyframe is not None:
+                        encoder = DeltaEncoder(self.keyframe)
+
+                    self.clients[address] = encoder
+
+                    try:
+                        self._server.sendto(HELLO + SEQUENCE.pack(self.sequence), address)
+
+                    except OSError:
+                        pass
+
+            elif data[:1] == ACK and len(data) == 1 + SEQUENCE.size:
+                with self._lock:
+                    encoder = self.clients.get(address)
+
+                    if encoder is not None:
+                        encoder.acknowledge(SEQUENCE.unpack_from(data, 1)[0])
+
+            else:
+                self._inbox.put(data)
+
+
+class UDPClient(TCP):
+    """
+    UDP receiver for the injecting side of the connection.
+
+    The client announces itself to the server with hello datagrams and
+    drops every packet whose sequence number is not newer than the last
+    one accepted, so reordered or duplicated motion is never replayed.
+    The last sequence number only moves back when the server answers a
+    hello with a lower one, as it does after restarting.
+    Compact delta datagrams are decoded back into frames, and every
+    keyframe and ACK_INTERVAL decoded datagrams are acknowledged.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        options: Optional[SocketOptions] = None
+    ) -> None:
+        """
+        Initialize the UDP client and announce it to the server.
+
+        Args:
+            host (str): The hostname or IP address of the server.
+            port (int): The UDP port number of the server.
+            options (Optional[SocketOptions]): Socket tuning settings.
+        """
+        self._client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.host: str = host
+        self.port: int = port
+        self.options: Optional[SocketOptions] = options
+        self.last_sequence: Optional[int] = None
+        self.stale: int = 0
+        self.decoder = DeltaDecoder()
+
+        self._unacknowledged: int = 0
+        self._hello: float = 0.0
+
+        self.connect()
+
+    def send(self, packet: Union[str, bytes]) -> None:
+        """
+        Send a datagram to the server.
+
+        Args:
+            packet (Union[str, bytes]): The data packet to send as a string or bytes.
+        """
+        if isinstance(packet, str):
+            packet = packet.encode()
+
+        elif not isinstance(packet, bytes):
+            raise TypeError("Invalid data type, cannot be sent over the network")
+
+        self._client.sendto(packet, (self.host, self.port))
+
+    def receive(self) -> bytes:
+        """
+        Receive the next in-order datagram from the server.
+
+        Stale datagrams are counted and skipped, and so are malformed
+        compact ones and those relative to a datagram that was lost. While
+        the server is silent, or only stale datagrams arrive, a hello is
+        sent every HELLO_INTERVAL seconds so it can find us again. Its
+        answer carries the sequence number the server is at, which the
+        client takes as the last one accepted.
+
+        Returns:
+            bytes: The received data, without the sequence number.
+        """
+        while True:
+            try:
+                data = self._client.recv(MAX_DATAGRAM)
+
+            except TimeoutError:
+                self.hello()
+                continue
+
+            if len(data) == SYNC_SIZE and data[:1] == HELLO:
+                self.last_sequence = SEQUENCE.unpack_from(data, 1)[0]
+                self.decoder.reset()
+                continue
+
+            if len(data) < SEQUENCE.size:
+                continue
+
+            (sequence,) = SEQUENCE.unpack_from(data)
+
+            if self.last_sequence is not None and not is_newer(sequence, self.last_sequence):
+                self.stale += 1
+
+                if time.monotonic() - self._hello >= HELLO_INTERVAL:
+                    self.hello()
+
+                continue
+
+            self.last_sequence = sequence
+
+            if len(data) == SEQUENCE.size or data[SEQUENCE.size] != COMPACT:
+                return data[SEQUENCE.size:]
+
+            try:
+                frames = self.decoder.decode(sequence, memoryview(data)[SEQUENCE.size:])
+
+            except ValueError:
+                continue
+
+            if frames is None:
+                continue
+
+            self._unacknowledged += 1
+
+            if self.decoder.keyframe or self._unacknowledged >= ACK_INTERVAL:
+                self._unacknowledged = 0
+                self.send(ACK + SEQUENCE.pack(sequence))
+
+            return frames
+
+    def hello(self) -> None:
+        """
+        Send a hello datagram to the server.
+        """
+        self._hello = time.monotonic()
+        self.send(HELLO)
+
+    def connect(self) -> None:
+        """
+        Announce the client to the server with a hello datagram.
+        """
+        _apply_tos(self._client, self.options)
+        self._client.settimeout(HELLO_INTERVAL)
+        self.hello()
+
+    def disconnect(self) -> None:
+        """
+        Close the datagram socket.
+        """
+        self._client.close()
+
+    def run(self) -> None:
+        """
+        Run the client main loop.
+
+        This method is intended to be implemented by subclasses to define
+        the main client execution logic.
+        """
+        pass
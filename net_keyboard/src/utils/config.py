@@ -1,6 +1,8 @@
 """Configuration management module for network keyboard application."""
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional
+from src.tcp.options import SocketOptions
+from src.utils.uri import Endpoint, parse_uri
 
 
 k1 = "server"
@@ -18,12 +20,44 @@ class Confing:
 
     SERVER_HOST: str = "0.0.0.0"
     SERVER_PORT: int = 5000
+    SERVER_ENGINE: str = "blocking"
+    SERVER_LANES: bool = True
+    SERVER_QUEUE_SIZE: int = 1024
+    SERVER_OVERFLOW: str = "drop"
+    SERVER_RESUME: Optional[float] = 2.0
+    SERVER_ISOLATED: bool = False
+    SERVER_URI: Optional[str] = None
+    SERVER_BACKEND: str = "pynput"
 
     CLIENT_HOST: str = "127.0.0.1"
     CLIENT_PORT: int = 5000
+    CLIENT_BACKEND: str = "pynput"
+    CLIENT_IDLE_RELEASE: Optional[float] = None
+    CLIENT_RECONNECT: bool = True
+    CLIENT_LISTEN: bool = False
+    CLIENT_URI: Optional[str] = None
 
     CONNECTIONS: List[Dict[str, int]] = []
 
+    ROUTING_MODE: str = "active"
+    ROUTING_SWITCH: List[str] = ["ctrl_r", "scroll_lock"]
+    ROUTING_BROADCAST: List[str] = ["ctrl_r", "pause"]
+    ROUTING_SCREEN: Optional[List[int]] = None
+
+    MOTION_PORT: Optional[int] = None
+    MOTION_RATE: Optional[float] = None
+    MOTION_KEYFRAME: Optional[int] = None
+
+    HEARTBEAT: Optional[float] = 1.0
+    HEARTBEAT_TIMEOUT: Optional[float] = 5.0
+
+    TRACE: bool = False
+    TRACE_OUTPUT: str = "trace.json"
+
+    RECORD: Optional[str] = None
+
+    SOCKET_OPTIONS: SocketOptions = SocketOptions()
+
     def __init__(self) -> None:
         """
         Initialize the configuration manager and load settings from file.
@@ -35,37 +69,124 @@ class Confing:
         Load configuration data from the JSON configuration file.
         
         Reads the config.json file and updates the instance attributes
-        with server, client, and connection settings from the file.
+        with server, client, connection and socket settings from the file.
         """
         with open(file, "r") as raw:
             data: Dict = json.load(raw)
 
         self.SERVER_HOST = data[k1]["host"]
         self.SERVER_PORT = data[k1]["port"]
+        self.SERVER_ENGINE = data[k1].get("engine", self.SERVER_ENGINE)
+        self.SERVER_LANES = data[k1].get("lanes", self.SERVER_LANES)
+        self.SERVER_QUEUE_SIZE = data[k1].get("queue_size", self.SERVER_QUEUE_SIZE)
+        self.SERVER_OVERFLOW = data[k1].get("overflow", self.SERVER_OVERFLOW)
+        self.SERVER_RESUME = data[k1].get("resume", self.SERVER_RESUME)
+        self.SERVER_ISOLATED = data[k1].get("isolated", self.SERVER_ISOLATED)
+        self.SERVER_URI = data[k1].get("uri", self.SERVER_URI)
+        self.SERVER_BACKEND = data[k1].get("backend", self.SERVER_BACKEND)
 
         self.CLIENT_HOST = data[k2]["host"]
         self.CLIENT_PORT = data[k2]["port"]
+        self.CLIENT_BACKEND = data[k2].get("backend", self.CLIENT_BACKEND)
+        self.CLIENT_IDLE_RELEASE = data[k2].get("idle_release", self.CLIENT_IDLE_RELEASE)
+        self.CLIENT_RECONNECT = data[k2].get("reconnect", self.CLIENT_RECONNECT)
+        self.CLIENT_LISTEN = data[k2].get("listen", self.CLIENT_LISTEN)
+        self.CLIENT_URI = data[k2].get("uri", self.CLIENT_URI)
 
         self.CONNECTIONS = data["connections"]
 
+        routing: Dict = data.get("routing", {})
+        self.ROUTING_MODE = routing.get("mode", self.ROUTING_MODE)
+        self.ROUTING_SWITCH = routing.get("switch", self.ROUTING_SWITCH)
+        self.ROUTING_BROADCAST = routing.get("broadcast", self.ROUTING_BROADCAST)
+        self.ROUTING_SCREEN = routing.get("screen", self.ROUTING_SCREEN)
+
+        self.MOTION_PORT = data.get("motion_port", self.MOTION_PORT)
+        self.MOTION_RATE = data.get("motion_rate", self.MOTION_RATE)
+        self.MOTION_KEYFRAME = data.get("motion_keyframe", self.MOTION_KEYFRAME)
+
+        self.HEARTBEAT = data.get("heartbeat", self.HEARTBEAT)
+        self.HEARTBEAT_TIMEOUT = data.get("heartbeat_timeout", self.HEARTBEAT_TIMEOUT)
+
+        self.TRACE = data.get("trace", self.TRACE)
+        self.TRACE_OUTPUT = data.get("trace_output", self.TRACE_OUTPUT)
+
+        self.RECORD = data.get("record", self.RECORD)
+
+        self.SOCKET_OPTIONS = SocketOptions.from_dict(data.get("socket", {}))
+
+    def server_endpoint(self) -> Endpoint:
+        """
+        Get the transport and address the server listens on.
+
+        Returns:
+            Endpoint: The scheme, host or socket path and port of the server
+            URI, or of the TCP host and port when no URI is set.
+        """
+        if self.SERVER_URI is None:
+            return "tcp", self.SERVER_HOST, self.SERVER_PORT
+
+        return parse_uri(self.SERVER_URI)
+
+    def client_endpoint(self) -> Endpoint:
+        """
+        Get the transport and address the client connects to.
+
+        Returns:
+            Endpoint: The scheme, host or socket path and port of the client
+            URI, or of the TCP host and port when no URI is set.
+        """
+        if self.CLIENT_URI is None:
+            return "tcp", self.CLIENT_HOST, self.CLIENT_PORT
+
+        return parse_uri(self.CLIENT_URI)
+
     def dump_config(self) -> None:
         """
         Save current configuration data to the JSON configuration file.
         
-        Writes the current server, client, and connection settings to
+        Writes the current server, client, connection and socket settings to
         the config.json file with proper formatting.
         """
         with open(file, "w") as raw:
             json.dump({
                 k1: {
                     "host": self.SERVER_HOST,
-                    "port": self.SERVER_PORT
+                    "port": self.SERVER_PORT,
+                    "engine": self.SERVER_ENGINE,
+                    "lanes": self.SERVER_LANES,
+                    "queue_size": self.SERVER_QUEUE_SIZE,
+                    "overflow": self.SERVER_OVERFLOW,
+                    "resume": self.SERVER_RESUME,
+                    "isolated": self.SERVER_ISOLATED,
+                    "uri": self.SERVER_URI,
+                    "backend": self.SERVER_BACKEND
                 },
                 k2: {
                     "host": self.CLIENT_HOST,
-                    "port": self.CLIENT_PORT
+                    "port": self.CLIENT_PORT,
+                    "backend": self.CLIENT_BACKEND,
+                    "idle_release": self.CLIENT_IDLE_RELEASE,
+                    "reconnect": self.CLIENT_RECONNECT,
+                    "listen": self.CLIENT_LISTEN,
+                    "uri": self.CLIENT_URI
+                },
+                "connections": self.CONNECTIONS,
+                "routing": {
+                    "mode": self.ROUTING_MODE,
+                    "switch": self.ROUTING_SWITCH,
+                    "broadcast": self.ROUTING_BROADCAST,
+                    "screen": self.ROUTING_SCREEN
                 },
-                "connections": self.CONNECTIONS
+                "motion_port": self.MOTION_PORT,
+                "motion_rate": self.MOTION_RATE,
+                "motion_keyframe": self.MOTION_KEYFRAME,
+                "heartbeat": self.HEARTBEAT,
+                "heartbeat_timeout": self.HEARTBEAT_TIMEOUT,
+                "trace": self.TRACE,
+                "trace_output": self.TRACE_OUTPUT,
+                "record": self.RECORD,
+                "socket": self.SOCKET_OPTIONS.to_dict()
             }, 
             fp=raw, 
             indent=2
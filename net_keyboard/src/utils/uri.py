@@ -0,0 +1,47 @@
+"""URI module for choosing the transport a peer listens on or connects to."""
+from typing import Tuple
+from urllib.parse import urlsplit
+
+
+SCHEMES = ("tcp", "unix")
+
+Endpoint = Tuple[str, str, int]
+
+
+def parse_uri(uri: str) -> Endpoint:
+    """
+    Split a transport URI into its scheme and address.
+
+    ``tcp://host:port`` selects the TCP engines. ``unix:///path/to/socket``
+    and ``unix:relative/path`` select a Unix domain socket at that path,
+    and ``unix:@name`` one in the Linux abstract namespace.
+
+    Args:
+        uri (str): The URI to parse.
+
+    Returns:
+        Endpoint: The scheme, the host or socket path, and the port, 0 for
+        Unix domain sockets.
+
+    Raises:
+        ValueError: If the scheme is unknown or the address is incomplete.
+    """
+    scheme, _, rest = uri.partition(":")
+
+    if scheme == "unix":
+        path = rest[2:] if rest.startswith("//") else rest
+
+        if not path:
+            raise ValueError(f"Missing socket path in {uri!r}")
+
+        return scheme, "\0" + path[1:] if path.startswith("@") else path, 0
+
+    if scheme == "tcp":
+        parts = urlsplit(uri)
+
+        if parts.hostname is None or parts.port is None:
+            raise ValueError(f"Missing host or port in {uri!r}")
+
+        return scheme, parts.hostname, parts.port
+
+    raise ValueError(f"Unknown transport scheme {scheme!r}, expected one of {SCHEMES}")
@@ -0,0 +1,212 @@
+"""Tests for send-side batching in src.tcp.batch."""
+from typing import List, Optional
+from src.tcp.batch import FrameBatcher, send_vectored
+from src.tcp.options import SocketOptions
+import unittest
+
+
+class Socket:
+    """Socket writing a limited amount of bytes per call, then optionally failing."""
+
+    def __init__(self, chunk: Optional[int] = None, fail_after: Optional[int] = None) -> None:
+        """
+        Initialize the socket.
+
+        Args:
+            chunk (Optional[int]): Most bytes taken per call, None for no limit.
+            fail_after (Optional[int]): Calls that succeed before every later one
+                fails, None to never fail.
+        """
+        self.chunk: Optional[int] = chunk
+        self.fail_after: Optional[int] = fail_after
+        self.calls: int = 0
+        self.data = bytearray()
+
+    def sendmsg(self, views: List[memoryview]) -> int:
+        """
+        Take the start of the given buffers.
+
+        Args:
+            views (List[memoryview]): The buffers to write.
+
+        Returns:
+            int: The amount of bytes taken.
+
+        Raises:
+            BlockingIOError: Once the allowed calls are used up.
+        """
+        if self.fail_after is not None and self.calls >= self.fail_after:
+            raise BlockingIOError("Socket buffer full")
+
+        self.calls += 1
+        data = b"".join(bytes(view) for view in views)[:self.chunk]
+        self.data += data
+        return len(data)
+
+
+class PlainSocket:
+    """Socket without scatter-gather sends."""
+
+    def __init__(self) -> None:
+        """
+        Initialize the socket.
+        """
+        self.data = bytearray()
+
+    def sendall(self, data: bytes) -> None:
+        """
+        Take every byte.
+
+        Args:
+            data (bytes): The bytes to write.
+        """
+        self.data += data
+
+
+class SendVectoredTest(unittest.TestCase):
+    """Scatter-gather writes of several frames."""
+
+    def test_partial_sends_resumed(self) -> None:
+        """
+        Short writes are resumed until every frame is out.
+        """
+        sock = Socket(chunk=3)
+        frames = [b"abcd", b"ef", b"ghijk"]
+        send_vectored(sock, frames)
+
+        self.assertEqual(bytes(sock.data), b"abcdefghijk")
+        self.assertEqual(frames, [])
+
+    def test_failure_leaves_rest(self) -> None:
+        """
+        After a failed send the list holds exactly what was not written.
+        """
+        sock = Socket(chunk=5, fail_after=1)
+        frames = [b"abcd", b"efgh", b"ijkl"]
+
+        with self.assertRaises(OSError):
+            send_vectored(sock, frames)
+
+        self.assertEqual(bytes(sock.data), b"abcde")
+        self.assertEqual(frames, [b"fgh", b"ijkl"])
+
+    def test_sendall_fallback(self) -> None:
+        """
+        Without sendmsg the frames are joined into one sendall.
+        """
+        sock = PlainSocket()
+        frames = [b"ab", b"cd"]
+        send_vectored(sock, frames)
+
+        self.assertEqual(bytes(sock.data), b"abcd")
+        self.assertEqual(frames, [])
+
+
+class FrameBatcherTest(unittest.TestCase):
+    """Flush policy and failure handling of the batcher."""
+
+    def batcher(self, sock: Optional[Socket], **options: int) -> FrameBatcher:
+        """
+        Build a batcher with a one second window.
+
+        Args:
+            sock (Optional[Socket]): The socket to write to.
+            options (int): Other SocketOptions fields.
+
+        Returns:
+            FrameBatcher: The batcher.
+        """
+        return FrameBatcher(lambda: sock, SocketOptions(batch_window_us=1000000, **options))
+
+    def test_isolated_frame_sent_at_once(self) -> None:
+        """
+        A frame after an idle window is written right away.
+        """
+        sock = Socket()
+        self.batcher(sock).write(b"key")
+
+        self.assertEqual(bytes(sock.data), b"key")
+
+    def test_frames_kept_until_flush(self) -> None:
+        """
+        Frames following within the window are kept and written together.
+        """
+        sock = Socket()
+        batcher = self.batcher(sock)
+
+        for frame in (b"a", b"b", b"c"):
+            batcher.write(frame)
+
+        self.assertEqual(bytes(sock.data), b"a")
+        batcher.flush()
+        self.assertEqual(bytes(sock.data), b"abc")
+        self.assertEqual((batcher.sends, batcher.frames), (2, 3))
+
+    def test_count_limit(self) -> None:
+        """
+        Reaching the frame count sends the batch without waiting for the window.
+        """
+        sock = Socket()
+        batcher = self.batcher(sock, batch_count=3)
+
+        for frame in (b"a", b"b", b"c", b"d"):
+            batcher.write(frame)
+
+        self.assertEqual(bytes(sock.data), b"abcd")
+        self.assertEqual(batcher.sends, 2)
+
+    def test_byte_limit(self) -> None:
+        """
+        Reaching the byte limit sends the batch without waiting for the window.
+        """
+        sock = Socket()
+        batcher = self.batcher(sock, batch_bytes=8)
+        batcher.write(b"a")
+        batcher.write(b"1234")
+        batcher.write(b"5678")
+
+        self.assertEqual(bytes(sock.data), b"a12345678")
+
+    def test_failed_frames_kept_in_order(self) -> None:
+        """
+        Frames a failed send did not write go out first on the next flush.
+        """
+        sock = Socket()
+        batcher = self.batcher(sock)
+        batcher.write(b"A")
+        batcher.write(b"BBBB")
+        batcher.write(b"CC")
+        sock.chunk, sock.fail_after = 2, sock.calls + 1
+
+        with self.assertRaises(OSError):
+            batcher.flush()
+
+        sock.chunk = sock.fail_after = None
+        batcher.write(b"D")
+        batcher.flush()
+
+        self.assertEqual(bytes(sock.data), b"ABBBBCCD")
+
+    def test_reset_discards(self) -> None:
+        """
+        Kept frames of an old connection are forgotten on reset.
+        """
+        sock = Socket()
+        batcher = self.batcher(sock)
+        batcher.write(b"a")
+        batcher.write(b"b")
+        batcher.reset()
+        batcher.flush()
+
+        self.assertEqual(bytes(sock.data), b"a")
+
+    def test_no_connection(self) -> None:
+        """
+        Writing without a socket raises a connection error.
+        """
+        with self.assertRaises(ConnectionError):
+            self.batcher(None).write(b"a")
+
+
+if __name__ == "__main__":
+    unittest.main()
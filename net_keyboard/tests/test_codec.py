@@ -0,0 +1,214 @@
+"""Tests for the compact pointer codec in src.tcp.codec."""
+from src.tcp.codec import COMPACT, DeltaDecoder, DeltaEncoder, get_varint, put_varint, unzigzag,\
+    zigzag
+from src.tcp.protocol import EventKind, EventType, FrameDecoder, encode
+import unittest
+
+
+def move(x: int, y: int, timestamp: int) -> bytes:
+    """
+    Encode an absolute pointer move.
+
+    Args:
+        x (int): Horizontal position.
+        y (int): Vertical position.
+        timestamp (int): Capture time in nanoseconds.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encode(EventType.MOUSE, EventKind.MOVE, 0, x, y, timestamp)
+
+
+class VarintTest(unittest.TestCase):
+    """Zig-zag mapping and base-128 varints."""
+
+    def test_zigzag_round_trip(self) -> None:
+        """
+        Signed values map to small unsigned ones and back.
+        """
+        self.assertEqual([zigzag(value) for value in (0, -1, 1, -2, 2)], [0, 1, 2, 3, 4])
+
+        for value in (0, 1, -1, 63, -64, 1 << 40, -(1 << 40), (1 << 62) - 1, -(1 << 62)):
+            self.assertEqual(unzigzag(zigzag(value)), value)
+
+    def test_varint_round_trip(self) -> None:
+        """
+        Values are read back with the offset right after them.
+        """
+        buffer = bytearray()
+
+        for value in (0, 127, 128, 300, (1 << 64) - 1):
+            put_varint(buffer, value)
+
+        offset = 0
+
+        for value in (0, 127, 128, 300, (1 << 64) - 1):
+            read, offset = get_varint(buffer, offset)
+            self.assertEqual(read, value)
+
+        self.assertEqual(offset, len(buffer))
+        self.assertEqual(len(buffer), 1 + 1 + 2 + 2 + 10)
+
+    def test_malformed_varint(self) -> None:
+        """
+        A truncated or overlong varint is rejected.
+        """
+        with self.assertRaises(ValueError):
+            get_varint(b"\x80\x80", 0)
+
+        with self.assertRaises(ValueError):
+            get_varint(b"\xff" * 11, 0)
+
+
+class DeltaCodecTest(unittest.TestCase):
+    """Keyframes, deltas and acknowledgements of the delta codec."""
+
+    def test_keyframe_until_acknowledged(self) -> None:
+        """
+        Without an acknowledgement every datagram stands on its own.
+        """
+        encoder = DeltaEncoder(keyframe=8)
+        decoder = DeltaDecoder()
+
+        for sequence in range(1, 4):
+            compact = encoder.encode(sequence, move(100 + sequence, 200, 1000 * sequence))
+            self.assertEqual(compact[0], COMPACT)
+            self.assertEqual(get_varint(compact, 1)[0], 0)
+            (event,) = FrameDecoder().feed(decoder.decode(sequence, compact))
+            self.assertEqual(
+                (event.x, event.y, event.timestamp), (100 + sequence, 200, 1000 * sequence)
+            )
+            self.assertTrue(decoder.keyframe)
+
+        self.assertEqual((encoder.keyframes, encoder.deltas), (3, 0))
+
+    def test_deltas_after_acknowledgement(self) -> None:
+        """
+        Datagrams after an acknowledged one are relative to it and smaller.
+        """
+        encoder = DeltaEncoder(keyframe=8)
+        decoder = DeltaDecoder()
+        keyframe = encoder.encode(1, move(1500, 900, 10 ** 12))
+        decoder.decode(1, keyframe)
+        encoder.acknowledge(1)
+        packet = move(1501, 899, 10 ** 12 + 1000) + move(1503, 899, 10 ** 12 + 2000)
+        compact = encoder.encode(2, packet)
+
+        self.assertEqual(get_varint(compact, 1)[0], 1)
+        self.assertLess(len(compact), len(keyframe))
+        events = FrameDecoder().feed(decoder.decode(2, compact))
+
+        self.assertEqual(
+            [(event.x, event.y, event.timestamp) for event in events],
+            [(1501, 899, 10 ** 12 + 1000), (1503, 899, 10 ** 12 + 2000)]
+        )
+        self.assertFalse(decoder.keyframe)
+
+    def test_lost_datagram_costs_itself(self) -> None:
+        """
+        Datagrams are relative to the acknowledged one, never to a lost one.
+        """
+        encoder = DeltaEncoder(keyframe=8)
+        decoder = DeltaDecoder()
+        decoder.decode(1, encoder.encode(1, move(10, 10, 1)))
+        encoder.acknowledge(1)
+        encoder.encode(2, move(20, 20, 2))
+        (event,) = FrameDecoder().feed(decoder.decode(3, encoder.encode(3, move(30, 30, 3))))
+
+        self.assertEqual((event.x, event.y), (30, 30))
+
+    def test_unknown_reference_is_skipped(self) -> None:
+        """
+        A datagram relative to one the decoder never saw decodes to None.
+        """
+        encoder = DeltaEncoder(keyframe=8)
+        encoder.encode(1, move(10, 10, 1))
+        encoder.acknowledge(1)
+        decoder = DeltaDecoder()
+
+        self.assertIsNone(decoder.decode(2, encoder.encode(2, move(11, 10, 2))))
+        self.assertEqual(decoder.missing, 1)
+
+    def test_keyframe_interval(self) -> None:
+        """
+        A keyframe is sent again every keyframe datagrams.
+        """
+        encoder = DeltaEncoder(keyframe=3)
+        distances = []
+
+        for sequence in range(1, 8):
+            compact = encoder.encode(sequence, move(sequence, sequence, sequence))
+            encoder.acknowledge(sequence)
+            distances.append(get_varint(compact, 1)[0])
+
+        self.assertEqual(distances, [0, 1, 1, 0, 1, 1, 0])
+
+    def test_relative_motion_and_scroll(self) -> None:
+        """
+        Relative motion and scroll deltas are carried as they are.
+        """
+        encoder = DeltaEncoder()
+        packet = encode(EventType.MOUSE, EventKind.MOTION, 0, -5, 7, 50) +\
+            encode(EventType.MOUSE, EventKind.SCROLL, 0, 0, -1, 60)
+        events = FrameDecoder().feed(DeltaDecoder().decode(1, encoder.encode(1, packet)))
+
+        self.assertEqual(
+            [(event.kind, event.x, event.y) for event in events],
+            [(EventKind.MOTION, -5, 7), (EventKind.SCROLL, 0, -1)]
+        )
+
+    def test_frames_left_as_they_are(self) -> None:
+        """
+        Keys, clicks and frames with a payload are not encoded.
+        """
+        encoder = DeltaEncoder()
+
+        self.assertIsNone(encoder.encode(1, encode(EventType.KEYBOARD, EventKind.KEY_PRESS, 30)))
+        self.assertIsNone(encoder.encode(2, encode(EventType.MOUSE, EventKind.BUTTON_PRESS, 1)))
+        self.assertIsNone(encoder.encode(3, encode(
+            EventType.MOUSE, EventKind.MOVE, 0, 1, 1, payload=b"\x00" * 8
+        )))
+
+    def test_reset_forgets_acknowledgements(self) -> None:
+        """
+        After a reset the next datagram is a keyframe again.
+        """
+        encoder = DeltaEncoder(keyframe=8)
+        encoder.encode(1, move(1, 1, 1))
+        encoder.acknowledge(1)
+        encoder.reset()
+
+        self.assertEqual(get_varint(encoder.encode(2, move(2, 2, 2)), 1)[0], 0)
+
+    def test_sequence_wraps(self) -> None:
+        """
+        Deltas keep working across the wrap of the 32-bit sequence number.
+        """
+        encoder = DeltaEncoder(keyframe=8)
+        decoder = DeltaDecoder()
+        decoder.decode(0xFFFFFFFF, encoder.encode(0xFFFFFFFF, move(5, 5, 5)))
+        encoder.acknowledge(0xFFFFFFFF)
+        compact = encoder.encode(0, move(6, 5, 6))
+        (event,) = FrameDecoder().feed(decoder.decode(0, compact))
+
+        self.assertEqual(get_varint(compact, 1)[0], 1)
+        self.assertEqual((event.x, event.y), (6, 5))
+
+    def test_malformed_datagram(self) -> None:
+        """
+        A datagram with an unknown event kind is rejected.
+        """
+        with self.assertRaises(ValueError):
+            DeltaDecoder().decode(1, bytes((COMPACT, 0, EventKind.KEY_PRESS, 0, 0, 0)))
+
+    def test_invalid_keyframe_interval(self) -> None:
+        """
+        The keyframe interval must be positive.
+        """
+        with self.assertRaises(ValueError):
+            DeltaEncoder(keyframe=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""Tests for the pressed key tracking in src.pipeline.keys."""
+from src.pipeline.keys import PressedKeys
+import unittest
+
+
+SCAN_A = 30
+
+
+class PressedKeysTest(unittest.TestCase):
+    """Press and release tracking of PressedKeys."""
+
+    def test_release_with_other_character(self) -> None:
+        """
+        A key pressed as 'A' and released as 'a' is released as 'A'.
+        """
+        keys = PressedKeys()
+
+        self.assertTrue(keys.press(ord("A"), SCAN_A))
+        self.assertFalse(keys.press(ord("A"), SCAN_A))
+        self.assertEqual(keys.release(ord("a"), SCAN_A), ord("A"))
+        self.assertNotIn(ord("A"), keys)
+        self.assertEqual(len(keys), 0)
+        self.assertTrue(keys.press(ord("A"), SCAN_A))
+
+    def test_release_without_scan(self) -> None:
+        """
+        Without a physical key, releases match the pressed code only.
+        """
+        keys = PressedKeys()
+
+        self.assertTrue(keys.press(ord("A")))
+        self.assertIsNone(keys.release(ord("a")))
+        self.assertEqual(keys.release(ord("A")), ord("A"))
+        self.assertIsNone(keys.release(ord("A")))
+
+    def test_drain_forgets_scans(self) -> None:
+        """
+        Draining releases every key, physical keys included.
+        """
+        keys = PressedKeys()
+        keys.press(ord("A"), SCAN_A)
+
+        self.assertEqual(keys.drain(), [ord("A")])
+        self.assertTrue(keys.press(ord("a"), SCAN_A))
+
+
+if __name__ == "__main__":
+    unittest.main()
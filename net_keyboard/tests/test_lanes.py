@@ -0,0 +1,334 @@
+"""Tests for the priority lanes in src.pipeline.lanes."""
+from typing import List
+from src.pipeline.lanes import LaneScheduler
+from src.tcp.protocol import Event, EventKind, EventType, FrameDecoder, encode
+import threading
+import unittest
+
+
+TIMEOUT = 2.0
+
+KEY = encode(EventType.KEYBOARD, EventKind.KEY_PRESS, 30)
+CLICK = encode(EventType.MOUSE, EventKind.BUTTON_PRESS, 1)
+
+
+def move(x: int) -> bytes:
+    """
+    Encode an absolute pointer move.
+
+    Args:
+        x (int): Horizontal position.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encode(EventType.MOUSE, EventKind.MOVE, 0, x, 0)
+
+
+def scroll(y: int) -> bytes:
+    """
+    Encode a scroll delta.
+
+    Args:
+        y (int): Vertical amount.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encode(EventType.MOUSE, EventKind.SCROLL, 0, 0, y)
+
+
+class Sink:
+    """Sink recording every batch, optionally held until released."""
+
+    def __init__(self, hold: bool = False) -> None:
+        """
+        Initialize the sink.
+
+        Args:
+            hold (bool): Whether writes wait until ``release`` is called.
+        """
+        self.batches: List[List[Event]] = []
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.written = threading.Condition()
+
+        if not hold:
+            self.gate.set()
+
+    def __call__(self, packet: bytes) -> None:
+        """
+        Record a batch.
+
+        Args:
+            packet (bytes): The frames written by the scheduler.
+        """
+        self.entered.set()
+        self.gate.wait(TIMEOUT)
+
+        with self.written:
+            self.batches.append(FrameDecoder().feed(packet))
+            self.written.notify_all()
+
+    def release(self) -> None:
+        """
+        Let held writes through.
+        """
+        self.gate.set()
+
+    def wait(self, count: int) -> List[Event]:
+        """
+        Wait until a number of frames were written.
+
+        Args:
+            count (int): The amount of frames to wait for.
+
+        Returns:
+            List[Event]: Every frame written, in order.
+        """
+        with self.written:
+            self.written.wait_for(
+                lambda: sum(len(batch) for batch in self.batches) >= count, TIMEOUT
+            )
+            return [event for batch in self.batches for event in batch]
+
+
+class CollapseTest(unittest.TestCase):
+    """Collapsing of continuous frames past the motion limit."""
+
+    def test_runs_collapse_in_order(self) -> None:
+        """
+        Moves keep the latest position, scroll adds up, kinds keep their order.
+        """
+        sink = Sink()
+        lanes = LaneScheduler(sink, motion_limit=3)
+
+        for frame in (move(1), move(2), scroll(-1), scroll(-2), move(5)):
+            lanes.continuous(frame)
+
+        lanes.start()
+        events = sink.wait(3)
+        lanes.close()
+
+        self.assertEqual(
+            [(event.kind, event.x, event.y) for event in events],
+            [(EventKind.MOVE, 2, 0), (EventKind.SCROLL, 0, -3), (EventKind.MOVE, 5, 0)]
+        )
+        self.assertEqual(lanes.collapsed, 2)
+
+    def test_below_limit_untouched(self) -> None:
+        """
+        Continuous frames within the motion limit are sent as they are.
+        """
+        sink = Sink()
+        lanes = LaneScheduler(sink, motion_limit=8)
+
+        for x in range(4):
+            lanes.continuous(move(x))
+
+        lanes.start()
+        events = sink.wait(4)
+        lanes.close()
+
+        self.assertEqual([event.x for event in events], [0, 1, 2, 3])
+        self.assertEqual(lanes.collapsed, 0)
+
+
+class PriorityTest(unittest.TestCase):
+    """Discrete frames jumping ahead of queued motion."""
+
+    def test_discrete_first(self) -> None:
+        """
+        A key queued after motion is sent before it.
+        """
+        sink = Sink()
+        lanes = LaneScheduler(sink)
+        lanes.continuous(move(1))
+        lanes.discrete(KEY)
+        lanes.start()
+        events = sink.wait(2)
+        lanes.close()
+
+        self.assertEqual([event.kind for event in events], [EventKind.KEY_PRESS, EventKind.MOVE])
+        self.assertEqual(lanes.preempted, 1)
+
+    def test_ordered_after_motion(self) -> None:
+        """
+        An ordered click waits for the motion queued before it.
+        """
+        sink = Sink()
+        lanes = LaneScheduler(sink)
+        lanes.continuous(move(1))
+        lanes.discrete(CLICK, ordered=True)
+        lanes.start()
+        events = sink.wait(2)
+        lanes.close()
+
+        self.assertEqual([event.kind for event in events], [EventKind.MOVE, EventKind.BUTTON_PRESS])
+
+
+class OverflowTest(unittest.TestCase):
+    """Overflow policies of a full queue."""
+
+    def stalled(self, policy: str, overflows: List[int]) -> LaneScheduler:
+        """
+        Build a scheduler of capacity 4 whose sender is stuck on its first write.
+
+        Args:
+            policy (str): The overflow policy.
+            overflows (List[int]): Receives the depth passed to the overflow hook.
+
+        Returns:
+            LaneScheduler: The scheduler, empty, with its sender held.
+        """
+        sink = Sink(hold=True)
+        self.addCleanup(sink.release)
+        lanes = LaneScheduler(sink, capacity=4, policy=policy, on_overflow=overflows.append)
+        self.addCleanup(lanes.close)
+        lanes.start()
+        lanes.discrete(KEY)
+        self.assertTrue(sink.entered.wait(TIMEOUT))
+        return lanes
+
+    def test_drop_oldest_motion(self) -> None:
+        """
+        Under drop a full queue loses its oldest move, never a key.
+        """
+        lanes = self.stalled("drop", [])
+
+        for x in range(3):
+            lanes.continuous(move(x))
+
+        lanes.discrete(KEY)
+        lanes.discrete(KEY)
+
+        self.assertEqual(lanes.dropped, 1)
+        self.assertEqual(lanes.stats()["discrete"], 2)
+        self.assertEqual(lanes.stats()["continuous"], 2)
+
+    def test_drop_new_motion(self) -> None:
+        """
+        Under drop, with no motion queued, a new move is dropped.
+        """
+        lanes = self.stalled("drop", [])
+
+        for _ in range(4):
+            lanes.discrete(KEY)
+
+        lanes.continuous(move(1))
+
+        self.assertEqual(lanes.dropped, 1)
+        self.assertEqual(lanes.depth(), 4)
+        self.assertFalse(lanes.closed)
+
+    def test_drop_key_without_motion_disconnects(self) -> None:
+        """
+        Under drop, a key that finds no motion to evict disconnects instead of waiting.
+        """
+        overflows: List[int] = []
+        lanes = self.stalled("drop", overflows)
+
+        for _ in range(5):
+            lanes.discrete(KEY)
+
+        self.assertTrue(lanes.closed)
+        self.assertEqual(lanes.blocked, 0)
+
+    def test_disconnect(self) -> None:
+        """
+        Under disconnect the hook is called and later frames are discarded.
+        """
+        overflows: List[int] = []
+        done = threading.Event()
+
+        def hook(depth: int) -> None:
+            overflows.append(depth)
+            done.set()
+
+        lanes = self.stalled("disconnect", [])
+        lanes.on_overflow = hook
+
+        for x in range(5):
+            lanes.continuous(move(x))
+
+        self.assertTrue(done.wait(TIMEOUT))
+        self.assertEqual(overflows, [4])
+        self.assertTrue(lanes.closed)
+        lanes.discrete(KEY)
+        self.assertEqual(lanes.depth(), 0)
+
+    def test_block_waits_for_room(self) -> None:
+        """
+        Under block the caller waits until the sender makes room.
+        """
+        sink = Sink(hold=True)
+        lanes = LaneScheduler(sink, capacity=2, policy="block")
+        self.addCleanup(lanes.close)
+        lanes.start()
+        lanes.discrete(KEY)
+        self.assertTrue(sink.entered.wait(TIMEOUT))
+        lanes.discrete(KEY)
+        lanes.discrete(KEY)
+        queued = threading.Event()
+        threading.Thread(target=lambda: (lanes.discrete(KEY), queued.set()), daemon=True).start()
+
+        self.assertFalse(queued.wait(0.1))
+        sink.release()
+        self.assertTrue(queued.wait(TIMEOUT))
+        self.assertEqual(len(sink.wait(4)), 4)
+        self.assertEqual(lanes.blocked, 1)
+
+    def test_reopen(self) -> None:
+        """
+        A closed scheduler accepts frames again once reopened.
+        """
+        sink = Sink()
+        lanes = LaneScheduler(sink)
+        lanes.start()
+        lanes.close()
+        lanes.reopen()
+        lanes.discrete(KEY)
+
+        self.assertEqual(len(sink.wait(1)), 1)
+        lanes.close()
+
+    def test_unknown_policy(self) -> None:
+        """
+        An unknown overflow policy is rejected.
+        """
+        with self.assertRaises(ValueError):
+            LaneScheduler(Sink(), policy="wait")
+
+
+class WaterMarkTest(unittest.TestCase):
+    """High and low water hooks."""
+
+    def test_high_then_low(self) -> None:
+        """
+        The high-water hook fires once on the way up, the low-water one on the way down.
+        """
+        highs: List[int] = []
+        lows: List[int] = []
+        low = threading.Event()
+        sink = Sink(hold=True)
+        lanes = LaneScheduler(
+            sink, capacity=8, on_high_water=highs.append,
+            on_low_water=lambda depth: (lows.append(depth), low.set())
+        )
+        self.addCleanup(lanes.close)
+        lanes.start()
+        lanes.discrete(KEY)
+        self.assertTrue(sink.entered.wait(TIMEOUT))
+
+        for _ in range(7):
+            lanes.discrete(KEY)
+
+        self.assertEqual(highs, [6])
+        self.assertEqual(lanes.high_water_hits, 1)
+        sink.release()
+        self.assertTrue(low.wait(TIMEOUT))
+        self.assertEqual(lows, [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Tests for the event log in src.pipeline.record."""
+from src.pipeline.record import HEADER, RECORD, EventLog, Recorder, check_header, is_session,\
+    steps
+from src.tcp.protocol import EventKind, EventType
+import tempfile
+import unittest
+import os
+
+
+SECOND = 10 ** 9
+
+
+class EventLogTest(unittest.TestCase):
+    """Appending to and reading back an event log."""
+
+    def setUp(self) -> None:
+        """
+        Pick a log path in a temporary directory.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "session.nklog")
+
+    def record(self, *timestamps: int) -> None:
+        """
+        Record one session of key presses.
+
+        Args:
+            timestamps (int): Capture time of each press, in nanoseconds.
+        """
+        recorder = Recorder(self.path)
+
+        for code, timestamp in enumerate(timestamps):
+            recorder.record(EventType.KEYBOARD, EventKind.KEY_PRESS, code, 1, -1, timestamp)
+
+        recorder.close()
+
+    def read(self) -> EventLog:
+        """
+        Open the log for reading.
+
+        Returns:
+            EventLog: The log, closed at cleanup.
+        """
+        log = EventLog(self.path)
+        self.addCleanup(log.close)
+        return log
+
+    def test_round_trip(self) -> None:
+        """
+        Records read back with every field, after the session marker.
+        """
+        self.record(SECOND, 2 * SECOND)
+        log = self.read()
+
+        self.assertEqual(len(log), 3)
+        self.assertTrue(is_session(log[0]))
+        self.assertEqual(
+            tuple(log[-1])[:6],
+            (EventType.KEYBOARD, EventKind.KEY_PRESS, 1, 1, -1, 2 * SECOND)
+        )
+        self.assertEqual(list(log)[1:], [log[1], log[2]])
+
+    def test_index_out_of_range(self) -> None:
+        """
+        Indexing past either end raises IndexError.
+        """
+        self.record(SECOND)
+        log = self.read()
+
+        with self.assertRaises(IndexError):
+            log[2]
+
+        with self.assertRaises(IndexError):
+            log[-3]
+
+    def test_partial_record_ignored(self) -> None:
+        """
+        A half-written trailing record is not read.
+        """
+        self.record(SECOND)
+
+        with open(self.path, "ab") as raw:
+            raw.write(b"\x01" * (RECORD.size // 2))
+
+        self.assertEqual(len(self.read()), 2)
+
+    def test_partial_record_cut_on_append(self) -> None:
+        """
+        Appending to a log with a torn record cuts it off first.
+        """
+        self.record(SECOND)
+
+        with open(self.path, "ab") as raw:
+            raw.write(b"\x01" * (RECORD.size // 2))
+
+        self.record(5 * SECOND)
+        log = self.read()
+
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 4 * RECORD.size)
+        self.assertEqual([is_session(event) for event in log], [True, False, True, False])
+
+    def test_sessions_follow_each_other(self) -> None:
+        """
+        Each session restarts the clock right after the previous one ends.
+        """
+        self.record(SECOND, 3 * SECOND)
+        self.record(100 * SECOND, 101 * SECOND)
+        log = self.read()
+
+        self.assertEqual([offset for offset, _, _ in steps(log)], [0.0, 2.0, 2.0, 3.0])
+        self.assertEqual(log.duration(), 3.0)
+
+    def test_foreign_file(self) -> None:
+        """
+        A file that is not an event log is refused, for reading and appending.
+        """
+        with open(self.path, "wb") as raw:
+            raw.write(b"not an event log at all")
+
+        with self.assertRaises(ValueError):
+            check_header(self.path)
+
+        with self.assertRaises(ValueError):
+            Recorder(self.path)
+
+    def test_truncated_header(self) -> None:
+        """
+        A file shorter than the header is refused.
+        """
+        with open(self.path, "wb") as raw:
+            raw.write(b"NK")
+
+        with self.assertRaises(ValueError):
+            EventLog(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Tests for the shared memory ring in src.pipeline.ring."""
+from src.pipeline.ring import BLOCK_TIMEOUT, EventRing
+from src.tcp.protocol import EventKind, EventType
+import threading
+import unittest
+import time
+
+
+class EventRingTest(unittest.TestCase):
+    """Records exchanged through the ring."""
+
+    def setUp(self) -> None:
+        """
+        Create a ring of 16 slots.
+        """
+        self.ring = EventRing(16, threading.Semaphore(0))
+        self.addCleanup(self.ring.close)
+
+    def test_round_trip(self) -> None:
+        """
+        Records come back in order with every field.
+        """
+        self.ring.put(EventType.MOUSE, EventKind.SCROLL, 0, 10, -20, -1, 2)
+        self.ring.put(EventType.KEYBOARD, EventKind.KEY_PRESS, 30)
+
+        self.assertEqual(len(self.ring), 2)
+        self.assertEqual(self.ring.get(0), (EventType.MOUSE, EventKind.SCROLL, 0, 10, -20, -1, 2))
+        self.assertEqual(
+            self.ring.get(0), (EventType.KEYBOARD, EventKind.KEY_PRESS, 30, 0, 0, 0, 0)
+        )
+        self.assertIsNone(self.ring.get(0))
+
+    def test_slots_rounded_up(self) -> None:
+        """
+        The slot count is rounded up to a power of two.
+        """
+        ring = EventRing(10, threading.Semaphore(0))
+        self.addCleanup(ring.close)
+
+        self.assertEqual(ring.slots, 16)
+
+    def test_wraps_around(self) -> None:
+        """
+        Records keep their order across many laps of the ring.
+        """
+        for value in range(100):
+            self.assertTrue(self.ring.put(EventType.MOUSE, EventKind.MOVE, 0, value))
+            self.assertEqual(self.ring.get(0)[3], value)
+
+    def test_reserve_kept_for_blocking_puts(self) -> None:
+        """
+        Lossy records stop at three quarters, leaving room for keys and clicks.
+        """
+        stored = sum(
+            self.ring.put(EventType.MOUSE, EventKind.MOVE, 0, value) for value in range(20)
+        )
+
+        self.assertEqual((stored, self.ring.dropped), (12, 8))
+
+        for _ in range(4):
+            self.assertTrue(self.ring.put(EventType.MOUSE, EventKind.BUTTON_RELEASE, 1, block=True))
+
+        self.assertEqual(len(self.ring), 16)
+
+    def test_blocking_put_gives_up(self) -> None:
+        """
+        A blocking put into a full ring gives up after the timeout.
+        """
+        for _ in range(16):
+            self.ring.put(EventType.KEYBOARD, EventKind.KEY_RELEASE, 30, block=True)
+
+        started = time.monotonic()
+
+        self.assertFalse(self.ring.put(EventType.KEYBOARD, EventKind.KEY_RELEASE, 31, block=True))
+        self.assertGreaterEqual(time.monotonic() - started, BLOCK_TIMEOUT)
+        self.assertEqual(self.ring.expired, 1)
+
+    def test_blocking_put_waits_for_room(self) -> None:
+        """
+        A blocking put into a full ring succeeds once the consumer takes a record.
+        """
+        for _ in range(16):
+            self.ring.put(EventType.KEYBOARD, EventKind.KEY_RELEASE, 30, block=True)
+
+        threading.Timer(0.05, self.ring.get, args=(0,)).start()
+
+        self.assertTrue(self.ring.put(EventType.KEYBOARD, EventKind.KEY_RELEASE, 31, block=True))
+        self.assertEqual(self.ring.expired, 0)
+
+    def test_attached_consumer_is_woken(self) -> None:
+        """
+        A consumer attached by name and asleep on an empty ring gets the next record.
+        """
+        consumer = EventRing(wakeup=self.ring.wakeup, name=self.ring.name)
+        self.addCleanup(consumer.close)
+        threading.Timer(
+            0.05, self.ring.put, args=(EventType.KEYBOARD, EventKind.KEY_PRESS, 44)
+        ).start()
+
+        self.assertEqual(consumer.get(1.0)[2], 44)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Tests for target routing and hotkeys in src.pipeline.routing."""
+from typing import List, Optional
+from src.backends.keycodes import SPECIAL_CODES
+from src.pipeline.routing import Router, parse_hotkey
+import unittest
+
+
+CTRL = SPECIAL_CODES["ctrl"]
+ALT = SPECIAL_CODES["alt"]
+KEY_S = ord("s")
+KEY_B = ord("b")
+
+
+class ParseHotkeyTest(unittest.TestCase):
+    """Conversion of hotkey names into key codes."""
+
+    def test_names_and_characters(self) -> None:
+        """
+        Special key names and single characters keep their order.
+        """
+        self.assertEqual(parse_hotkey(["ctrl", "alt", "s"]), (CTRL, ALT, KEY_S))
+        self.assertEqual(parse_hotkey([]), ())
+
+    def test_unknown_name(self) -> None:
+        """
+        A name that is neither a special key nor a character is rejected.
+        """
+        with self.assertRaises(ValueError):
+            parse_hotkey(["ctrl", "hyper"])
+
+
+class RouterTest(unittest.TestCase):
+    """Target selection and hotkey detection of Router."""
+
+    def setUp(self) -> None:
+        """
+        Build a router over three targets with two hotkeys.
+        """
+        self.router = Router(3, switch=(CTRL, ALT, KEY_S), broadcast=(CTRL, ALT, KEY_B))
+
+    def press(self, *codes: int) -> List[Optional[str]]:
+        """
+        Press keys in order.
+
+        Args:
+            codes (int): The key codes.
+
+        Returns:
+            List[Optional[str]]: What each press returned.
+        """
+        return [self.router.hotkey(code, True) for code in codes]
+
+    def test_hotkeys_fire_on_trigger(self) -> None:
+        """
+        A hotkey fires when its last key is pressed with the others held.
+        """
+        self.assertEqual(self.press(CTRL, ALT, KEY_S), [None, None, "switch"])
+        self.router.hotkey(KEY_S, False)
+        self.assertEqual(self.press(KEY_B), ["broadcast"])
+
+    def test_auto_repeat_fires_once(self) -> None:
+        """
+        A held trigger repeating never fires the hotkey again.
+        """
+        self.press(CTRL, ALT, KEY_S)
+
+        self.assertEqual(self.press(KEY_S, KEY_S), [None, None])
+
+    def test_repeat_with_modifiers_held(self) -> None:
+        """
+        Releasing and pressing the trigger again fires the hotkey again.
+        """
+        self.press(CTRL, ALT, KEY_S)
+        self.router.hotkey(KEY_S, False)
+
+        self.assertEqual(self.press(KEY_S), ["switch"])
+
+    def test_wrong_order_or_missing_modifier(self) -> None:
+        """
+        The trigger does nothing without every modifier already held.
+        """
+        self.assertEqual(self.press(KEY_S, CTRL, ALT), [None, None, None])
+        self.router.hotkey(ALT, False)
+        self.router.hotkey(KEY_S, False)
+
+        self.assertEqual(self.press(KEY_S), [None])
+
+    def test_unwatched_keys_ignored(self) -> None:
+        """
+        Keys outside every hotkey never fire anything.
+        """
+        self.assertEqual(self.press(CTRL, ALT, ord("x")), [None, None, None])
+
+    def test_disabled_hotkey(self) -> None:
+        """
+        An empty hotkey never fires.
+        """
+        router = Router(2)
+
+        self.assertEqual([router.hotkey(code, True) for code in (CTRL, ALT, KEY_S)], [None] * 3)
+
+    def test_next_wraps(self) -> None:
+        """
+        Switching past the last target goes back to the first.
+        """
+        targets = []
+
+        for _ in range(4):
+            self.router.next()
+            targets.append(self.router.targets())
+
+        self.assertEqual(targets, [(1,), (2,), (0,), (1,)])
+        self.assertEqual(self.router.switches, 4)
+
+    def test_broadcast(self) -> None:
+        """
+        Broadcast reaches every target, and leaving it keeps the active one.
+        """
+        self.router.select(2)
+        self.router.toggle()
+
+        self.assertEqual(self.router.targets(), (0, 1, 2))
+        self.router.next()
+        self.assertEqual(self.router.targets(), (2,))
+
+    def test_invalid(self) -> None:
+        """
+        Unknown modes, missing targets and out of range selections are rejected.
+        """
+        with self.assertRaises(ValueError):
+            Router(2, mode="round_robin")
+
+        with self.assertRaises(ValueError):
+            Router(0)
+
+        with self.assertRaises(IndexError):
+            self.router.select(3)
+
+
+if __name__ == "__main__":
+    unittest.main()
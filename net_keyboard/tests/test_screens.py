@@ -0,0 +1,95 @@
+"""Tests for edge switching in src.pipeline.screens."""
+from src.pipeline.screens import ScreenLayout
+import unittest
+
+
+LOCAL = (1920, 1080)
+MAIN = (0, 0, 1920, 1080)
+RIGHT = (1920, 0, 1280, 1024)
+BELOW = (0, 1080, 1920, 1080)
+
+
+class ScreenLayoutTest(unittest.TestCase):
+    """Edge tables, crossings and scaling of ScreenLayout."""
+
+    def setUp(self) -> None:
+        """
+        Place a smaller screen right of the main one and another below it.
+        """
+        self.layout = ScreenLayout([MAIN, RIGHT, BELOW], LOCAL)
+
+    def test_cross_right(self) -> None:
+        """
+        Leaving through the right edge lands just inside the left of the next screen.
+        """
+        self.assertEqual(self.layout.cross(0, 1919, 500), (1, 2, 527))
+        self.assertEqual(self.layout.crossings, 1)
+
+    def test_cross_back_left(self) -> None:
+        """
+        Leaving a scaled screen through its left edge lands on the matching row.
+        """
+        self.assertEqual(self.layout.cross(1, 0, 540), (0, 1917, 512))
+
+    def test_cross_vertically(self) -> None:
+        """
+        Top and bottom edges lead to the screens above and below.
+        """
+        self.assertEqual(self.layout.cross(0, 100, 1079), (2, 100, 2))
+        self.assertEqual(self.layout.cross(2, 100, 0), (0, 100, 1077))
+
+    def test_partly_shared_edge(self) -> None:
+        """
+        Only the part of an edge the screens share leads across.
+        """
+        self.assertEqual(self.layout.cross(0, 1919, 1023)[0], 1)
+        self.assertIsNone(self.layout.cross(0, 1919, 1024))
+
+    def test_no_neighbour(self) -> None:
+        """
+        Edges without a screen across, and positions inside, cross nothing.
+        """
+        self.assertIsNone(self.layout.cross(0, 0, 500))
+        self.assertIsNone(self.layout.cross(0, 500, 0))
+        self.assertIsNone(self.layout.cross(0, 960, 540))
+        self.assertIsNone(self.layout.cross(1, 1000, 1079))
+        self.assertEqual(self.layout.crossings, 0)
+
+    def test_landing_does_not_cross_back(self) -> None:
+        """
+        The landing point of a crossing is not on an edge itself.
+        """
+        entered, x, y = self.layout.cross(0, 1919, 500)
+
+        self.assertIsNone(self.layout.cross(entered, x, y))
+
+    def test_translate(self) -> None:
+        """
+        Local positions are scaled onto the screen of the target.
+        """
+        self.assertEqual(self.layout.translate(0, 1919, 1079), (1919, 1079))
+        self.assertEqual(self.layout.translate(1, 1919, 1079), (1279, 1023))
+        self.assertEqual(self.layout.translate(1, 0, 0), (0, 0))
+
+    def test_single_screen(self) -> None:
+        """
+        A lone screen has no edges to cross.
+        """
+        layout = ScreenLayout([MAIN], LOCAL)
+
+        for x, y in ((0, 0), (1919, 1079), (0, 1079), (1919, 0)):
+            self.assertIsNone(layout.cross(0, x, y))
+
+    def test_invalid(self) -> None:
+        """
+        Empty screens and a local screen within the margins are rejected.
+        """
+        with self.assertRaises(ValueError):
+            ScreenLayout([(0, 0, 0, 1080)], LOCAL)
+
+        with self.assertRaises(ValueError):
+            ScreenLayout([MAIN], (4, 1080))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""Tests for resumable sessions in src.pipeline.session."""
+from src.pipeline.session import SessionLog, sequence, sequence_of, sequenced
+from src.pipeline.trace import stamp
+from src.tcp.protocol import EventKind, EventType, FrameDecoder, encode
+import unittest
+
+
+def key(code: int) -> bytes:
+    """
+    Encode a key press.
+
+    Args:
+        code (int): The key code.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encode(EventType.KEYBOARD, EventKind.KEY_PRESS, code)
+
+
+class SequenceTest(unittest.TestCase):
+    """Sequence numbers at the end of a frame."""
+
+    def test_round_trip(self) -> None:
+        """
+        A numbered frame decodes with the same header and its number.
+        """
+        (event,) = FrameDecoder().feed(sequence(key(30), 0xFFFFFFFF))
+
+        self.assertEqual((event.kind, event.code), (EventKind.KEY_PRESS, 30))
+        self.assertEqual(sequence_of(event), 0xFFFFFFFF)
+
+    def test_kept_behind_stamp(self) -> None:
+        """
+        Stamping a numbered frame keeps the number at the end of the payload.
+        """
+        (event,) = FrameDecoder().feed(stamp(sequence(key(30), 7), 123))
+
+        self.assertEqual(sequence_of(event), 7)
+        self.assertEqual(event.payload[:8], (123).to_bytes(8, "big"))
+
+    def test_unnumbered(self) -> None:
+        """
+        A frame without a payload carries number 0.
+        """
+        (event,) = FrameDecoder().feed(key(30))
+
+        self.assertEqual(sequence_of(event), 0)
+
+    def test_sequenced_kinds(self) -> None:
+        """
+        Only keys and buttons are numbered.
+        """
+        events = FrameDecoder().feed(
+            key(30) + encode(EventType.MOUSE, EventKind.BUTTON_RELEASE, 1) +
+            encode(EventType.MOUSE, EventKind.MOVE, 0, 1, 1) +
+            encode(EventType.CONTROL, EventKind.PING)
+        )
+
+        self.assertEqual([sequenced(event) for event in events], [True, True, False, False])
+
+
+class SessionLogTest(unittest.TestCase):
+    """Replay of missed frames after a reconnect."""
+
+    def test_resume_same_session(self) -> None:
+        """
+        A client of the session gets every frame after the last one it received.
+        """
+        session = SessionLog()
+        frames = [session.append(key(code)) for code in range(1, 6)]
+
+        self.assertEqual(session.resume(session.token, 2), frames[2:])
+        self.assertEqual(session.replayed, 3)
+        self.assertEqual(session.missed, 0)
+
+    def test_resume_up_to_date(self) -> None:
+        """
+        A client that received everything gets nothing.
+        """
+        session = SessionLog()
+        session.append(key(1))
+
+        self.assertEqual(session.resume(session.token, session.number), [])
+
+    def test_other_session(self) -> None:
+        """
+        A client with an unknown token gets what was sent since it was accepted.
+        """
+        session = SessionLog()
+        frames = [session.append(key(code)) for code in range(1, 5)]
+        session.accepted = 3
+
+        self.assertEqual(session.resume(b"\x00" * 8, 1), frames[3:])
+
+    def test_outside_window(self) -> None:
+        """
+        Frames older than the window are counted as missed instead of replayed.
+        """
+        session = SessionLog(window=-1.0)
+
+        for code in range(1, 4):
+            session.append(key(code))
+
+        with self.assertLogs("src.pipeline.session", "WARNING"):
+            self.assertEqual(session.since(0), [])
+
+        self.assertEqual(session.missed, 3)
+
+    def test_ring_size(self) -> None:
+        """
+        Only the latest frames fit in the ring, the rest are missed.
+        """
+        session = SessionLog(size=2)
+        frames = [session.append(key(code)) for code in range(1, 5)]
+
+        with self.assertLogs("src.pipeline.session", "WARNING"):
+            self.assertEqual(session.since(0), frames[2:])
+
+        self.assertEqual(session.missed, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""Tests for latency tracing in src.pipeline.trace."""
+from src.pipeline.trace import BUCKETS, STAMP, Histogram, Tracer, stamp, stamp_frames
+from src.tcp.protocol import Event, EventKind, EventType, FrameDecoder, encode
+import unittest
+
+
+def pong(sent: int, server: int) -> Event:
+    """
+    Build the pong answering a ping.
+
+    Args:
+        sent (int): Local send time carried by the ping.
+        server (int): Server clock when the pong was sent.
+
+    Returns:
+        Event: The decoded pong.
+    """
+    (event,) = FrameDecoder().feed(
+        encode(EventType.CONTROL, EventKind.PONG, timestamp=server, payload=STAMP.pack(sent))
+    )
+    return event
+
+
+class HistogramTest(unittest.TestCase):
+    """Log-linear histogram buckets and percentiles."""
+
+    def test_buckets_cover_values(self) -> None:
+        """
+        Every value falls in the bucket whose bounds enclose it.
+        """
+        for value in range(1 << 16):
+            index = Histogram.bucket(value)
+
+            self.assertLessEqual(value, Histogram.upper(index))
+
+            if index:
+                self.assertGreater(value, Histogram.upper(index - 1))
+
+    def test_exact_below_sixteen(self) -> None:
+        """
+        Small values have a bucket of their own.
+        """
+        self.assertEqual([Histogram.bucket(value) for value in range(16)], list(range(16)))
+        self.assertEqual(Histogram.bucket(-5), 0)
+
+    def test_last_bucket(self) -> None:
+        """
+        Huge values land in the last bucket.
+        """
+        self.assertEqual(Histogram.bucket(1 << 62), BUCKETS - 1)
+
+    def test_percentiles(self) -> None:
+        """
+        Percentiles are within a bucket of the real value and capped at the maximum.
+        """
+        histogram = Histogram()
+
+        for microseconds in range(1, 1001):
+            histogram.add(microseconds * 1000)
+
+        summary = histogram.summary()
+
+        self.assertEqual((summary["count"], summary["max"]), (1000, 1000))
+        self.assertGreaterEqual(summary["p50"], 500)
+        self.assertLessEqual(summary["p50"], 500 * 1.125)
+        self.assertGreaterEqual(summary["p99"], 990)
+        self.assertLessEqual(summary["p99"], 1000)
+
+    def test_empty(self) -> None:
+        """
+        An empty histogram reports zeros.
+        """
+        self.assertEqual(Histogram().summary(), {"count": 0, "p50": 0, "p99": 0, "max": 0})
+
+
+class StampTest(unittest.TestCase):
+    """Send stamps in front of the payload."""
+
+    def test_stamp_keeps_payload(self) -> None:
+        """
+        The stamp goes first and the payload follows it.
+        """
+        frame = encode(EventType.KEYBOARD, EventKind.KEY_PRESS, 30, payload=b"tail")
+        (event,) = FrameDecoder().feed(stamp(frame, 42))
+
+        self.assertEqual(event.payload, STAMP.pack(42) + b"tail")
+        self.assertEqual(event.code, 30)
+
+    def test_control_frames_left_alone(self) -> None:
+        """
+        Only input frames of a packet are stamped.
+        """
+        packet = encode(EventType.CONTROL, EventKind.PING, payload=b"ping") +\
+            encode(EventType.MOUSE, EventKind.MOVE, 0, 1, 2)
+        events = FrameDecoder().feed(stamp_frames(packet, 9))
+
+        self.assertEqual([event.payload for event in events], [b"ping", STAMP.pack(9)])
+
+
+class TracerTest(unittest.TestCase):
+    """Clock offset estimation and stage latencies."""
+
+    def test_offset(self) -> None:
+        """
+        The offset is the server clock minus the local midpoint of the round trip.
+        """
+        tracer = Tracer()
+        tracer.control(pong(1000, 2500), 3000)
+
+        self.assertEqual((tracer.offset, tracer.rtt), (500, 2000))
+
+    def test_lowest_round_trip_wins(self) -> None:
+        """
+        The sample with the shortest round trip sets the offset.
+        """
+        tracer = Tracer()
+        tracer.control(pong(1000, 9000), 5000)
+        tracer.control(pong(10000, 10600), 10200)
+        tracer.control(pong(20000, 30000), 24000)
+
+        self.assertEqual((tracer.offset, tracer.rtt), (500, 200))
+
+    def test_ignores_other_control(self) -> None:
+        """
+        Anything but a pong with a stamp is ignored.
+        """
+        tracer = Tracer()
+        (ping,) = FrameDecoder().feed(tracer.ping())
+        tracer.control(ping, 10)
+        tracer.control(pong(1, 2)._replace(payload=b""), 10)
+
+        self.assertIsNone(tracer.offset)
+
+    def test_record(self) -> None:
+        """
+        Stages are measured on the local clock once the offset is known.
+        """
+        tracer = Tracer()
+        tracer.control(pong(1000, 2500), 3000)
+        (event,) = FrameDecoder().feed(
+            stamp(encode(EventType.KEYBOARD, EventKind.KEY_PRESS, 30, timestamp=100000), 300000)
+        )
+        tracer.record(event, 1300000, 1400000, 1500000)
+        stages = tracer.snapshot()["stages"]
+
+        self.assertEqual(stages["capture_send"]["max"], 200)
+        self.assertEqual(stages["network"]["max"], 1000)
+        self.assertEqual(stages["receive_inject"]["max"], 100)
+        self.assertEqual(stages["inject"]["max"], 100)
+        self.assertEqual(stages["total"]["max"], 1400)
+
+
+if __name__ == "__main__":
+    unittest.main()